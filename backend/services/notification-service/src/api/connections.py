@@ -0,0 +1,378 @@
+"""WebSocket connection registry with per-connection send queues."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import asyncio
+import logging
+import os
+import threading
+import uuid
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import orjson
+from fastapi import WebSocket, status
+from shared.pubsub import InMemoryPubSub, PubSub
+
+logger = logging.getLogger(__name__)
+
+# Messages buffered per connection before the backpressure policy applies
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "100"))
+# "disconnect" closes a connection whose queue is full, so the client
+# reconnects and refetches; "drop" discards the messages it cannot take
+WS_BACKPRESSURE_POLICY = os.getenv("WS_BACKPRESSURE_POLICY", "disconnect")
+# Messages queued within this many milliseconds of each other go out as one
+# JSON array frame, up to WS_COALESCE_MAX_BATCH per frame; 0 disables it
+WS_COALESCE_WINDOW_MS = float(os.getenv("WS_COALESCE_WINDOW_MS", "20"))
+WS_COALESCE_MAX_BATCH = int(os.getenv("WS_COALESCE_MAX_BATCH", "50"))
+# Upper bound for the close handshake with a client that stopped reading
+WS_CLOSE_TIMEOUT = 1.0
+
+BACKPRESSURE_POLICIES = ("drop", "disconnect")
+
+# Each user has a backplane channel; a worker subscribes to it only while
+# it holds at least one of the user's connections
+USER_CHANNEL_PREFIX = "notifications:user:"
+# Separates the publishing worker's id from the payload on the backplane
+ORIGIN_SEPARATOR = b"|"
+# How long the backplane listener blocks per read
+LISTEN_TIMEOUT = 1.0
+BACKPLANE_MAX_BACKOFF = 30.0
+
+
+def user_channel(user_id: str) -> str:
+    return USER_CHANNEL_PREFIX + user_id
+
+
+def frame(payloads: List[str]) -> str:
+    """One text frame: a lone message as is, several as a JSON array."""
+    if len(payloads) == 1:
+        return payloads[0]
+    return "[" + ",".join(payloads) + "]"
+
+
+class Connection:
+    """One WebSocket with a bounded outbound queue drained by its own writer task.
+
+    Producers only enqueue, so a client that reads slowly (or not at all)
+    delays nobody but itself. The writer waits ``coalesce_window`` seconds
+    after the first queued message and sends everything queued by then in
+    one frame, so a burst costs one send and one client update.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        queue_size: int,
+        on_closed: Callable[["Connection"], Awaitable[None]],
+        coalesce_window: float = 0.0,
+        max_batch: int = 1
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue(maxsize=queue_size)
+        self._on_closed = on_closed
+        self._coalesce_window = coalesce_window
+        self._max_batch = max_batch
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+        self.frames = 0
+
+    def start(self) -> None:
+        self._writer = asyncio.create_task(self._write())
+
+    def offer(self, payload: str) -> bool:
+        """Queue a text frame; False when the queue is full."""
+        if self.closed:
+            return False
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    async def _next_payloads(self) -> List[str]:
+        payloads = [await self._queue.get()]
+        if self._coalesce_window <= 0:
+            return payloads
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._coalesce_window
+        while len(payloads) < self._max_batch:
+            try:
+                payloads.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                payloads.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return payloads
+
+    async def _write(self) -> None:
+        try:
+            while True:
+                await self.websocket.send_text(frame(await self._next_payloads()))
+                self.frames += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The client went away mid-send
+            logger.debug("WebSocket of user %s failed: %s", self.user_id, e)
+            await self.close()
+
+    async def close(self, code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        """Stop the writer, unregister and close the socket; safe to call twice."""
+        if self.closed:
+            return
+        self.closed = True
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        # Shielded: close() often runs in a task that is being cancelled, such
+        # as a request whose client went away, and must still unsubscribe
+        await asyncio.shield(self._on_closed(self))
+        try:
+            await asyncio.wait_for(self.websocket.close(code=code), WS_CLOSE_TIMEOUT)
+        except Exception:
+            # Already closed by the client, or it stopped responding
+            pass
+
+
+class ConnectionManager:
+    """Any number of WebSocket connections per user, fanned out concurrently.
+
+    Connections live on one worker, but notifications may be created on any
+    of them: every message is published on the user's backplane channel,
+    and each worker forwards what arrives on the channels of its connected
+    users. The sending worker delivers to its own connections directly and
+    skips its own publication when it comes back.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = WS_SEND_QUEUE_SIZE,
+        policy: str = WS_BACKPRESSURE_POLICY,
+        pubsub: Optional[PubSub] = None,
+        coalesce_window: float = WS_COALESCE_WINDOW_MS / 1000,
+        max_batch: int = WS_COALESCE_MAX_BATCH
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r}")
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self._queue_size = queue_size
+        self._policy = policy
+        self._coalesce_window = coalesce_window
+        self._max_batch = max_batch
+        self._pubsub = pubsub or InMemoryPubSub()
+        self._origin = uuid.uuid4().hex.encode("ascii")
+        self._connections: Dict[str, Set[Connection]] = {}
+        # Users whose channel could not be subscribed yet; the listener retries
+        self._unsubscribed: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._sent = 0
+        self._dropped = 0
+        self._slow_disconnects = 0
+        # Frames written by connections that are closed by now
+        self._closed_frames = 0
+        self._published = 0
+        self._received = 0
+        self._backplane_errors = 0
+
+    async def connect(self, websocket: WebSocket, user_id: str) -> Connection:
+        """Accept and register a connection; it starts writing right away."""
+        await websocket.accept()
+        connection = Connection(
+            websocket,
+            user_id,
+            self._queue_size,
+            self._unregister,
+            self._coalesce_window,
+            self._max_batch
+        )
+        connections = self._connections.setdefault(user_id, set())
+        connections.add(connection)
+        connection.start()
+        if len(connections) == 1:
+            await self._subscribe(user_id)
+        return connection
+
+    async def disconnect(self, connection: Connection) -> None:
+        await connection.close()
+
+    async def _unregister(self, connection: Connection) -> None:
+        connections = self._connections.get(connection.user_id)
+        if connections is None:
+            return
+        connections.discard(connection)
+        with self._lock:
+            self._closed_frames += connection.frames
+        if not connections:
+            del self._connections[connection.user_id]
+            await self._unsubscribe(connection.user_id)
+
+    async def _subscribe(self, user_id: str) -> None:
+        try:
+            await self._pubsub.subscribe(user_channel(user_id))
+            self._unsubscribed.discard(user_id)
+        except self._pubsub.errors as e:
+            # Local deliveries still work; remote ones resume once subscribed
+            logger.warning("Cannot subscribe to notifications of user %s: %s", user_id, e)
+            self._unsubscribed.add(user_id)
+            with self._lock:
+                self._backplane_errors += 1
+
+    async def _unsubscribe(self, user_id: str) -> None:
+        self._unsubscribed.discard(user_id)
+        try:
+            await self._pubsub.unsubscribe(user_channel(user_id))
+        except self._pubsub.errors as e:
+            # At worst messages for this user keep arriving and are ignored
+            logger.warning("Cannot unsubscribe from notifications of user %s: %s", user_id, e)
+            with self._lock:
+                self._backplane_errors += 1
+
+    async def _deliver(self, connection: Connection, payload: str) -> None:
+        if connection.offer(payload):
+            with self._lock:
+                self._sent += 1
+            return
+        if connection.closed:
+            return
+        if self._policy == "drop":
+            with self._lock:
+                self._dropped += 1
+            return
+        with self._lock:
+            self._slow_disconnects += 1
+        logger.info("Disconnecting slow WebSocket of user %s", connection.user_id)
+        await connection.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    async def _deliver_local(self, user_id: str, payload: str) -> None:
+        connections = self._connections.get(user_id)
+        if connections:
+            await asyncio.gather(*(self._deliver(connection, payload) for connection in list(connections)))
+
+    async def send_many(self, messages: Iterable[Tuple[str, dict]]) -> None:
+        """Fan (user id, message) pairs out to every connection of each user.
+
+        Every message is encoded once; queuing is concurrent across local
+        connections, and only closing a slow connection ever waits. All
+        messages go to the backplane in one batch for the other workers.
+        """
+        deliveries: List[Awaitable[None]] = []
+        publications: List[Tuple[str, bytes]] = []
+        for user_id, message in messages:
+            # orjson: the payload carries datetimes
+            encoded = orjson.dumps(message)
+            publications.append((user_channel(user_id), self._origin + ORIGIN_SEPARATOR + encoded))
+            if user_id in self._connections:
+                deliveries.append(self._deliver_local(user_id, encoded.decode("utf-8")))
+        if deliveries:
+            await asyncio.gather(*deliveries)
+        if publications:
+            await self._publish(publications)
+
+    async def _publish(self, publications: List[Tuple[str, bytes]]) -> None:
+        try:
+            await self._pubsub.publish(publications)
+        except self._pubsub.errors as e:
+            # Notifications stay in the feed; only their live push is lost
+            logger.warning("Cannot publish notifications to the backplane: %s", e)
+            with self._lock:
+                self._backplane_errors += 1
+            return
+        with self._lock:
+            self._published += len(publications)
+
+    async def receive(self, channel: str, data: bytes) -> None:
+        """Deliver a backplane message to this worker's connections of its user."""
+        origin, _, payload = data.partition(ORIGIN_SEPARATOR)
+        if origin == self._origin or not channel.startswith(USER_CHANNEL_PREFIX):
+            return
+        with self._lock:
+            self._received += 1
+        await self._deliver_local(channel[len(USER_CHANNEL_PREFIX):], payload.decode("utf-8"))
+
+    async def listen(self) -> None:
+        """Forward backplane messages until cancelled, backing off on failures."""
+        delay = 0.1
+        while True:
+            try:
+                for user_id in list(self._unsubscribed):
+                    if user_id in self._connections:
+                        await self._subscribe(user_id)
+                    else:
+                        self._unsubscribed.discard(user_id)
+                message = await self._pubsub.get_message(LISTEN_TIMEOUT)
+                if message is not None:
+                    await self.receive(*message)
+                delay = 0.1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, self._pubsub.errors):
+                    logger.warning("WebSocket backplane unavailable: %s", e)
+                else:
+                    logger.exception("WebSocket backplane listener failed")
+                with self._lock:
+                    self._backplane_errors += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, BACKPLANE_MAX_BACKOFF)
+
+    def start(self) -> None:
+        """Run the backplane listener as a background task on the current event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.listen())
+
+    async def stop(self) -> None:
+        """Cancel the backplane listener and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def send_notification(self, user_id: str, notification: dict) -> None:
+        await self.send_many([(user_id, notification)])
+
+    async def send_to(self, connection: Connection, message: dict) -> None:
+        """Queue a message for one connection only."""
+        await self._deliver(connection, orjson.dumps(message).decode("utf-8"))
+
+    def metrics(self) -> dict:
+        """Snapshot of open connections, frames, backpressure and backplane traffic."""
+        with self._lock:
+            open_connections = [
+                connection for connections in self._connections.values() for connection in connections
+            ]
+            return {
+                "users": len(self._connections),
+                "connections": len(open_connections),
+                "queue_size": self._queue_size,
+                "policy": self._policy,
+                "coalesce_window_ms": round(self._coalesce_window * 1000, 3),
+                "max_batch": self._max_batch,
+                "sent": self._sent,
+                # Below "sent" when bursts were coalesced
+                "frames": self._closed_frames + sum(connection.frames for connection in open_connections),
+                "dropped": self._dropped,
+                "slow_disconnects": self._slow_disconnects,
+                "backplane": {
+                    "name": self._pubsub.name,
+                    "published": self._published,
+                    "received": self._received,
+                    "errors": self._backplane_errors,
+                },
+            }
@@ -7,18 +7,20 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from shared.database import get_db
-from shared.auth import decode_access_token
+from shared.auth import decode_access_token, decode_stream_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login", auto_error=False)
 
 
 async def get_current_user_id(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> str:
     """Get current authenticated user ID from token."""
     credentials_exception = HTTPException(
@@ -36,3 +38,35 @@ async def get_current_user_id(
         raise credentials_exception
     
     return user_id
+
+
+async def get_stream_user_id(
+    token: Optional[str] = Query(None),
+    access_token: Optional[str] = Depends(optional_oauth2_scheme)
+) -> str:
+    """Get the user of a notification stream from a stream token or the bearer token.
+    
+    Browsers' EventSource cannot set headers, so it passes a token from
+    POST /notifications/stream-token as ``?token=``; fetch-based clients
+    may send their access token as usual.
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    if token is not None:
+        payload = decode_stream_token(token)
+    elif access_token is not None:
+        payload = decode_access_token(access_token)
+    else:
+        raise credentials_exception
+    if payload is None:
+        raise credentials_exception
+    
+    user_id: str = payload.get("sub")
+    if user_id is None:
+        raise credentials_exception
+    
+    return user_id
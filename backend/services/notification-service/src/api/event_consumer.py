@@ -0,0 +1,256 @@
+"""Background consumer turning task events into notifications."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+from typing import AsyncContextManager, Awaitable, Callable, List, Optional, Tuple
+import orjson
+from shared.broker import EVENT_STREAM, Entry, MessageBroker
+from shared.database import DbSession, primary_session
+from shared.unit_of_work import UnitOfWork
+from src.application.use_cases import ProcessTaskEventsUseCase
+from src.domain.notification import Notification
+from src.infrastructure.repository import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+EVENT_CONSUMER_GROUP = os.getenv("EVENT_CONSUMER_GROUP", "notification-service")
+# Must be stable across restarts so a restarted worker finds its pending events
+EVENT_CONSUMER_NAME = os.getenv("EVENT_CONSUMER_NAME", socket.gethostname())
+EVENT_CONSUMER_BATCH_SIZE = int(os.getenv("EVENT_CONSUMER_BATCH_SIZE", "200"))
+# How long a started batch may wait to fill up before it is written
+EVENT_CONSUMER_FLUSH_INTERVAL = float(os.getenv("EVENT_CONSUMER_FLUSH_INTERVAL", "0.2"))
+EVENT_CONSUMER_MAX_BACKOFF = float(os.getenv("EVENT_CONSUMER_MAX_BACKOFF", "30"))
+# Deliveries of an entry before it is given up on and moved to the
+# dead-letter stream, where it can be inspected and published again
+EVENT_CONSUMER_MAX_DELIVERIES = int(os.getenv("EVENT_CONSUMER_MAX_DELIVERIES", "10"))
+EVENT_DEAD_LETTER_STREAM = os.getenv("EVENT_DEAD_LETTER_STREAM", f"{EVENT_STREAM}-dead")
+
+# How long an idle consumer blocks on the broker per read
+IDLE_WAIT_SECONDS = 1.0
+
+
+def decode_entry(entry: Entry) -> Optional[Tuple[str, str, dict]]:
+    """Decode a stream entry into (event id, event type, payload), or None if unusable."""
+    _, message = entry
+    try:
+        return (
+            message["event_id"].decode("ascii"),
+            message["event_type"].decode("utf-8"),
+            orjson.loads(message["payload"])
+        )
+    except (KeyError, ValueError):
+        return None
+
+
+class TaskEventConsumer:
+    """Reads task events in batches and stores one notification batch per read.
+
+    A batch starts with the first entry that arrives and is written once it
+    holds ``batch_size`` entries or ``flush_interval`` has passed: one
+    multi-row INSERT and one commit per batch. Entries are acknowledged only
+    after the commit and notifications are pushed to WebSockets after that.
+    On failure the batch stays pending in the consumer group and is read
+    again; notification ids derived from event ids make the retry a no-op
+    for whatever was already stored. Redelivered entries are processed one
+    at a time, so an event that cannot be processed holds up only itself,
+    and after ``max_deliveries`` it moves to the dead-letter stream.
+    """
+
+    def __init__(
+        self,
+        broker: MessageBroker,
+        on_created: Callable[[List[Notification]], Awaitable[None]],
+        stream: str = EVENT_STREAM,
+        group: str = EVENT_CONSUMER_GROUP,
+        consumer: str = EVENT_CONSUMER_NAME,
+        session_factory: Callable[[], AsyncContextManager[DbSession]] = primary_session,
+        batch_size: int = EVENT_CONSUMER_BATCH_SIZE,
+        flush_interval: float = EVENT_CONSUMER_FLUSH_INTERVAL,
+        max_deliveries: int = EVENT_CONSUMER_MAX_DELIVERIES,
+        dead_letter_stream: str = EVENT_DEAD_LETTER_STREAM
+    ):
+        self._broker = broker
+        self._on_created = on_created
+        self._stream = stream
+        self._group = group
+        self._consumer = consumer
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_deliveries = max_deliveries
+        self._dead_letter_stream = dead_letter_stream
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._consumed = 0
+        self._batches = 0
+        self._created = 0
+        self._skipped = 0
+        self._dead_lettered = 0
+        self._errors = 0
+
+    async def next_batch(self, pending: bool = False) -> List[Entry]:
+        """Wait for entries, then keep reading until the batch is full or due."""
+        read = self._broker.read_group
+        if pending:
+            return await read(self._stream, self._group, self._consumer, self._batch_size, 0, pending=True)
+
+        batch = await read(self._stream, self._group, self._consumer, self._batch_size, IDLE_WAIT_SECONDS)
+        deadline = time.monotonic() + self._flush_interval
+        while batch and len(batch) < self._batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            more = await read(
+                self._stream, self._group, self._consumer, self._batch_size - len(batch), remaining
+            )
+            if not more:
+                break
+            batch.extend(more)
+        return batch
+
+    async def process(self, entries: List[Entry]) -> List[Notification]:
+        """Store the notifications for a batch of entries, then acknowledge it."""
+        events = [event for event in map(decode_entry, entries) if event is not None]
+        created: List[Notification] = []
+        if events:
+            async with self._session_factory() as db:
+                use_case = ProcessTaskEventsUseCase(NotificationRepository(db), UnitOfWork(db))
+                created = await use_case.execute(events)
+        await self._broker.ack(self._stream, self._group, [entry_id for entry_id, _ in entries])
+
+        with self._lock:
+            self._consumed += len(entries)
+            self._batches += 1
+            self._created += len(created)
+            self._skipped += len(entries) - len(events)
+        if created:
+            await self._on_created(created)
+        return created
+
+    async def redeliver(self, entries: List[Entry]) -> int:
+        """Process entries read again after a failure; return how many failed again.
+
+        Entries delivered more than ``max_deliveries`` times are moved to the
+        dead-letter stream instead.
+        """
+        counts = await self._broker.delivery_counts(
+            self._stream, self._group, self._consumer, [entry_id for entry_id, _ in entries]
+        )
+        dead = [entry for entry in entries if counts.get(entry[0], 0) > self._max_deliveries]
+        if dead:
+            await self._dead_letter(dead)
+
+        failed = 0
+        for entry in entries:
+            if counts.get(entry[0], 0) > self._max_deliveries:
+                continue
+            try:
+                await self.process([entry])
+            except asyncio.CancelledError:
+                raise
+            except self._broker.errors:
+                raise
+            except Exception:
+                logger.exception(
+                    "Event consumer failed on entry %s, delivery %d of %d",
+                    entry[0], counts.get(entry[0], 0), self._max_deliveries
+                )
+                failed += 1
+        if failed:
+            with self._lock:
+                self._errors += failed
+        return failed
+
+    async def _dead_letter(self, entries: List[Entry]) -> None:
+        await self._broker.publish(
+            self._dead_letter_stream,
+            [dict(message, entry_id=entry_id.encode("ascii")) for entry_id, message in entries]
+        )
+        await self._broker.ack(self._stream, self._group, [entry_id for entry_id, _ in entries])
+        logger.error(
+            "Moved %d events to %s after %d failed deliveries: %s",
+            len(entries), self._dead_letter_stream, self._max_deliveries,
+            ", ".join(entry_id for entry_id, _ in entries)
+        )
+        with self._lock:
+            self._dead_lettered += len(entries)
+
+    async def run(self) -> None:
+        """Consume until cancelled, first re-reading entries left pending earlier."""
+        group_ready = False
+        pending = True
+        delay = self._flush_interval
+        while True:
+            try:
+                if not group_ready:
+                    await self._broker.ensure_group(self._stream, self._group)
+                    group_ready = True
+                entries = await self.next_batch(pending)
+                failed = 0
+                if not entries:
+                    pending = False
+                elif pending:
+                    failed = await self.redeliver(entries)
+                else:
+                    await self.process(entries)
+                if failed:
+                    # Stay on the pending entries and back off as after any failure
+                    await asyncio.sleep(delay)
+                    delay = min(max(delay, 0.1) * 2, EVENT_CONSUMER_MAX_BACKOFF)
+                    continue
+                delay = self._flush_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, self._broker.errors):
+                    logger.warning("Event consumer cannot reach the broker: %s", e)
+                else:
+                    logger.exception("Event consumer failed")
+                with self._lock:
+                    self._errors += 1
+                # Retry the unacknowledged batch before reading new entries
+                pending = True
+                await asyncio.sleep(delay)
+                delay = min(max(delay, 0.1) * 2, EVENT_CONSUMER_MAX_BACKOFF)
+
+    def start(self) -> None:
+        """Run the consumer as a background task on the current event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def metrics(self) -> dict:
+        """Snapshot of consumed entries, batches and created notifications."""
+        with self._lock:
+            return {
+                "broker": self._broker.name,
+                "stream": self._stream,
+                "group": self._group,
+                "consumed": self._consumed,
+                "batches": self._batches,
+                "notifications_created": self._created,
+                "skipped": self._skipped,
+                "dead_lettered": self._dead_lettered,
+                "errors": self._errors,
+            }
@@ -0,0 +1,121 @@
+"""Server-Sent Events transport for the notification stream."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import asyncio
+import os
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Set
+import orjson
+from shared.pagination import encode_cursor
+
+# Most missed notifications replayed on reconnect; beyond that the client
+# gets a "reset" event and reloads its feed
+SSE_REPLAY_LIMIT = int(os.getenv("SSE_REPLAY_LIMIT", "500"))
+# Comment lines keep idle streams open through proxies
+SSE_KEEPALIVE_SECONDS = float(os.getenv("SSE_KEEPALIVE_SECONDS", "15"))
+# Reconnection delay suggested to clients
+SSE_RETRY_MS = 3000
+
+KEEPALIVE = ": keepalive\n\n"
+
+
+def format_event(data: str, event: str, event_id: Optional[str] = None) -> str:
+    """Encode one SSE event; ``data`` is single-line JSON."""
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+def last_event_id(messages: List[dict]) -> Optional[str]:
+    """Cursor of the newest notification in a frame, used as its event id."""
+    positions = [
+        (datetime.fromisoformat(message["created_at"]), message["id"])
+        for message in messages
+        if "created_at" in message and "id" in message
+    ]
+    return encode_cursor(*max(positions)) if positions else None
+
+
+class EventStream:
+    """Looks like a WebSocket to ConnectionManager and streams its frames as SSE.
+
+    Frames (one notification or a coalesced array) become "notification"
+    events whose id is the cursor of their newest notification, so the
+    browser sends it back as Last-Event-ID on reconnect. The stream is
+    registered before the missed notifications are read; live frames that
+    repeat a replayed notification are trimmed.
+    """
+
+    def __init__(self):
+        # One frame in flight: a client that stops reading fills the
+        # connection's queue and its backpressure policy applies
+        self._frames: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=1)
+        self._replay: List[str] = []
+        self._replayed_ids: Set[str] = set()
+        self.closed = False
+
+    async def accept(self) -> None:
+        pass
+
+    async def send_text(self, data: str) -> None:
+        await self._frames.put(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed = True
+        try:
+            self._frames.put_nowait(None)
+        except asyncio.QueueFull:
+            # The reader stops after the frame already waiting
+            pass
+
+    def replay(self, notifications: List[dict]) -> None:
+        """Queue missed notifications, oldest first, ahead of live frames."""
+        for notification in notifications:
+            self._replayed_ids.add(notification["id"])
+            self._replay.append(format_event(
+                orjson.dumps(notification).decode("utf-8"),
+                "notification",
+                encode_cursor(notification["created_at"], notification["id"])
+            ))
+
+    def reset(self) -> None:
+        """Tell the client that too much was missed to replay."""
+        self._replay.append(format_event("{}", "reset"))
+
+    def _format_frame(self, frame: str) -> Optional[str]:
+        decoded = orjson.loads(frame)
+        messages = decoded if isinstance(decoded, list) else [decoded]
+        if self._replayed_ids:
+            messages = [message for message in messages if message.get("id") not in self._replayed_ids]
+            if not messages:
+                return None
+            frame = orjson.dumps(messages if isinstance(decoded, list) else messages[0]).decode("utf-8")
+        return format_event(frame, "notification", last_event_id(messages))
+
+    async def events(self) -> AsyncIterator[str]:
+        """The response body: replayed events, then live ones until closed."""
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for event in self._replay:
+            yield event
+        self._replay = []
+        while True:
+            try:
+                frame = await asyncio.wait_for(self._frames.get(), SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield KEEPALIVE
+                continue
+            if frame is None:
+                return
+            event = self._format_frame(frame)
+            if event is not None:
+                yield event
+            if self.closed:
+                return
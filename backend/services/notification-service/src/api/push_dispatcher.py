@@ -0,0 +1,247 @@
+"""Background pipeline delivering notifications to devices as push messages."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import asyncio
+import logging
+import os
+import random
+import threading
+from typing import AsyncContextManager, Callable, List, Set, Tuple
+from shared.database import DbSession, primary_session
+from shared.unit_of_work import UnitOfWork
+from src.application.use_cases import GetPushMessagesUseCase, PruneDevicesUseCase
+from src.domain.notification import Notification
+from src.domain.push import PushMessage, PushProvider, PushResult
+from src.infrastructure.repository import DeviceRepository
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests to the push provider
+PUSH_WORKERS = int(os.getenv("PUSH_WORKERS", "4"))
+# Notifications waiting for dispatch; beyond that new ones are not pushed
+PUSH_QUEUE_SIZE = int(os.getenv("PUSH_QUEUE_SIZE", "10000"))
+# Sends per message, the first one included
+PUSH_MAX_ATTEMPTS = int(os.getenv("PUSH_MAX_ATTEMPTS", "5"))
+PUSH_RETRY_BASE_DELAY = float(os.getenv("PUSH_RETRY_BASE_DELAY", "1"))
+PUSH_RETRY_MAX_DELAY = float(os.getenv("PUSH_RETRY_MAX_DELAY", "60"))
+
+# Notifications whose devices are looked up with one query
+LOOKUP_BATCH_SIZE = 500
+
+# A provider-sized batch of messages and the attempt it is on
+Batch = Tuple[int, List[PushMessage]]
+
+
+class PushDispatcher:
+    """Turns stored notifications into push messages and sends them.
+
+    ``enqueue`` only queues, so it never slows the event consumer down. A
+    planner drains the queue, looks up the devices of a whole chunk of
+    notifications at once and splits the messages into batches of the
+    provider's ``max_batch_size``; ``workers`` tasks send them, which caps
+    concurrent provider requests. Messages failing temporarily are sent
+    again with exponential backoff and jitter, up to ``max_attempts``
+    sends; devices whose token is rejected for good are deleted.
+
+    Delivery is best effort: what is queued or waiting for a retry is lost
+    on shutdown, while the notifications themselves stay in the feed.
+    """
+
+    def __init__(
+        self,
+        provider: PushProvider,
+        session_factory: Callable[[], AsyncContextManager[DbSession]] = primary_session,
+        workers: int = PUSH_WORKERS,
+        queue_size: int = PUSH_QUEUE_SIZE,
+        max_attempts: int = PUSH_MAX_ATTEMPTS,
+        retry_base_delay: float = PUSH_RETRY_BASE_DELAY,
+        retry_max_delay: float = PUSH_RETRY_MAX_DELAY
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._provider = provider
+        self._session_factory = session_factory
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+        self._pending: "asyncio.Queue[Notification]" = asyncio.Queue(maxsize=queue_size)
+        # Bounded so a slow provider holds the planner back instead of piling up batches
+        self._batches: "asyncio.Queue[Batch]" = asyncio.Queue(maxsize=workers * 2)
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._dropped = 0
+        self._requests = 0
+        self._delivered = 0
+        self._retried = 0
+        self._failed = 0
+        self._pruned = 0
+        self._errors = 0
+
+    def enqueue(self, notifications: List[Notification]) -> None:
+        """Queue notifications for push delivery without waiting."""
+        dropped = 0
+        for notification in notifications:
+            try:
+                self._pending.put_nowait(notification)
+            except asyncio.QueueFull:
+                dropped += 1
+        if dropped:
+            logger.warning("Push queue is full, not pushing %d notifications", dropped)
+            with self._lock:
+                self._dropped += dropped
+
+    async def _next_notifications(self) -> List[Notification]:
+        notifications = [await self._pending.get()]
+        while len(notifications) < LOOKUP_BATCH_SIZE and not self._pending.empty():
+            notifications.append(self._pending.get_nowait())
+        return notifications
+
+    async def plan(self, notifications: List[Notification]) -> None:
+        """Address notifications to devices and queue provider-sized batches."""
+        async with self._session_factory() as db:
+            messages = await GetPushMessagesUseCase(DeviceRepository(db)).execute(notifications)
+        size = self._provider.max_batch_size
+        for start in range(0, len(messages), size):
+            await self._batches.put((1, messages[start:start + size]))
+
+    async def _run_planner(self) -> None:
+        while True:
+            notifications = await self._next_notifications()
+            try:
+                await self.plan(notifications)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Without their devices these notifications cannot be pushed
+                logger.exception("Looking up devices for %d notifications failed", len(notifications))
+                with self._lock:
+                    self._errors += 1
+                    self._failed += len(notifications)
+
+    async def send(self, messages: List[PushMessage], attempt: int = 1) -> None:
+        """Send one batch, then prune dead tokens and schedule the retries."""
+        try:
+            results = await self._provider.send(messages)
+        except asyncio.CancelledError:
+            raise
+        except self._provider.errors as e:
+            logger.warning("Push provider %s unavailable: %s", self._provider.name, e)
+            results = [PushResult.RETRY] * len(messages)
+        except Exception:
+            # Not a temporary failure, so sending the batch again would not help
+            logger.exception("Push provider %s failed on %d messages", self._provider.name, len(messages))
+            self._fail_batch(messages)
+            return
+        if len(results) != len(messages):
+            # Results cannot be matched to messages, so none of them can be trusted
+            logger.error(
+                "Push provider %s returned %d results for %d messages",
+                self._provider.name, len(results), len(messages)
+            )
+            self._fail_batch(messages)
+            return
+
+        outcomes = list(zip(messages, results))
+        retry = [message for message, result in outcomes if result == PushResult.RETRY]
+        dead = [message.device_token for message, result in outcomes if result == PushResult.INVALID_TOKEN]
+        with self._lock:
+            self._requests += 1
+            self._delivered += results.count(PushResult.DELIVERED)
+            self._failed += results.count(PushResult.FAILED)
+        if dead:
+            await self._prune(dead)
+        if retry:
+            self._schedule_retry(retry, attempt + 1)
+
+    def _fail_batch(self, messages: List[PushMessage]) -> None:
+        with self._lock:
+            self._requests += 1
+            self._errors += 1
+            self._failed += len(messages)
+
+    async def _prune(self, device_tokens: List[str]) -> None:
+        try:
+            async with self._session_factory() as db:
+                pruned = await PruneDevicesUseCase(DeviceRepository(db), UnitOfWork(db)).execute(device_tokens)
+        except Exception:
+            # The tokens are rejected again, and pruned, on their next push
+            logger.exception("Pruning %d dead device tokens failed", len(device_tokens))
+            with self._lock:
+                self._errors += 1
+            return
+        with self._lock:
+            self._pruned += pruned
+
+    def retry_delay(self, attempt: int) -> float:
+        """Delay before the given attempt: doubling from the base delay, randomized to 50-100%."""
+        delay = min(self._retry_base_delay * 2 ** (attempt - 2), self._retry_max_delay)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _schedule_retry(self, messages: List[PushMessage], attempt: int) -> None:
+        if attempt > self._max_attempts:
+            logger.warning("Giving up on %d push messages after %d attempts", len(messages), self._max_attempts)
+            with self._lock:
+                self._failed += len(messages)
+            return
+        with self._lock:
+            self._retried += len(messages)
+        task = asyncio.create_task(self._retry_later(messages, attempt))
+        self._retries.add(task)
+        task.add_done_callback(self._retries.discard)
+
+    async def _retry_later(self, messages: List[PushMessage], attempt: int) -> None:
+        await asyncio.sleep(self.retry_delay(attempt))
+        await self._batches.put((attempt, messages))
+
+    async def _run_worker(self) -> None:
+        while True:
+            attempt, messages = await self._batches.get()
+            try:
+                await self.send(messages, attempt)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Push worker failed on %d messages", len(messages))
+                with self._lock:
+                    self._errors += 1
+
+    def start(self) -> None:
+        """Run the planner and the worker pool as background tasks on the current event loop."""
+        if self._tasks:
+            return
+        self._tasks.append(asyncio.create_task(self._run_planner()))
+        self._tasks.extend(asyncio.create_task(self._run_worker()) for _ in range(self._workers))
+
+    async def stop(self) -> None:
+        """Cancel all background tasks, pending retries included, and wait for them."""
+        tasks = self._tasks + list(self._retries)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._retries.clear()
+
+    def metrics(self) -> dict:
+        """Snapshot of queued, delivered, retried, failed and pruned pushes."""
+        with self._lock:
+            return {
+                "provider": self._provider.name,
+                "workers": self._workers,
+                "queued": self._pending.qsize(),
+                "retrying": len(self._retries),
+                "dropped": self._dropped,
+                "requests": self._requests,
+                "delivered": self._delivered,
+                "retried": self._retried,
+                "failed": self._failed,
+                "pruned": self._pruned,
+                "errors": self._errors,
+            }
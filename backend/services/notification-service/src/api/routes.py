@@ -7,76 +7,233 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
-from sqlalchemy.orm import Session
-from typing import List
-from shared.database import get_db
-from shared.dto import NotificationDTO
-from src.api.dependencies import get_current_user_id
+import anyio
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from shared.auth import STREAM_TOKEN_EXPIRE_SECONDS, create_stream_token
+from shared.database import get_db, get_read_db, primary_session
+from shared.dto import DeviceDTO, NotificationDTO
+from shared.pagination import NEXT_CURSOR_HEADER, next_cursor
+from shared.pubsub import build_pubsub
+from shared.serialization import attribute_serializer, list_response
+from shared.unit_of_work import UnitOfWork
+from src.api.connections import ConnectionManager
+from src.api.dependencies import get_current_user_id, get_stream_user_id
+from src.api.event_stream import SSE_REPLAY_LIMIT, EventStream
 from src.application.use_cases import (
     SendNotificationUseCase,
     MarkAsReadUseCase,
-    GetUserNotificationsUseCase
+    MarkAllAsReadUseCase,
+    MarkManyAsReadUseCase,
+    GetUserNotificationsUseCase,
+    GetMissedNotificationsUseCase,
+    GetUnreadCountUseCase,
+    RegisterDeviceUseCase,
+    UnregisterDeviceUseCase
 )
-from src.infrastructure.repository import NotificationRepository
-from src.domain.notification import NotificationType
+from src.infrastructure.repository import DeviceRepository, NotificationRepository
+from src.domain.device import DevicePlatform
+from src.domain.notification import Notification, NotificationType
 import json
 
 router = APIRouter(prefix="/api/v1", tags=["notifications"])
 
-# Simple WebSocket manager for real-time notifications
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: dict[str, WebSocket] = {}
-    
-    async def connect(self, websocket: WebSocket, user_id: str):
-        await websocket.accept()
-        self.active_connections[user_id] = websocket
-    
-    def disconnect(self, user_id: str):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
-    
-    async def send_notification(self, user_id: str, notification: dict):
-        if user_id in self.active_connections:
-            await self.active_connections[user_id].send_json(notification)
+MAX_BATCH_SIZE = 500
+
+# The list endpoint renders entities straight to JSON; response_model stays for the schema
+serialize_notification = attribute_serializer(NotificationDTO)
+
+
+class UnreadCountResponse(BaseModel):
+    """Response model for the unread notification count."""
+    unread: int
+
+
+class MarkManyAsReadRequest(BaseModel):
+    """Request model for marking several notifications as read."""
+    notification_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class MarkAsReadResponse(BaseModel):
+    """Response model for bulk mark-as-read."""
+    updated: int
+
 
-manager = ConnectionManager()
+class StreamTokenResponse(BaseModel):
+    """Response model for a notification stream token."""
+    token: str
+    expires_in: int
+
+
+class RegisterDeviceRequest(BaseModel):
+    """Request model for registering a push device."""
+    device_token: str = Field(..., min_length=1)
+    platform: DevicePlatform
+
+
+class UnregisterDeviceRequest(BaseModel):
+    """Request model for unregistering a push device."""
+    device_token: str = Field(..., min_length=1)
+
+
+# Connections of other workers are reached over the pub/sub backplane
+manager = ConnectionManager(pubsub=build_pubsub())
+
+
+async def push_notifications(notifications: List[Notification]) -> None:
+    """Send stored notifications to every open WebSocket of their users, on any worker."""
+    await manager.send_many(
+        (notification.user_id, serialize_notification(notification))
+        for notification in notifications
+    )
 
 
 @router.get("/notifications", response_model=List[NotificationDTO])
 async def get_notifications(
     unread_only: bool = Query(False),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get notifications for current user."""
+    """Get notifications for current user, newest first, with cursor pagination."""
     repository = NotificationRepository(db)
     use_case = GetUserNotificationsUseCase(repository)
     
-    notifications = await use_case.execute(current_user_id, unread_only)
-    return [
-        NotificationDTO(
-            id=notification.id,
-            user_id=notification.user_id,
-            title=notification.title,
-            message=notification.message,
-            type=notification.type.value,
-            read=notification.read,
-            created_at=notification.created_at
+    try:
+        notifications = await use_case.execute(current_user_id, unread_only, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        for notification in notifications
-    ]
+    cursor_token = next_cursor(notifications, limit)
+    return list_response(
+        notifications,
+        serialize_notification,
+        headers={NEXT_CURSOR_HEADER: cursor_token} if cursor_token else None
+    )
+
+
+@router.post("/notifications/stream-token", response_model=StreamTokenResponse)
+async def create_notification_stream_token(
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Issue a short-lived token for opening the stream with EventSource."""
+    return StreamTokenResponse(
+        token=create_stream_token(current_user_id),
+        expires_in=STREAM_TOKEN_EXPIRE_SECONDS
+    )
+
+
+@router.get("/notifications/stream")
+async def stream_notifications(
+    last_event_id: Optional[str] = Header(None),
+    resume_from: Optional[str] = Query(None, alias="last_event_id"),
+    current_user_id: str = Depends(get_stream_user_id)
+):
+    """Server-Sent Events stream of new notifications for current user.
+
+    EventSource clients authenticate with ``?token=`` from
+    POST /notifications/stream-token, fetch-based ones with the bearer
+    header. On reconnect the browser sends the last event id back as
+    Last-Event-ID and only the notifications created after it are
+    replayed, up to SSE_REPLAY_LIMIT; a "reset" event asks the client to
+    reload the feed when more were missed. A new EventSource, opened once
+    its stream token has expired, passes it as ``?last_event_id=``.
+    """
+    last_event_id = last_event_id or resume_from
+    stream = EventStream()
+    # Register first so nothing created during the replay query is lost
+    connection = await manager.connect(stream, current_user_id)
+    try:
+        if last_event_id:
+            # The primary: a lagging replica would skip what was just missed
+            async with primary_session() as db:
+                use_case = GetMissedNotificationsUseCase(NotificationRepository(db))
+                missed = await use_case.execute(current_user_id, last_event_id, SSE_REPLAY_LIMIT)
+            if missed is None:
+                stream.reset()
+            else:
+                stream.replay([serialize_notification(notification) for notification in missed])
+    except ValueError as e:
+        await manager.disconnect(connection)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except BaseException:
+        await manager.disconnect(connection)
+        raise
+    
+    async def body():
+        try:
+            async for event in stream.events():
+                yield event
+        finally:
+            # The response is cancelled when the client disconnects
+            with anyio.CancelScope(shield=True):
+                await manager.disconnect(connection)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # No caching, and no proxy buffering of the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/notifications/unread-count", response_model=UnreadCountResponse)
+async def get_unread_count(
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Get the number of unread notifications for current user."""
+    repository = NotificationRepository(db)
+    use_case = GetUnreadCountUseCase(repository)
+    
+    return UnreadCountResponse(unread=await use_case.execute(current_user_id))
+
+
+@router.post("/notifications/read-all", response_model=MarkAsReadResponse)
+async def mark_all_as_read(
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Mark every unread notification of current user as read with one UPDATE."""
+    use_case = MarkAllAsReadUseCase(NotificationRepository(db), UnitOfWork(db))
+    
+    return MarkAsReadResponse(updated=await use_case.execute(current_user_id))
+
+
+@router.post("/notifications/read", response_model=MarkAsReadResponse)
+async def mark_many_as_read(
+    request: MarkManyAsReadRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Mark the given notifications of current user as read with one UPDATE.
+    
+    Malformed ids and ids of other users' notifications are ignored and not counted.
+    """
+    use_case = MarkManyAsReadUseCase(NotificationRepository(db), UnitOfWork(db))
+    
+    return MarkAsReadResponse(
+        updated=await use_case.execute(current_user_id, request.notification_ids)
+    )
 
 
 @router.post("/notifications/{notification_id}/read", response_model=NotificationDTO)
 async def mark_as_read(
     notification_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Mark a notification as read."""
     repository = NotificationRepository(db)
-    use_case = MarkAsReadUseCase(repository)
+    use_case = MarkAsReadUseCase(repository, UnitOfWork(db))
     
     try:
         notification = await use_case.execute(notification_id)
@@ -96,14 +253,67 @@ async def mark_as_read(
         )
 
 
+@router.post("/devices", response_model=DeviceDTO, status_code=status.HTTP_201_CREATED)
+async def register_device(
+    request: RegisterDeviceRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Register a device of current user for push notifications."""
+    use_case = RegisterDeviceUseCase(DeviceRepository(db), UnitOfWork(db))
+    
+    try:
+        device = await use_case.execute(current_user_id, request.device_token, request.platform)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return DeviceDTO(
+        id=device.id,
+        device_token=device.device_token,
+        platform=device.platform.value,
+        created_at=device.created_at,
+        last_active_at=device.last_active_at
+    )
+
+
+@router.delete("/devices", status_code=status.HTTP_204_NO_CONTENT)
+async def unregister_device(
+    request: UnregisterDeviceRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Unregister a device of current user, e.g. on logout.
+    
+    The token comes in the body: tokens may contain "/", and URLs end up
+    in access logs.
+    """
+    use_case = UnregisterDeviceUseCase(DeviceRepository(db), UnitOfWork(db))
+    
+    try:
+        await use_case.execute(current_user_id, request.device_token)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
 @router.websocket("/ws/notifications/{user_id}")
 async def websocket_endpoint(websocket: WebSocket, user_id: str):
-    """WebSocket endpoint for real-time notifications."""
-    await manager.connect(websocket, user_id)
+    """WebSocket endpoint for real-time notifications.
+
+    A frame holds one message, or a JSON array of messages queued within
+    the coalescing window.
+    """
+    connection = await manager.connect(websocket, user_id)
     try:
         while True:
-            data = await websocket.receive_text()
-            # Echo or handle incoming messages if needed
-            await websocket.send_json({"type": "ack", "message": "received"})
+            await websocket.receive_text()
+            # Acks go through the queue too, so frames never interleave
+            await manager.send_to(connection, {"type": "ack", "message": "received"})
     except WebSocketDisconnect:
-        manager.disconnect(user_id)
+        pass
+    finally:
+        await manager.disconnect(connection)
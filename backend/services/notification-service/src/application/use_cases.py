@@ -1,15 +1,74 @@
 """Use cases for notification service (application layer)."""
 
-from typing import List
+import logging
+import uuid
+from typing import Dict, List, Optional, Tuple
+from shared.events import EventType, TaskAssignedEvent, TaskUpdatedEvent
+from shared.unit_of_work import IUnitOfWork
+from src.domain.device import DevicePlatform, UserDevice
 from src.domain.notification import Notification, NotificationType
-from src.domain.repository import INotificationRepository
+from src.domain.push import PushMessage
+from src.domain.repository import IDeviceRepository, INotificationRepository
+
+logger = logging.getLogger(__name__)
+
+# Notification ids are derived from (event id, recipient), so a redelivered
+# event maps to notifications that already exist and is skipped on insert
+EVENT_NOTIFICATION_NAMESPACE = uuid.UUID("6f1c2a52-3f0e-4c55-9a53-0b8f3e6d2c41")
+
+
+def _recipients(*user_ids: Optional[str]) -> List[str]:
+    return list(dict.fromkeys(user_id for user_id in user_ids if user_id))
+
+
+def notifications_for_event(event_id: str, event_type: str, payload: dict) -> List[Notification]:
+    """Translate a task event into the notifications it causes.
+
+    Raises ValueError for a payload that does not match its event type.
+    """
+    if event_type == EventType.TASK_ASSIGNED:
+        event = TaskAssignedEvent.model_validate(payload)
+        title = (event.metadata or {}).get("title", "a task")
+        recipients = [event.assigned_to] if event.assigned_to != event.assigned_by else []
+        notification_type = NotificationType.TASK_ASSIGNED
+        heading, message = "Task assigned", f'You have been assigned to "{title}".'
+    elif event_type in (EventType.TASK_UPDATED, EventType.TASK_COMPLETED):
+        event = TaskUpdatedEvent.model_validate(payload)
+        metadata = event.metadata or {}
+        title = metadata.get("title", "A task")
+        if event_type == EventType.TASK_COMPLETED:
+            recipients = _recipients(metadata.get("created_by"), metadata.get("assigned_to"))
+            notification_type = NotificationType.TASK_COMPLETED
+            heading, message = "Task completed", f'"{title}" has been completed.'
+        else:
+            recipients = _recipients(metadata.get("assigned_to"))
+            notification_type = NotificationType.TASK_UPDATED
+            heading, message = "Task updated", f'"{title}" was updated: {", ".join(event.changes)}.'
+    else:
+        return []
+    
+    return [
+        Notification(
+            notification_id=str(uuid.uuid5(EVENT_NOTIFICATION_NAMESPACE, f"{event_id}:{user_id}")),
+            user_id=user_id,
+            title=heading,
+            message=message,
+            notification_type=notification_type
+        )
+        for user_id in recipients
+    ]
 
 
 class SendNotificationUseCase:
     """Use case for sending a notification."""
     
-    def __init__(self, notification_repository: INotificationRepository):
+    def __init__(
+        self,
+        notification_repository: INotificationRepository,
+        unit_of_work: IUnitOfWork
+    ):
         self._notification_repository = notification_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -25,14 +84,55 @@ class SendNotificationUseCase:
             message=message,
             notification_type=notification_type
         )
-        return await self._notification_repository.create(notification)
+        async with self._unit_of_work:
+            notification = await self._notification_repository.create(notification)
+            await self._unit_of_work.commit()
+        return notification
+
+
+class ProcessTaskEventsUseCase:
+    """Use case for turning a batch of task events into notifications."""
+    
+    def __init__(
+        self,
+        notification_repository: INotificationRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._notification_repository = notification_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, events: List[Tuple[str, str, dict]]) -> List[Notification]:
+        """Create the notifications for (event id, event type, payload) triples.
+        
+        Malformed events are logged and skipped. Returns only notifications
+        not created before, so processing a batch again is a no-op.
+        """
+        notifications = {}
+        for event_id, event_type, payload in events:
+            try:
+                for notification in notifications_for_event(event_id, event_type, payload):
+                    notifications[notification.id] = notification
+            except ValueError as e:
+                logger.warning("Skipping malformed %s event %s: %s", event_type, event_id, e)
+        if not notifications:
+            return []
+        
+        async with self._unit_of_work:
+            created = await self._notification_repository.create_many(list(notifications.values()))
+            await self._unit_of_work.commit()
+        return created
 
 
 class MarkAsReadUseCase:
     """Use case for marking a notification as read."""
     
-    def __init__(self, notification_repository: INotificationRepository):
+    def __init__(
+        self,
+        notification_repository: INotificationRepository,
+        unit_of_work: IUnitOfWork
+    ):
         self._notification_repository = notification_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(self, notification_id: str) -> Notification:
         """Mark a notification as read."""
@@ -41,7 +141,51 @@ class MarkAsReadUseCase:
             raise ValueError(f"Notification with id {notification_id} not found")
         
         notification.mark_as_read()
-        return await self._notification_repository.update(notification)
+        async with self._unit_of_work:
+            notification = await self._notification_repository.update(notification)
+            await self._unit_of_work.commit()
+        return notification
+
+
+class MarkAllAsReadUseCase:
+    """Use case for marking all of a user's notifications as read."""
+    
+    def __init__(
+        self,
+        notification_repository: INotificationRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._notification_repository = notification_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, user_id: str) -> int:
+        """Mark all unread notifications of a user as read; return how many changed."""
+        async with self._unit_of_work:
+            updated = await self._notification_repository.mark_all_as_read(user_id)
+            await self._unit_of_work.commit()
+        return updated
+
+
+class MarkManyAsReadUseCase:
+    """Use case for marking several of a user's notifications as read."""
+    
+    def __init__(
+        self,
+        notification_repository: INotificationRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._notification_repository = notification_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, user_id: str, notification_ids: List[str]) -> int:
+        """Mark the given notifications of a user as read; return how many changed."""
+        async with self._unit_of_work:
+            updated = await self._notification_repository.mark_many_as_read(
+                user_id,
+                notification_ids
+            )
+            await self._unit_of_work.commit()
+        return updated
 
 
 class GetUserNotificationsUseCase:
@@ -53,7 +197,121 @@ class GetUserNotificationsUseCase:
     async def execute(
         self,
         user_id: str,
-        unread_only: bool = False
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
     ) -> List[Notification]:
-        """Get notifications for a user."""
-        return await self._notification_repository.get_by_user(user_id, unread_only)
+        """Get a page of notifications for a user."""
+        return await self._notification_repository.get_by_user(user_id, unread_only, cursor, limit)
+
+
+class GetMissedNotificationsUseCase:
+    """Use case for catching a reconnecting client up on what it missed."""
+    
+    def __init__(self, notification_repository: INotificationRepository):
+        self._notification_repository = notification_repository
+    
+    async def execute(self, user_id: str, cursor: str, limit: int) -> Optional[List[Notification]]:
+        """Get notifications created after the cursor, oldest first.
+
+        Returns None when more than ``limit`` were missed; the client should
+        reload its feed instead of replaying them.
+        """
+        missed = await self._notification_repository.get_after(user_id, cursor, limit + 1)
+        return missed if len(missed) <= limit else None
+
+
+class GetUnreadCountUseCase:
+    """Use case for getting a user's unread notification count."""
+    
+    def __init__(self, notification_repository: INotificationRepository):
+        self._notification_repository = notification_repository
+    
+    async def execute(self, user_id: str) -> int:
+        """Get the number of unread notifications for a user."""
+        return await self._notification_repository.count_unread(user_id)
+
+
+class RegisterDeviceUseCase:
+    """Use case for registering a device for push notifications."""
+    
+    def __init__(
+        self,
+        device_repository: IDeviceRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._device_repository = device_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, user_id: str, device_token: str, platform: DevicePlatform) -> UserDevice:
+        """Register a device; registering a known token again refreshes it."""
+        device = UserDevice(user_id=user_id, device_token=device_token, platform=platform)
+        async with self._unit_of_work:
+            device = await self._device_repository.register(device)
+            await self._unit_of_work.commit()
+        return device
+
+
+class UnregisterDeviceUseCase:
+    """Use case for unregistering a device."""
+    
+    def __init__(
+        self,
+        device_repository: IDeviceRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._device_repository = device_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, user_id: str, device_token: str) -> None:
+        """Unregister a device of a user."""
+        async with self._unit_of_work:
+            if not await self._device_repository.unregister(user_id, device_token):
+                raise ValueError("Device not found")
+            await self._unit_of_work.commit()
+
+
+class GetPushMessagesUseCase:
+    """Use case for addressing notifications to their users' devices."""
+    
+    def __init__(self, device_repository: IDeviceRepository):
+        self._device_repository = device_repository
+    
+    async def execute(self, notifications: List[Notification]) -> List[PushMessage]:
+        """One message per (notification, device), with one device lookup for all users."""
+        devices = await self._device_repository.get_by_users(
+            list({notification.user_id for notification in notifications})
+        )
+        tokens: Dict[str, List[str]] = {}
+        for device in devices:
+            tokens.setdefault(device.user_id, []).append(device.device_token)
+        return [
+            PushMessage(
+                device_token=token,
+                user_id=notification.user_id,
+                title=notification.title,
+                body=notification.message,
+                data={"notification_id": notification.id, "type": notification.type.value}
+            )
+            for notification in notifications
+            for token in tokens.get(notification.user_id, ())
+        ]
+
+
+class PruneDevicesUseCase:
+    """Use case for removing devices whose tokens no longer work."""
+    
+    def __init__(
+        self,
+        device_repository: IDeviceRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._device_repository = device_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(self, device_tokens: List[str]) -> int:
+        """Delete the devices of the given tokens; return how many were deleted."""
+        async with self._unit_of_work:
+            deleted = await self._device_repository.delete_tokens(device_tokens)
+            await self._unit_of_work.commit()
+        return deleted
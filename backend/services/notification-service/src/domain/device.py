@@ -0,0 +1,65 @@
+"""Push device domain entity."""
+
+from datetime import datetime
+from typing import Optional
+from uuid import uuid4
+from enum import Enum
+
+# Longest token any push provider hands out, with room to spare
+MAX_DEVICE_TOKEN_LENGTH = 4096
+
+
+class DevicePlatform(str, Enum):
+    """Device platform value object."""
+    IOS = "ios"
+    ANDROID = "android"
+    WEB = "web"
+
+
+class UserDevice:
+    """A device (app install or browser) receiving push notifications for a user."""
+    
+    def __init__(
+        self,
+        user_id: str,
+        device_token: str,
+        platform: DevicePlatform,
+        device_id: Optional[str] = None,
+        created_at: Optional[datetime] = None,
+        last_active_at: Optional[datetime] = None
+    ):
+        if not device_token or len(device_token.strip()) == 0:
+            raise ValueError("Device token cannot be empty")
+        if len(device_token) > MAX_DEVICE_TOKEN_LENGTH:
+            raise ValueError("Device token is too long")
+        
+        self._id = device_id or str(uuid4())
+        self._user_id = user_id
+        self._device_token = device_token.strip()
+        self._platform = DevicePlatform(platform)
+        self._created_at = created_at or datetime.utcnow()
+        self._last_active_at = last_active_at or self._created_at
+    
+    @property
+    def id(self) -> str:
+        return self._id
+    
+    @property
+    def user_id(self) -> str:
+        return self._user_id
+    
+    @property
+    def device_token(self) -> str:
+        return self._device_token
+    
+    @property
+    def platform(self) -> DevicePlatform:
+        return self._platform
+    
+    @property
+    def created_at(self) -> datetime:
+        return self._created_at
+    
+    @property
+    def last_active_at(self) -> datetime:
+        return self._last_active_at
@@ -0,0 +1,40 @@
+"""Push delivery value objects and provider interface (domain layer)."""
+
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Dict, List, NamedTuple, Tuple
+
+
+class PushMessage(NamedTuple):
+    """One notification addressed to one device."""
+    device_token: str
+    user_id: str
+    title: str
+    body: str
+    data: Dict[str, str]
+
+
+class PushResult(str, Enum):
+    """Outcome of sending one push message."""
+    DELIVERED = "delivered"
+    # Temporary failure (throttling, provider unavailable): send again later
+    RETRY = "retry"
+    # The token will never work again (app uninstalled, token rotated)
+    INVALID_TOKEN = "invalid_token"
+    # Rejected for good, but the token is fine
+    FAILED = "failed"
+
+
+class PushProvider(ABC):
+    """Sends push messages through one push service (FCM, APNs, ...)."""
+
+    name: str = "push"
+    # Most messages the service accepts in one request
+    max_batch_size: int = 500
+    # Exceptions failing a whole request temporarily; the batch is retried
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def send(self, messages: List[PushMessage]) -> List[PushResult]:
+        """Send up to ``max_batch_size`` messages; one result per message, in order."""
+        pass
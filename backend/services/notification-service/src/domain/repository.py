@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from typing import Optional, List
+from .device import UserDevice
 from .notification import Notification
 
 
@@ -13,14 +14,35 @@ class INotificationRepository(ABC):
         """Create a new notification."""
         pass
     
+    @abstractmethod
+    async def create_many(self, notifications: List[Notification]) -> List[Notification]:
+        """Create notifications, skipping ids that already exist; return those created."""
+        pass
+    
     @abstractmethod
     async def get_by_id(self, notification_id: str) -> Optional[Notification]:
         """Get notification by ID."""
         pass
     
     @abstractmethod
-    async def get_by_user(self, user_id: str, unread_only: bool = False) -> List[Notification]:
-        """Get notifications for a user."""
+    async def get_by_user(
+        self,
+        user_id: str,
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> List[Notification]:
+        """Get a page of notifications for a user, newest first."""
+        pass
+    
+    @abstractmethod
+    async def get_after(self, user_id: str, cursor: str, limit: int) -> List[Notification]:
+        """Get notifications of a user created after a cursor position, oldest first."""
+        pass
+    
+    @abstractmethod
+    async def count_unread(self, user_id: str) -> int:
+        """Get the number of unread notifications for a user."""
         pass
     
     @abstractmethod
@@ -32,3 +54,32 @@ class INotificationRepository(ABC):
     async def mark_all_as_read(self, user_id: str) -> int:
         """Mark all notifications as read for a user."""
         pass
+    
+    @abstractmethod
+    async def mark_many_as_read(self, user_id: str, notification_ids: List[str]) -> int:
+        """Mark the given notifications of a user as read."""
+        pass
+
+
+class IDeviceRepository(ABC):
+    """Interface for push device repository."""
+    
+    @abstractmethod
+    async def register(self, device: UserDevice) -> UserDevice:
+        """Store a device, moving its token to this user if it was registered before."""
+        pass
+    
+    @abstractmethod
+    async def unregister(self, user_id: str, device_token: str) -> bool:
+        """Remove a device of a user; False if it was not registered."""
+        pass
+    
+    @abstractmethod
+    async def get_by_users(self, user_ids: List[str]) -> List[UserDevice]:
+        """Get the devices of several users at once."""
+        pass
+    
+    @abstractmethod
+    async def delete_tokens(self, device_tokens: List[str]) -> int:
+        """Remove devices whose tokens the push provider rejected for good."""
+        pass
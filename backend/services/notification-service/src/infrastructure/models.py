@@ -7,11 +7,12 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from sqlalchemy import Column, String, DateTime, Boolean, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, Boolean, Integer, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 from shared.database import Base
+from src.domain.device import DevicePlatform
 from src.domain.notification import NotificationType
 
 
@@ -21,9 +22,38 @@ class NotificationModel(Base):
     __tablename__ = "notifications"
     
     id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(UUID(as_uuid=False), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=False), nullable=False)
     title = Column(String, nullable=False)
     message = Column(String, nullable=False)
     type = Column(SQLEnum(NotificationType), nullable=False)
     read = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    # The feed pages on (created_at, id) newest first, over all or only unread notifications
+    __table_args__ = (
+        Index("ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_notifications_user_id_read_created_at_id", "user_id", "read", "created_at", "id"),
+    )
+
+
+class NotificationCounterModel(Base):
+    """Per-user unread notification count, maintained alongside every write."""
+    
+    __tablename__ = "notification_counters"
+    
+    user_id = Column(UUID(as_uuid=False), primary_key=True)
+    unread = Column(Integer, default=0, nullable=False)
+
+
+class UserDeviceModel(Base):
+    """SQLAlchemy model for UserDevice."""
+    
+    __tablename__ = "user_devices"
+    
+    id = Column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(UUID(as_uuid=False), nullable=False, index=True)
+    # A token identifies one app install, so it belongs to one user at a time
+    device_token = Column(String, nullable=False, unique=True)
+    platform = Column(SQLEnum(DevicePlatform), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_active_at = Column(DateTime, default=datetime.utcnow, nullable=False)
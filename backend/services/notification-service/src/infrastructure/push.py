@@ -0,0 +1,87 @@
+"""Push provider implementations."""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to Python path for imports
+backend_dir = Path(__file__).parent.parent.parent.parent.parent
+sys.path.insert(0, str(backend_dir))
+
+import logging
+import os
+from typing import Iterable, List
+from src.domain.push import PushMessage, PushProvider, PushResult
+
+logger = logging.getLogger(__name__)
+
+# Which PushProvider delivers pushes; see PUSH_PROVIDERS
+PUSH_PROVIDER = os.getenv("PUSH_PROVIDER", "log")
+
+
+def mask_token(device_token: str) -> str:
+    """Shorten a device token for logs: anyone holding it can push to the device."""
+    if len(device_token) <= 8:
+        return "***"
+    return f"...{device_token[-4:]}"
+
+
+class LogPushProvider(PushProvider):
+    """Logs pushes instead of sending them, for local development."""
+
+    name = "log"
+
+    async def send(self, messages: List[PushMessage]) -> List[PushResult]:
+        for message in messages:
+            logger.info("Push to %s of user %s: %s", mask_token(message.device_token), message.user_id, message.title)
+        return [PushResult.DELIVERED] * len(messages)
+
+
+class FakePushProvider(PushProvider):
+    """Records batches and fails on request, for tests."""
+
+    name = "fake"
+    errors = (ConnectionError,)
+
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        invalid_tokens: Iterable[str] = (),
+        unavailable_requests: int = 0
+    ):
+        self.max_batch_size = max_batch_size
+        self.invalid_tokens = set(invalid_tokens)
+        # The next this many requests fail as if the service were down
+        self.unavailable_requests = unavailable_requests
+        # Every request, including failed ones
+        self.batches: List[List[PushMessage]] = []
+        self.delivered: List[PushMessage] = []
+
+    async def send(self, messages: List[PushMessage]) -> List[PushResult]:
+        if len(messages) > self.max_batch_size:
+            raise ValueError(f"Batch of {len(messages)} exceeds {self.max_batch_size}")
+        self.batches.append(list(messages))
+        if self.unavailable_requests > 0:
+            self.unavailable_requests -= 1
+            raise ConnectionError("Push service unavailable")
+        results = []
+        for message in messages:
+            if message.device_token in self.invalid_tokens:
+                results.append(PushResult.INVALID_TOKEN)
+            else:
+                self.delivered.append(message)
+                results.append(PushResult.DELIVERED)
+        return results
+
+
+PUSH_PROVIDERS = {
+    LogPushProvider.name: LogPushProvider,
+    FakePushProvider.name: FakePushProvider,
+}
+
+
+def build_push_provider() -> PushProvider:
+    """The provider named by PUSH_PROVIDER."""
+    try:
+        return PUSH_PROVIDERS[PUSH_PROVIDER]()
+    except KeyError:
+        raise ValueError(f"Unknown push provider {PUSH_PROVIDER!r}") from None
@@ -1,80 +1,258 @@
 """Notification repository implementation (infrastructure layer)."""
 
+from collections import Counter
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import Select
+from shared.database import DbSession, is_uuid
+from shared.pagination import decode_cursor
+from src.domain.device import UserDevice
 from src.domain.notification import Notification
-from src.domain.repository import INotificationRepository
-from src.infrastructure.models import NotificationModel
+from src.domain.repository import IDeviceRepository, INotificationRepository
+from src.infrastructure.models import NotificationModel, NotificationCounterModel, UserDeviceModel
+
+
+def seed_unread_counters(bind) -> None:
+    """Count the unread notifications of every user into notification_counters.
+
+    Only needed once, when the counter table is created next to existing
+    notifications; from then on every write keeps the counters current.
+    Users that already have a counter are left alone.
+    """
+    with bind.begin() as connection:
+        connection.execute(
+            pg_insert(NotificationCounterModel)
+            .from_select(
+                ["user_id", "unread"],
+                select(NotificationModel.user_id, func.count())
+                .where(NotificationModel.read == False)
+                .group_by(NotificationModel.user_id)
+            )
+            .on_conflict_do_nothing(index_elements=[NotificationCounterModel.user_id])
+        )
 
 
 class NotificationRepository(INotificationRepository):
     """SQLAlchemy implementation of notification repository."""
     
-    def __init__(self, db: Session):
+    COLUMNS = tuple(NotificationModel.__table__.columns)
+    
+    def __init__(self, db: DbSession):
         self._db = db
     
     async def create(self, notification: Notification) -> Notification:
-        """Create a new notification."""
-        db_notification = NotificationModel(
-            id=notification.id,
-            user_id=notification.user_id,
-            title=notification.title,
-            message=notification.message,
-            type=notification.type,
-            read=notification.read,
-            created_at=notification.created_at
-        )
-        self._db.add(db_notification)
-        self._db.commit()
-        self._db.refresh(db_notification)
-        return self._to_domain(db_notification)
+        """Create a new notification with a single INSERT ... RETURNING."""
+        result = await self._db.execute(
+            insert(NotificationModel)
+            .values(
+                id=notification.id,
+                user_id=notification.user_id,
+                title=notification.title,
+                message=notification.message,
+                type=notification.type,
+                read=notification.read,
+                created_at=notification.created_at
+            )
+            .returning(*self.COLUMNS)
+        )
+        row = result.one()
+        if not row.read:
+            await self._adjust_unread(row.user_id, 1)
+        return self._to_domain(row)
+    
+    async def create_many(self, notifications: List[Notification]) -> List[Notification]:
+        """Insert notifications with one multi-row INSERT, skipping existing ids.
+        
+        Returns only the notifications actually inserted, so replaying a batch
+        with the same ids changes nothing.
+        """
+        if not notifications:
+            return []
+        result = await self._db.execute(
+            pg_insert(NotificationModel)
+            .values([
+                {
+                    "id": notification.id,
+                    "user_id": notification.user_id,
+                    "title": notification.title,
+                    "message": notification.message,
+                    "type": notification.type,
+                    "read": notification.read,
+                    "created_at": notification.created_at,
+                }
+                for notification in notifications
+            ])
+            .on_conflict_do_nothing(index_elements=[NotificationModel.id])
+            .returning(*self.COLUMNS)
+        )
+        created = [self._to_domain(row) for row in result.all()]
+        unread = Counter(notification.user_id for notification in created if not notification.read)
+        if unread:
+            # Sorted, so concurrent batches lock counter rows in the same order
+            statement = pg_insert(NotificationCounterModel).values([
+                {"user_id": user_id, "unread": unread[user_id]} for user_id in sorted(unread)
+            ])
+            await self._db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[NotificationCounterModel.user_id],
+                    set_={"unread": NotificationCounterModel.unread + statement.excluded.unread}
+                )
+            )
+        return created
     
     async def get_by_id(self, notification_id: str) -> Optional[Notification]:
         """Get notification by ID."""
-        db_notification = self._db.query(NotificationModel)\
-            .filter(NotificationModel.id == notification_id)\
-            .first()
+        db_notification = await self._db.get(NotificationModel, notification_id)
         return self._to_domain(db_notification) if db_notification else None
     
     async def get_by_user(
         self,
         user_id: str,
-        unread_only: bool = False
+        unread_only: bool = False,
+        cursor: Optional[str] = None,
+        limit: int = 50
     ) -> List[Notification]:
-        """Get notifications for a user."""
-        query = self._db.query(NotificationModel)\
-            .filter(NotificationModel.user_id == user_id)
+        """Get notifications for a user, newest first, keyset-paginated on (created_at, id)."""
+        query = select(*self.COLUMNS).where(NotificationModel.user_id == user_id)
         
         if unread_only:
-            query = query.filter(NotificationModel.read == False)
+            query = query.where(NotificationModel.read == False)
         
-        db_notifications = query.order_by(NotificationModel.created_at.desc()).all()
-        return [self._to_domain(db_notification) for db_notification in db_notifications]
+        result = await self._db.execute(self.paginate(query, cursor, limit))
+        return [self._to_domain(row) for row in result.all()]
+    
+    async def get_after(self, user_id: str, cursor: str, limit: int) -> List[Notification]:
+        """Get notifications created after a cursor position, oldest first.
+
+        Seeks forward on the same (user_id, created_at, id) index the feed
+        reads backwards. Raises ValueError for a malformed cursor.
+        """
+        result = await self._db.execute(
+            select(*self.COLUMNS)
+            .where(
+                NotificationModel.user_id == user_id,
+                self._position() > self._cursor_position(cursor)
+            )
+            .order_by(NotificationModel.created_at, NotificationModel.id)
+            .limit(limit)
+        )
+        return [self._to_domain(row) for row in result.all()]
+    
+    async def count_unread(self, user_id: str) -> int:
+        """Get the number of unread notifications from the user's counter."""
+        unread = await self._db.scalar(
+            select(NotificationCounterModel.unread)
+            .where(NotificationCounterModel.user_id == user_id)
+        )
+        return unread or 0
     
     async def update(self, notification: Notification) -> Notification:
-        """Update an existing notification."""
-        db_notification = self._db.query(NotificationModel)\
-            .filter(NotificationModel.id == notification.id)\
-            .first()
-        if not db_notification:
-            raise ValueError(f"Notification with id {notification.id} not found")
+        """Update an existing notification with a single UPDATE ... RETURNING.
         
-        db_notification.read = notification.read
-        self._db.commit()
-        self._db.refresh(db_notification)
-        return self._to_domain(db_notification)
+        The UPDATE only matches when the read flag actually changes, so the
+        row lock it takes decides which of two concurrent writers moves the
+        unread counter.
+        """
+        result = await self._db.execute(
+            update(NotificationModel)
+            .where(NotificationModel.id == notification.id)
+            .where(NotificationModel.read != notification.read)
+            .values(read=notification.read)
+            .returning(*self.COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
+            # Already in the requested state, or gone
+            unchanged = await self.get_by_id(notification.id)
+            if unchanged is None:
+                raise ValueError(f"Notification with id {notification.id} not found")
+            return unchanged
+        await self._adjust_unread(row.user_id, -1 if row.read else 1)
+        return self._to_domain(row)
     
     async def mark_all_as_read(self, user_id: str) -> int:
         """Mark all notifications as read for a user."""
-        count = self._db.query(NotificationModel)\
-            .filter(NotificationModel.user_id == user_id)\
-            .filter(NotificationModel.read == False)\
-            .update({"read": True})
-        self._db.commit()
-        return count
+        return await self._mark_read(
+            update(NotificationModel).where(NotificationModel.user_id == user_id),
+            user_id
+        )
+    
+    async def mark_many_as_read(self, user_id: str, notification_ids: List[str]) -> int:
+        """Mark the given notifications of a user as read with a single UPDATE.
+        
+        Ids that are malformed, do not exist, belong to another user or are
+        already read are not counted.
+        """
+        notification_ids = [notification_id for notification_id in notification_ids if is_uuid(notification_id)]
+        if not notification_ids:
+            return 0
+        return await self._mark_read(
+            update(NotificationModel)
+            .where(NotificationModel.user_id == user_id)
+            .where(NotificationModel.id.in_(notification_ids)),
+            user_id
+        )
+    
+    async def _mark_read(self, statement, user_id: str) -> int:
+        """Run a user-scoped UPDATE marking unread notifications read, and count them."""
+        result = await self._db.execute(
+            statement
+            .where(NotificationModel.read == False)
+            .values(read=True)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            # Subtract rather than reset: notifications created concurrently stay counted
+            await self._adjust_unread(user_id, -result.rowcount)
+        return result.rowcount
+    
+    async def _adjust_unread(self, user_id: str, delta: int) -> None:
+        """Move the user's unread counter by ``delta`` in the current transaction."""
+        statement = pg_insert(NotificationCounterModel).values(
+            user_id=user_id,
+            unread=max(delta, 0)
+        )
+        await self._db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[NotificationCounterModel.user_id],
+                set_={"unread": func.greatest(NotificationCounterModel.unread + delta, 0)}
+            )
+        )
+    
+    @staticmethod
+    def paginate(query: Select, cursor: Optional[str], limit: int) -> Select:
+        """Order newest first on (created_at, id) and seek past the cursor.
+
+        Raises ValueError for a malformed cursor.
+        """
+        if cursor:
+            query = query.where(
+                NotificationRepository._position() < NotificationRepository._cursor_position(cursor)
+            )
+        return query.order_by(
+            NotificationModel.created_at.desc(),
+            NotificationModel.id.desc()
+        ).limit(limit)
+    
+    @staticmethod
+    def _position():
+        """The (created_at, id) sort key as a row value."""
+        return tuple_(NotificationModel.created_at, NotificationModel.id)
+    
+    @staticmethod
+    def _cursor_position(cursor: str):
+        """A cursor as a row value comparable with _position()."""
+        created_at, notification_id = decode_cursor(cursor)
+        return tuple_(
+            created_at,
+            notification_id,
+            types=[NotificationModel.created_at.type, NotificationModel.id.type]
+        )
     
     def _to_domain(self, db_notification: NotificationModel) -> Notification:
-        """Convert database model to domain entity."""
+        """Convert database model or row to domain entity."""
         return Notification(
             notification_id=db_notification.id,
             user_id=db_notification.user_id,
@@ -84,3 +262,76 @@ class NotificationRepository(INotificationRepository):
             read=db_notification.read,
             created_at=db_notification.created_at
         )
+
+
+class DeviceRepository(IDeviceRepository):
+    """PostgreSQL implementation of device repository."""
+    
+    COLUMNS = tuple(UserDeviceModel.__table__.columns)
+    
+    def __init__(self, db: DbSession):
+        self._db = db
+    
+    async def register(self, device: UserDevice) -> UserDevice:
+        """Upsert on the token: re-registering refreshes it, another user takes it over."""
+        statement = pg_insert(UserDeviceModel).values(
+            id=device.id,
+            user_id=device.user_id,
+            device_token=device.device_token,
+            platform=device.platform,
+            created_at=device.created_at,
+            last_active_at=device.last_active_at
+        )
+        result = await self._db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserDeviceModel.device_token],
+                set_={
+                    "user_id": statement.excluded.user_id,
+                    "platform": statement.excluded.platform,
+                    "last_active_at": statement.excluded.last_active_at,
+                }
+            )
+            .returning(*self.COLUMNS)
+        )
+        return self._to_domain(result.one())
+    
+    async def unregister(self, user_id: str, device_token: str) -> bool:
+        """Delete a device of a user."""
+        result = await self._db.execute(
+            delete(UserDeviceModel)
+            .where(UserDeviceModel.user_id == user_id)
+            .where(UserDeviceModel.device_token == device_token)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+    
+    async def get_by_users(self, user_ids: List[str]) -> List[UserDevice]:
+        """Get the devices of several users with one query."""
+        if not user_ids:
+            return []
+        result = await self._db.execute(
+            select(*self.COLUMNS).where(UserDeviceModel.user_id.in_(user_ids))
+        )
+        return [self._to_domain(row) for row in result.all()]
+    
+    async def delete_tokens(self, device_tokens: List[str]) -> int:
+        """Delete devices by token with one statement, whoever they belong to."""
+        if not device_tokens:
+            return 0
+        result = await self._db.execute(
+            delete(UserDeviceModel)
+            .where(UserDeviceModel.device_token.in_(device_tokens))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def _to_domain(self, db_device: UserDeviceModel) -> UserDevice:
+        """Convert database model or row to domain entity."""
+        return UserDevice(
+            device_id=db_device.id,
+            user_id=db_device.user_id,
+            device_token=db_device.device_token,
+            platform=db_device.platform,
+            created_at=db_device.created_at,
+            last_active_at=db_device.last_active_at
+        )
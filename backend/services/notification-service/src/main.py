@@ -7,18 +7,76 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import List
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from src.api.routes import router
-from shared.database import engine, Base
+from sqlalchemy import inspect
+from src.api.event_consumer import TaskEventConsumer
+from src.api.push_dispatcher import PushDispatcher
+from src.api.routes import router, manager, push_notifications
+from src.domain.notification import Notification
+from src.infrastructure.models import NotificationCounterModel
+from src.infrastructure.push import build_push_provider
+from src.infrastructure.repository import seed_unread_counters
+from shared.auth import token_cache
+from shared.broker import build_broker
+from shared.database import engine, Base, ensure_indexes
+from shared.pagination import NEXT_CURSOR_HEADER
 
-# Create database tables
+logger = logging.getLogger(__name__)
+
+# Set EVENT_CONSUMER_ENABLED=false to serve the API without consuming task events
+EVENT_CONSUMER_ENABLED = os.getenv("EVENT_CONSUMER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Set PUSH_DISPATCH_ENABLED=false to skip push delivery to registered devices
+PUSH_DISPATCH_ENABLED = os.getenv("PUSH_DISPATCH_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Create database tables and any indexes added since; unread counters are
+# seeded from existing notifications when their table is first created
+seed_counters = not inspect(engine).has_table(NotificationCounterModel.__tablename__)
 Base.metadata.create_all(bind=engine)
+ensure_indexes(engine)
+if seed_counters:
+    seed_unread_counters(engine)
+
+push_dispatcher = PushDispatcher(build_push_provider())
+
+
+async def deliver_notifications(notifications: List[Notification]) -> None:
+    """Push new notifications to open connections and queue them for devices."""
+    await push_notifications(notifications)
+    if PUSH_DISPATCH_ENABLED:
+        push_dispatcher.enqueue(notifications)
+
+
+event_broker = build_broker()
+event_consumer = TaskEventConsumer(event_broker, deliver_notifications) if event_broker is not None else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Consume task events, dispatch device pushes and forward other workers' pushes."""
+    manager.start()
+    if PUSH_DISPATCH_ENABLED:
+        push_dispatcher.start()
+    if event_consumer is None:
+        logger.warning("EVENT_BROKER_URL is not set: task events are not consumed")
+    elif EVENT_CONSUMER_ENABLED:
+        event_consumer.start()
+    yield
+    if event_consumer is not None:
+        await event_consumer.stop()
+    await push_dispatcher.stop()
+    await manager.stop()
+
 
 app = FastAPI(
     title="Notification Service API",
     description="Notification microservice with WebSocket support",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -28,6 +86,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 app.include_router(router)
@@ -36,4 +95,11 @@ app.include_router(router)
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "notification-service"}
+    return {
+        "status": "healthy",
+        "service": "notification-service",
+        "token_cache": token_cache.metrics(),
+        "event_consumer": event_consumer.metrics() if event_consumer is not None else None,
+        "websockets": manager.metrics(),
+        "push": push_dispatcher.metrics()
+    }
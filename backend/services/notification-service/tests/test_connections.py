@@ -0,0 +1,170 @@
+"""Unit tests for the WebSocket connection manager."""
+
+import asyncio
+import orjson
+import pytest
+from shared.pubsub import InMemoryPubSub, InMemoryPubSubHub
+from src.api.connections import ConnectionManager, user_channel
+
+
+class FakeWebSocket:
+    """WebSocket stand-in; a stalled one never finishes sending."""
+    
+    def __init__(self, stalled=False):
+        self.stalled = stalled
+        self.sent = []
+        self.close_code = None
+    
+    async def accept(self):
+        pass
+    
+    async def send_text(self, data):
+        if self.stalled:
+            await asyncio.Event().wait()
+        self.sent.append(orjson.loads(data))
+    
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+async def settle():
+    """Let writer tasks drain their queues."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_every_connection_of_a_user_receives_messages():
+    """Test that a second tab no longer replaces the first."""
+    manager = ConnectionManager(queue_size=10, coalesce_window=0)
+    first, second, other = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    
+    async def scenario():
+        await manager.connect(first, "user-1")
+        connection = await manager.connect(second, "user-1")
+        await manager.connect(other, "user-2")
+        await manager.send_many([("user-1", {"n": 1}), ("user-2", {"n": 2})])
+        await settle()
+        await manager.disconnect(connection)
+        await manager.send_notification("user-1", {"n": 3})
+        await settle()
+    
+    asyncio.run(scenario())
+    
+    assert first.sent == [{"n": 1}, {"n": 3}]
+    assert second.sent == [{"n": 1}]
+    assert other.sent == [{"n": 2}]
+    assert manager.metrics()["connections"] == 2
+
+
+@pytest.mark.parametrize("policy", ["drop", "disconnect"])
+def test_stalled_client_does_not_hold_up_others(policy):
+    """Test that a full queue triggers the policy while healthy clients keep receiving."""
+    manager = ConnectionManager(queue_size=2, policy=policy, coalesce_window=0)
+    healthy, stalled = FakeWebSocket(), FakeWebSocket(stalled=True)
+    
+    async def scenario():
+        await manager.connect(healthy, "user-1")
+        await manager.connect(stalled, "user-1")
+        for n in range(5):
+            await asyncio.wait_for(manager.send_notification("user-1", {"n": n}), 1)
+            await settle()
+    
+    asyncio.run(scenario())
+    
+    assert healthy.sent == [{"n": n} for n in range(5)]
+    metrics = manager.metrics()
+    if policy == "drop":
+        # One message is stuck in send_text, two are queued
+        assert metrics["dropped"] == 2
+        assert stalled.close_code is None
+    else:
+        assert metrics["slow_disconnects"] == 1
+        assert stalled.close_code == 1013
+        assert metrics["connections"] == 1
+
+
+def test_unknown_policy_is_rejected():
+    """Test that a misconfigured policy fails at startup."""
+    with pytest.raises(ValueError):
+        ConnectionManager(policy="block")
+
+
+def test_messages_reach_connections_on_other_workers():
+    """Test that a push from one worker reaches the user's sockets on another, once."""
+    hub = InMemoryPubSubHub()
+    worker_a = ConnectionManager(queue_size=10, pubsub=InMemoryPubSub(hub), coalesce_window=0)
+    worker_b = ConnectionManager(queue_size=10, pubsub=InMemoryPubSub(hub), coalesce_window=0)
+    local, remote = FakeWebSocket(), FakeWebSocket()
+    
+    async def scenario():
+        worker_a.start()
+        worker_b.start()
+        await worker_a.connect(local, "user-1")
+        connection = await worker_b.connect(remote, "user-1")
+        await worker_a.send_many([("user-1", {"n": 1}), ("user-2", {"n": 2})])
+        await asyncio.sleep(0.05)
+        await worker_b.disconnect(connection)
+        subscribers = {channel: len(workers) for channel, workers in hub.subscribers.items()}
+        await worker_a.stop()
+        await worker_b.stop()
+        return subscribers
+    
+    subscribers = asyncio.run(scenario())
+    
+    assert local.sent == [{"n": 1}]
+    assert remote.sent == [{"n": 1}]
+    # Only workers holding a connection of the user stay subscribed
+    assert subscribers == {user_channel("user-1"): 1}
+    assert worker_a.metrics()["backplane"]["received"] == 0
+    assert worker_b.metrics()["backplane"]["received"] == 1
+
+
+def test_bursts_are_coalesced_into_array_frames():
+    """Test that messages queued within the window share a frame, up to the batch size."""
+    manager = ConnectionManager(queue_size=100, coalesce_window=0.05, max_batch=4)
+    websocket = FakeWebSocket()
+    
+    async def scenario():
+        await manager.connect(websocket, "user-1")
+        await manager.send_many(("user-1", {"n": n}) for n in range(6))
+        await asyncio.sleep(0.2)
+        await manager.send_notification("user-1", {"n": 6})
+        await asyncio.sleep(0.2)
+    
+    asyncio.run(scenario())
+    
+    assert websocket.sent == [
+        [{"n": 0}, {"n": 1}, {"n": 2}, {"n": 3}],
+        [{"n": 4}, {"n": 5}],
+        {"n": 6},
+    ]
+    metrics = manager.metrics()
+    assert metrics["sent"] == 7
+    assert metrics["frames"] == 3
+
+
+def test_cancelled_close_still_stops_writer_and_unsubscribes():
+    """Test that a disconnect cancelled mid-cleanup, as on a dropped request, leaks nothing."""
+    hub = InMemoryPubSubHub()
+    
+    class SlowUnsubscribe(InMemoryPubSub):
+        async def unsubscribe(self, channel):
+            await asyncio.sleep(0.05)
+            await super().unsubscribe(channel)
+    
+    manager = ConnectionManager(queue_size=10, pubsub=SlowUnsubscribe(hub), coalesce_window=0)
+    
+    async def scenario():
+        connection = await manager.connect(FakeWebSocket(), "user-1")
+        closing = asyncio.create_task(manager.disconnect(connection))
+        await settle()
+        closing.cancel()
+        await asyncio.gather(closing, return_exceptions=True)
+        await asyncio.sleep(0.1)
+        return connection._writer
+    
+    writer = asyncio.run(scenario())
+    
+    assert writer.cancelled()
+    assert hub.subscribers == {}
+    assert manager.metrics()["connections"] == 0
@@ -0,0 +1,175 @@
+"""Tests for turning task events into notifications."""
+
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+
+import orjson
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from shared.broker import InMemoryBroker
+from shared.database import Base, SyncSessionAdapter
+from src.api.event_consumer import TaskEventConsumer
+from src.application.use_cases import notifications_for_event
+from src.domain.notification import NotificationType
+from src.infrastructure.repository import NotificationRepository
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "notification_consumer_tests"
+STREAM = "test-events"
+
+
+def completed_payload(task_id, created_by, assigned_to):
+    return {
+        "event_type": "task.completed",
+        "aggregate_id": task_id,
+        "occurred_at": "2024-01-01T12:00:00",
+        "task_id": task_id,
+        "changes": {"status": "done"},
+        "metadata": {"title": "Ship it", "created_by": created_by, "assigned_to": assigned_to},
+    }
+
+
+def assigned_payload(task_id, assigned_to, assigned_by):
+    return {
+        "event_type": "task.assigned",
+        "aggregate_id": task_id,
+        "occurred_at": "2024-01-01T12:00:00",
+        "task_id": task_id,
+        "assigned_to": assigned_to,
+        "assigned_by": assigned_by,
+        "metadata": {"title": "Ship it", "created_by": assigned_by, "assigned_to": assigned_to},
+    }
+
+
+def test_events_map_to_notifications_with_stable_ids():
+    """Test that recipients follow the event type and ids depend only on event and user."""
+    creator, assignee = str(uuid.uuid4()), str(uuid.uuid4())
+    
+    completed = notifications_for_event("7", "task.completed", completed_payload("task-1", creator, assignee))
+    again = notifications_for_event("7", "task.completed", completed_payload("task-1", creator, assignee))
+    
+    assert [n.user_id for n in completed] == [creator, assignee]
+    assert {n.type for n in completed} == {NotificationType.TASK_COMPLETED}
+    assert [n.id for n in completed] == [n.id for n in again]
+    assert notifications_for_event("8", "task.assigned", assigned_payload("task-1", creator, creator)) == []
+    assert notifications_for_event("9", "task.created", {}) == []
+    with pytest.raises(ValueError):
+        notifications_for_event("10", "task.assigned", {"task_id": "task-1"})
+
+
+@pytest.fixture
+def engine():
+    """Empty PostgreSQL schema dedicated to one test."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def message(event_id, payload):
+    return {
+        "event_id": str(event_id).encode(),
+        "event_type": payload["event_type"].encode(),
+        "payload": orjson.dumps(payload),
+    }
+
+
+def test_consumer_stores_batches_once_and_pushes_new_notifications(engine):
+    """Test that a batch becomes one insert, and redelivered events create nothing."""
+    @asynccontextmanager
+    async def open_session():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+    
+    creator, assignee = str(uuid.uuid4()), str(uuid.uuid4())
+    pushed = []
+    
+    async def on_created(notifications):
+        pushed.extend(notifications)
+    
+    broker = InMemoryBroker()
+    consumer = TaskEventConsumer(
+        broker, on_created, STREAM, "test-group", "worker-1", open_session,
+        batch_size=10, flush_interval=0.05
+    )
+    events = [
+        message(1, assigned_payload("task-1", assignee, creator)),
+        message(2, completed_payload("task-1", creator, assignee)),
+        {"event_id": b"3"},
+    ]
+    
+    async def scenario():
+        await broker.ensure_group(STREAM, "test-group")
+        await broker.publish(STREAM, events)
+        await consumer.process(await consumer.next_batch())
+        # The relay may publish the same events again
+        await broker.publish(STREAM, events[:2])
+        await consumer.process(await consumer.next_batch())
+        async with open_session() as db:
+            repository = NotificationRepository(db)
+            return (
+                await repository.count_unread(assignee),
+                await repository.count_unread(creator),
+                await consumer.next_batch(pending=True)
+            )
+    
+    assert asyncio.run(scenario()) == (2, 1, [])
+    assert sorted(n.type.value for n in pushed) == ["task_assigned", "task_completed", "task_completed"]
+    metrics = consumer.metrics()
+    assert (metrics["batches"], metrics["consumed"], metrics["skipped"]) == (2, 5, 1)
+    assert metrics["notifications_created"] == 3
+
+
+def test_poison_event_is_dead_lettered_without_holding_up_others(engine):
+    """Test that an event failing every delivery is set aside while its batch goes through."""
+    @asynccontextmanager
+    async def open_session():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+    
+    creator, assignee = str(uuid.uuid4()), str(uuid.uuid4())
+    broker = InMemoryBroker()
+    consumer = TaskEventConsumer(
+        broker, lambda notifications: asyncio.sleep(0), STREAM, "test-group", "worker-1",
+        open_session, batch_size=10, flush_interval=0.01, max_deliveries=3,
+        dead_letter_stream="test-dead"
+    )
+    # Well-formed, but the database rejects the recipient on every attempt
+    poison = assigned_payload("task-2", "not-a-uuid", creator)
+    
+    async def scenario():
+        await broker.ensure_group(STREAM, "test-group")
+        await broker.publish(STREAM, [
+            message(1, assigned_payload("task-1", assignee, creator)),
+            message(2, poison),
+            message(3, completed_payload("task-1", creator, assignee)),
+        ])
+        consumer.start()
+        await asyncio.sleep(1.5)
+        await consumer.stop()
+        async with open_session() as db:
+            repository = NotificationRepository(db)
+            return (
+                await repository.count_unread(assignee),
+                await repository.count_unread(creator),
+                await consumer.next_batch(pending=True)
+            )
+    
+    assert asyncio.run(scenario()) == (2, 1, [])
+    dead = broker.messages("test-dead")
+    assert [(m["event_id"], m["entry_id"]) for m in dead] == [(b"2", b"2-0")]
+    assert consumer.metrics()["dead_lettered"] == 1
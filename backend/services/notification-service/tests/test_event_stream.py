@@ -0,0 +1,93 @@
+"""Unit tests for the Server-Sent Events notification stream."""
+
+import asyncio
+from datetime import datetime
+import orjson
+from shared.pagination import decode_cursor
+from src.api.connections import ConnectionManager
+from src.api.event_stream import EventStream
+
+
+def notification_id(n):
+    return f"00000000-0000-0000-0000-{n:012d}"
+
+
+def notification(n):
+    return {"id": notification_id(n), "title": "Task assigned", "created_at": datetime(2024, 1, 1, 0, n)}
+
+
+def parse(chunks):
+    """Split SSE chunks into (event, id, data) tuples, skipping the retry hint."""
+    events = []
+    for chunk in chunks:
+        fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        if "event" in fields:
+            events.append((fields["event"], fields.get("id"), orjson.loads(fields["data"])))
+    return events
+
+
+def collect(manager, stream, connection, live):
+    """Read the stream while ``live`` messages are pushed, until the connection closes."""
+    async def read():
+        return [chunk async for chunk in stream.events()]
+    
+    async def scenario():
+        reader = asyncio.create_task(read())
+        await manager.send_many(live)
+        await asyncio.sleep(0.05)
+        await manager.disconnect(connection)
+        return await asyncio.wait_for(reader, 1)
+    
+    return scenario
+
+
+def test_replay_precedes_live_events_without_duplicates():
+    """Test that missed notifications come first and live repeats of them are trimmed."""
+    manager = ConnectionManager(queue_size=10, coalesce_window=0)
+    stream = EventStream()
+    
+    async def scenario():
+        connection = await manager.connect(stream, "user-1")
+        stream.replay([notification(1), notification(2)])
+        live = [("user-1", notification(2)), ("user-1", notification(3))]
+        return await collect(manager, stream, connection, live)()
+    
+    events = parse(asyncio.run(scenario()))
+    
+    assert [(event, data["id"]) for event, _, data in events] == [
+        ("notification", notification_id(1)),
+        ("notification", notification_id(2)),
+        ("notification", notification_id(3)),
+    ]
+    # Event ids are cursors the client sends back as Last-Event-ID
+    assert decode_cursor(events[-1][1]) == (datetime(2024, 1, 1, 0, 3), notification_id(3))
+
+
+def test_coalesced_frames_carry_the_newest_position():
+    """Test that an array frame is one event identified by its newest notification."""
+    manager = ConnectionManager(queue_size=10, coalesce_window=0.02)
+    stream = EventStream()
+    
+    async def scenario():
+        connection = await manager.connect(stream, "user-1")
+        live = [("user-1", notification(n)) for n in (5, 4)]
+        return await collect(manager, stream, connection, live)()
+    
+    events = parse(asyncio.run(scenario()))
+    
+    assert len(events) == 1
+    assert [item["id"] for item in events[0][2]] == [notification_id(5), notification_id(4)]
+    assert decode_cursor(events[0][1])[1] == notification_id(5)
+
+
+def test_reset_when_too_much_was_missed():
+    """Test that a reset event is sent instead of an oversized replay."""
+    manager = ConnectionManager(queue_size=10, coalesce_window=0)
+    stream = EventStream()
+    
+    async def scenario():
+        connection = await manager.connect(stream, "user-1")
+        stream.reset()
+        return await collect(manager, stream, connection, [])()
+    
+    assert parse(asyncio.run(scenario())) == [("reset", None, {})]
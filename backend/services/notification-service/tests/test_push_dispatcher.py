@@ -0,0 +1,197 @@
+"""Tests for the push dispatch pipeline."""
+
+import asyncio
+import os
+import uuid
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from shared.database import Base, SyncSessionAdapter
+from shared.unit_of_work import UnitOfWork
+from src.api.push_dispatcher import PushDispatcher
+from src.domain.device import DevicePlatform, UserDevice
+from src.domain.notification import Notification, NotificationType
+from src.domain.push import PushMessage
+from src.infrastructure.push import FakePushProvider, LogPushProvider
+from src.infrastructure.repository import DeviceRepository
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "notification_push_tests"
+
+
+def push_message(n):
+    return PushMessage(f"token-{n}", "user-1", "Task assigned", "You have a new task", {})
+
+
+async def drain(dispatcher, timeout=2.0):
+    """Wait until nothing is queued, retrying or in flight."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while asyncio.get_running_loop().time() < deadline:
+        metrics = dispatcher.metrics()
+        if not metrics["queued"] and not metrics["retrying"] and dispatcher._batches.empty():
+            await asyncio.sleep(0.05)
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("push dispatcher did not drain")
+
+
+def test_log_provider_does_not_log_whole_tokens(caplog):
+    """Test that only the tail of a device token reaches the log."""
+    token = "fcm:APA91bHun4MxP5egoKMwt2KZFBaFUH-1RYqx/secret+part"
+    message = PushMessage(token, "user-1", "Task assigned", "You have a new task", {})
+    
+    with caplog.at_level("INFO", logger="src.infrastructure.push"):
+        asyncio.run(LogPushProvider().send([message, push_message(1)]))
+    
+    assert token not in caplog.text
+    assert "...part" in caplog.text
+    assert "token-1" not in caplog.text
+
+
+def test_unavailable_provider_is_retried_with_backoff():
+    """Test that failed requests are sent again until they succeed or attempts run out."""
+    provider = FakePushProvider(unavailable_requests=2)
+    dispatcher = PushDispatcher(provider, workers=2, max_attempts=3, retry_base_delay=0.01)
+    
+    async def scenario():
+        dispatcher.start()
+        await dispatcher.send([push_message(1), push_message(2)])
+        await drain(dispatcher)
+        provider.unavailable_requests = 3
+        await dispatcher.send([push_message(3)])
+        await drain(dispatcher)
+        await dispatcher.stop()
+    
+    asyncio.run(scenario())
+    
+    assert [message.device_token for message in provider.delivered] == ["token-1", "token-2"]
+    metrics = dispatcher.metrics()
+    assert (metrics["requests"], metrics["delivered"], metrics["retried"], metrics["failed"]) == (6, 2, 6, 1)
+
+
+def test_batches_failing_for_good_are_not_retried():
+    """Test that provider errors other than outages fail the batch at once."""
+    provider = FakePushProvider(max_batch_size=1)
+    dispatcher = PushDispatcher(provider, max_attempts=3, retry_base_delay=0.01)
+    
+    asyncio.run(dispatcher.send([push_message(1), push_message(2)]))
+    
+    assert provider.delivered == []
+    metrics = dispatcher.metrics()
+    assert (metrics["requests"], metrics["retried"], metrics["failed"], metrics["errors"]) == (1, 0, 2, 1)
+
+
+def test_missing_results_fail_the_whole_batch():
+    """Test that a result list not matching the batch is not zipped against it."""
+    
+    class ShortProvider(FakePushProvider):
+        async def send(self, messages):
+            return (await super().send(messages))[:-1]
+    
+    dispatcher = PushDispatcher(ShortProvider(), max_attempts=3, retry_base_delay=0.01)
+    
+    asyncio.run(dispatcher.send([push_message(1), push_message(2)]))
+    
+    metrics = dispatcher.metrics()
+    assert (metrics["requests"], metrics["delivered"], metrics["retried"], metrics["failed"]) == (1, 0, 0, 2)
+    assert metrics["errors"] == 1
+
+
+def test_retry_delay_doubles_up_to_the_maximum():
+    """Test that backoff grows exponentially, stays capped and is jittered downwards."""
+    dispatcher = PushDispatcher(FakePushProvider(), retry_base_delay=1, retry_max_delay=5)
+    
+    for attempt, ceiling in [(2, 1), (3, 2), (4, 4), (5, 5), (9, 5)]:
+        delay = dispatcher.retry_delay(attempt)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+@pytest.fixture
+def engine():
+    """Empty PostgreSQL schema dedicated to one test."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def test_notifications_reach_every_device_in_provider_sized_batches(engine):
+    """Test that each device gets its user's notifications, batched, and dead tokens are pruned."""
+    @asynccontextmanager
+    async def open_session():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+    
+    alice, bob, carol = (str(uuid.uuid4()) for _ in range(3))
+    devices = [
+        UserDevice(alice, "alice-phone", DevicePlatform.IOS),
+        UserDevice(alice, "alice-browser", DevicePlatform.WEB),
+        UserDevice(bob, "bob-phone", DevicePlatform.ANDROID),
+        UserDevice(bob, "bob-old-phone", DevicePlatform.ANDROID),
+    ]
+    notifications = [
+        Notification(user_id, "Task assigned", "You have a new task", NotificationType.TASK_ASSIGNED)
+        for user_id in (alice, bob, carol, alice)
+    ]
+    provider = FakePushProvider(max_batch_size=2, invalid_tokens={"bob-old-phone"})
+    dispatcher = PushDispatcher(provider, open_session, workers=2)
+    
+    async def scenario():
+        async with open_session() as db:
+            async with UnitOfWork(db) as unit_of_work:
+                for device in devices:
+                    await DeviceRepository(db).register(device)
+                await unit_of_work.commit()
+        dispatcher.start()
+        dispatcher.enqueue(notifications)
+        await drain(dispatcher)
+        await dispatcher.stop()
+        async with open_session() as db:
+            return await DeviceRepository(db).get_by_users([alice, bob, carol])
+    
+    remaining = asyncio.run(scenario())
+    
+    assert all(len(batch) <= 2 for batch in provider.batches)
+    assert sorted(message.device_token for message in provider.delivered) == [
+        "alice-browser", "alice-browser", "alice-phone", "alice-phone", "bob-phone"
+    ]
+    assert sorted(device.device_token for device in remaining) == ["alice-browser", "alice-phone", "bob-phone"]
+    metrics = dispatcher.metrics()
+    assert (metrics["delivered"], metrics["pruned"], metrics["failed"]) == (5, 1, 0)
+
+
+def test_registering_a_known_token_moves_it_to_the_new_user(engine):
+    """Test that a device signed in by another user stops receiving the old user's pushes."""
+    first, second = str(uuid.uuid4()), str(uuid.uuid4())
+    
+    async def scenario():
+        with Session(engine) as session:
+            db = SyncSessionAdapter(session)
+            repository = DeviceRepository(db)
+            await repository.register(UserDevice(first, "shared-tablet", DevicePlatform.ANDROID))
+            await repository.register(UserDevice(second, "shared-tablet", DevicePlatform.ANDROID))
+            await db.commit()
+            return (
+                await repository.get_by_users([first]),
+                await repository.get_by_users([second]),
+                await repository.unregister(first, "shared-tablet")
+            )
+    
+    of_first, of_second, unregistered = asyncio.run(scenario())
+    
+    assert of_first == []
+    assert [device.device_token for device in of_second] == ["shared-tablet"]
+    assert unregistered is False
@@ -0,0 +1,178 @@
+"""PostgreSQL tests for the notification feed and unread counters.
+
+Set TEST_DATABASE_URL to enable them.
+"""
+
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from shared.database import Base, SyncSessionAdapter
+from shared.pagination import encode_cursor, next_cursor
+from shared.unit_of_work import UnitOfWork
+from src.domain.notification import Notification, NotificationType
+from src.infrastructure.repository import NotificationRepository, seed_unread_counters
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "notification_repository_tests"
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL is not set"
+)
+
+
+@pytest.fixture
+def engine():
+    """Empty PostgreSQL schema dedicated to one test."""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def run(engine, work):
+    """Run ``work(repository)`` in one committed unit of work."""
+    async def scenario():
+        with Session(engine) as session:
+            db = SyncSessionAdapter(session)
+            async with UnitOfWork(db) as unit_of_work:
+                result = await work(NotificationRepository(db))
+                await unit_of_work.commit()
+            return result
+    
+    return asyncio.run(scenario())
+
+
+def notification(user_id, created_at=None, read=False):
+    return Notification(
+        user_id=user_id,
+        title="Task assigned",
+        message="You have a new task",
+        notification_type=NotificationType.TASK_ASSIGNED,
+        read=read,
+        created_at=created_at
+    )
+
+
+def test_feed_pages_newest_first_without_gaps(engine):
+    """Test that following cursors visits every notification once, newest first."""
+    user_id = str(uuid.uuid4())
+    start = datetime(2024, 1, 1)
+    # Pairs share a timestamp so the id tie-break is exercised
+    created = [notification(user_id, start + timedelta(minutes=i // 2)) for i in range(7)]
+    
+    async def create_all(repository):
+        for item in created:
+            await repository.create(item)
+    
+    run(engine, create_all)
+    
+    seen, cursor = [], None
+    while True:
+        page = run(engine, lambda repository: repository.get_by_user(user_id, cursor=cursor, limit=3))
+        seen.extend(page)
+        cursor = next_cursor(page, 3)
+        if cursor is None:
+            break
+    
+    expected = sorted(created, key=lambda item: (item.created_at, item.id), reverse=True)
+    assert [item.id for item in seen] == [item.id for item in expected]
+
+
+def test_resume_returns_only_later_notifications_oldest_first(engine):
+    """Test that get_after seeks forward from a cursor, including timestamp ties."""
+    user_id = str(uuid.uuid4())
+    start = datetime(2024, 1, 1)
+    created = [notification(user_id, start + timedelta(minutes=i // 2)) for i in range(6)]
+    created.append(notification(str(uuid.uuid4()), start + timedelta(hours=1)))
+    
+    async def create_all(repository):
+        for item in created:
+            await repository.create(item)
+    
+    run(engine, create_all)
+    ordered = sorted(created[:6], key=lambda item: (item.created_at, item.id))
+    cursor = encode_cursor(ordered[2].created_at, ordered[2].id)
+    
+    missed = run(engine, lambda repository: repository.get_after(user_id, cursor, 10))
+    first = run(engine, lambda repository: repository.get_after(user_id, cursor, 2))
+    
+    assert [item.id for item in missed] == [item.id for item in ordered[3:]]
+    assert [item.id for item in first] == [item.id for item in ordered[3:5]]
+
+
+def test_unread_counter_follows_every_write(engine):
+    """Test that creates, single and bulk mark-as-read keep the counter exact."""
+    user_id = str(uuid.uuid4())
+    first, second, third = (notification(user_id) for _ in range(3))
+    
+    async def create_all(repository):
+        for item in (first, second, third, notification(user_id, read=True)):
+            await repository.create(item)
+    
+    run(engine, create_all)
+    assert run(engine, lambda repository: repository.count_unread(user_id)) == 3
+    
+    first.mark_as_read()
+    run(engine, lambda repository: repository.update(first))
+    # Marking an already read notification again must not count twice
+    run(engine, lambda repository: repository.update(first))
+    assert run(engine, lambda repository: repository.count_unread(user_id)) == 2
+    
+    assert run(engine, lambda repository: repository.mark_all_as_read(user_id)) == 2
+    assert run(engine, lambda repository: repository.count_unread(user_id)) == 0
+    assert run(engine, lambda repository: repository.count_unread(str(uuid.uuid4()))) == 0
+
+
+def test_seed_counts_existing_unread_notifications(engine):
+    """Test that seeding fills counters only for users that have none yet."""
+    seeded, counted = str(uuid.uuid4()), str(uuid.uuid4())
+    
+    async def create_all(repository):
+        for user_id in (seeded, seeded, counted):
+            await repository.create(notification(user_id))
+    
+    run(engine, create_all)
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM notification_counters WHERE user_id = :user_id"), {"user_id": seeded})
+        conn.execute(text("UPDATE notification_counters SET unread = 5 WHERE user_id = :user_id"), {"user_id": counted})
+    
+    seed_unread_counters(engine)
+    
+    assert run(engine, lambda repository: repository.count_unread(seeded)) == 2
+    assert run(engine, lambda repository: repository.count_unread(counted)) == 5
+
+
+def test_mark_many_as_read_is_scoped_to_the_user(engine):
+    """Test that only the caller's unread notifications among the ids are changed, malformed ids ignored."""
+    user_id, other_user_id = str(uuid.uuid4()), str(uuid.uuid4())
+    mine, already_read, untouched = (notification(user_id) for _ in range(3))
+    theirs = notification(other_user_id)
+    already_read.mark_as_read()
+    
+    async def create_all(repository):
+        for item in (mine, already_read, untouched, theirs):
+            await repository.create(item)
+    
+    run(engine, create_all)
+    ids = [mine.id, already_read.id, theirs.id, str(uuid.uuid4()), "not-a-uuid"]
+    
+    assert run(engine, lambda repository: repository.mark_many_as_read(user_id, ids)) == 1
+    assert run(engine, lambda repository: repository.mark_many_as_read(user_id, ["not-a-uuid"])) == 0
+    assert run(engine, lambda repository: repository.count_unread(user_id)) == 1
+    assert run(engine, lambda repository: repository.count_unread(other_user_id)) == 1
+    assert run(engine, lambda repository: repository.get_by_id(theirs.id)).read is False
@@ -0,0 +1,116 @@
+"""Benchmark: pydantic DTO + response_model vs. attrgetter + orjson for a task page.
+
+Times turning one page of task rows into response bytes, without a database:
+  - legacy: entity -> TaskDTO -> response_model validation -> JSONResponse
+  - fast: entity -> attribute_serializer -> ORJSONResponse
+  - fast (rows): row -> attribute_serializer -> ORJSONResponse, no entity
+
+Usage:
+    python benchmarks/serialization.py
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+# Add service and backend directories to Python path for imports
+service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(service_dir))
+sys.path.insert(0, str(service_dir.parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from shared.dto import TaskDTO
+from shared.serialization import attribute_serializer, list_response
+from src.domain.value_objects import TaskStatus, TaskPriority
+from src.infrastructure.models import TaskModel
+from src.infrastructure.repository import TaskRepository
+
+PAGE = int(os.getenv("BENCH_PAGE", "100"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "2000"))
+
+TaskRow = namedtuple("TaskRow", [column.name for column in TaskModel.__table__.columns])
+
+
+def make_rows() -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        TaskRow(
+            id=str(uuid.uuid4()),
+            title=f"Task {i}",
+            description="Some description" if i % 2 else None,
+            status=TaskStatus.IN_PROGRESS,
+            priority=TaskPriority.HIGH,
+            project_id=str(uuid.uuid4()),
+            assigned_to=str(uuid.uuid4()) if i % 3 else None,
+            created_by=str(uuid.uuid4()),
+            created_at=start + timedelta(seconds=i, microseconds=i),
+            updated_at=None
+        )
+        for i in range(PAGE)
+    ]
+
+
+def time_us(fn) -> float:
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1_000_000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    rows = make_rows()
+    repository = TaskRepository(None)
+    response_field = create_response_field(name="response", type_=List[TaskDTO])
+    serialize_task = attribute_serializer(TaskDTO)
+    run = asyncio.new_event_loop().run_until_complete
+
+    def legacy() -> bytes:
+        tasks = [repository._to_domain(row) for row in rows]
+        dtos = [
+            TaskDTO(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                status=task.status.value,
+                priority=task.priority.value,
+                project_id=task.project_id,
+                assigned_to=task.assigned_to,
+                created_by=task.created_by,
+                created_at=task.created_at,
+                updated_at=task.updated_at
+            )
+            for task in tasks
+        ]
+        content = run(serialize_response(field=response_field, response_content=dtos))
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        tasks = [repository._to_domain(row) for row in rows]
+        return list_response(tasks, serialize_task).body
+
+    def fast_rows() -> bytes:
+        return list_response(rows, serialize_task).body
+
+    assert json.loads(legacy()) == json.loads(fast()) == json.loads(fast_rows())
+
+    legacy_us = time_us(legacy)
+    print(f"page of {PAGE} tasks, median of {ROUNDS} runs")
+    for label, fn in (("legacy", legacy), ("fast", fast), ("fast (rows)", fast_rows)):
+        elapsed = legacy_us if fn is legacy else time_us(fn)
+        print(f"  {label:<12} {elapsed:8.1f} us   x{legacy_us / elapsed:.1f}")
+
+
+if __name__ == "__main__":
+    main()
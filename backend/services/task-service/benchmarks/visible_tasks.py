@@ -0,0 +1,121 @@
+"""Benchmark: "my tasks" as OR filter vs. UNION ALL of two index scans.
+
+Seeds a throwaway schema and times the first page and a deep page of the
+tasks a user created or is assigned to, in both query forms.
+
+Usage:
+    TEST_DATABASE_URL=postgresql://... python benchmarks/visible_tasks.py
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add service and backend directories to Python path for imports
+service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(service_dir))
+sys.path.insert(0, str(service_dir.parent.parent))
+
+from sqlalchemy import create_engine, insert, or_, select, text
+from sqlalchemy.orm import sessionmaker
+from shared.database import Base
+from shared.pagination import next_cursor
+from src.domain.value_objects import TaskStatus, TaskPriority
+from src.infrastructure.models import TaskModel, ProjectModel
+from src.infrastructure.repository import TaskRepository
+
+DATABASE_URL = os.environ["TEST_DATABASE_URL"]
+SCHEMA = "bench_visible_tasks"
+USERS = int(os.getenv("BENCH_USERS", "2000"))
+TASKS = int(os.getenv("BENCH_TASKS", "500000"))
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "50"))
+PAGE = 100
+
+
+def seed(engine) -> str:
+    """Populate tasks and return the id of a heavy user."""
+    rng = random.Random(7)
+    users = [str(uuid.uuid4()) for _ in range(USERS)]
+    heavy = users[0]
+    project_id = str(uuid.uuid4())
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(ProjectModel), [{
+            "id": project_id, "name": "Bench", "created_by": heavy, "created_at": start
+        }])
+        for offset in range(0, TASKS, 50000):
+            conn.execute(insert(TaskModel), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "title": f"Task {i}",
+                    "status": TaskStatus.TODO,
+                    "priority": TaskPriority.MEDIUM,
+                    "project_id": project_id,
+                    # the heavy user owns or is assigned ~2% of all tasks
+                    "created_by": heavy if rng.random() < 0.01 else rng.choice(users),
+                    "assigned_to": heavy if rng.random() < 0.01 else rng.choice(users),
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + 50000, TASKS))
+            ])
+        conn.execute(text("ANALYZE"))
+    return heavy
+
+
+def or_query(user_id: str, cursor):
+    return TaskRepository.paginate(
+        select(*TaskRepository.COLUMNS).where(or_(TaskModel.created_by == user_id, TaskModel.assigned_to == user_id)),
+        cursor,
+        PAGE
+    )
+
+
+def time_ms(fn) -> float:
+    samples = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    try:
+        user_id = seed(engine)
+        session = sessionmaker(bind=engine)()
+
+        # Walk to a deep page once to get a realistic cursor
+        deep_cursor = None
+        for _ in range(50):
+            tasks = session.execute(
+                TaskRepository.visible_to_user_query(user_id, deep_cursor, PAGE)
+            ).all()
+            if len(tasks) < PAGE:
+                break
+            deep_cursor = next_cursor(tasks, PAGE)
+
+        print(f"{TASKS} tasks, {USERS} users, median of {ROUNDS} runs, page size {PAGE}")
+        for label, cursor in (("first page", None), ("deep page", deep_cursor)):
+            union = TaskRepository.visible_to_user_query(user_id, cursor, PAGE)
+            or_ms = time_ms(lambda: session.execute(or_query(user_id, cursor)).all())
+            union_ms = time_ms(lambda: session.execute(union).all())
+            print(f"  {label:<10}  OR: {or_ms:7.2f} ms   UNION ALL: {union_ms:7.2f} ms")
+        session.close()
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
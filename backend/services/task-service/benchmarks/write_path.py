@@ -0,0 +1,155 @@
+"""Benchmark: ORM add/commit/refresh writes vs. single-statement RETURNING writes.
+
+Creates and updates tasks through the legacy ORM pattern (add, commit,
+refresh / get, mutate, commit, refresh) and through TaskRepository, and
+reports statements issued and median latency per write.
+
+Usage:
+    TEST_DATABASE_URL=postgresql://... python benchmarks/write_path.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add service and backend directories to Python path for imports
+service_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(service_dir))
+sys.path.insert(0, str(service_dir.parent.parent))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from shared.database import Base, SyncSessionAdapter
+from shared.unit_of_work import UnitOfWork
+from src.domain.task import Task
+from src.domain.value_objects import TaskStatus
+from src.infrastructure.models import TaskModel, ProjectModel
+from src.infrastructure.repository import TaskRepository
+
+DATABASE_URL = os.environ["TEST_DATABASE_URL"]
+SCHEMA = "bench_write_path"
+ROUNDS = int(os.getenv("BENCH_ROUNDS", "500"))
+
+
+class StatementCounter:
+    """Counts statements sent to the database, including COMMIT."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def _on_commit(self, *args):
+        self.count += 1
+
+
+def new_task(project_id: str, created_by: str) -> Task:
+    return Task(title="Bench task", created_by=created_by, project_id=project_id)
+
+
+def legacy_create(session, task: Task) -> None:
+    db_task = TaskModel(
+        id=task.id,
+        title=task.title,
+        description=task.description,
+        status=task.status,
+        priority=task.priority,
+        project_id=task.project_id,
+        assigned_to=task.assigned_to,
+        created_by=task.created_by,
+        created_at=task.created_at,
+        updated_at=task.updated_at
+    )
+    session.add(db_task)
+    session.commit()
+    session.refresh(db_task)
+
+
+def legacy_update(session, task: Task) -> None:
+    db_task = session.get(TaskModel, task.id)
+    db_task.title = task.title
+    db_task.status = task.status
+    db_task.updated_at = task.updated_at
+    session.commit()
+    session.refresh(db_task)
+
+
+async def repository_write(write, unit_of_work: UnitOfWork, task: Task) -> None:
+    async with unit_of_work:
+        await write(task)
+        await unit_of_work.commit()
+
+
+def measure(counter: StatementCounter, fn, tasks) -> tuple:
+    """Run fn over tasks; return (statements per write, median ms per write)."""
+    samples = []
+    before = counter.count
+    for task in tasks:
+        started = time.perf_counter()
+        fn(task)
+        samples.append((time.perf_counter() - started) * 1000)
+    return (counter.count - before) / len(tasks), statistics.median(samples)
+
+
+def main() -> None:
+    engine = create_engine(DATABASE_URL, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+    try:
+        user_id = str(uuid.uuid4())
+        project_id = str(uuid.uuid4())
+        with engine.begin() as conn:
+            conn.execute(ProjectModel.__table__.insert().values(
+                id=project_id, name="Bench", created_by=user_id, created_at=datetime.utcnow()
+            ))
+
+        Session = sessionmaker(bind=engine, autoflush=False)
+        counter = StatementCounter(engine)
+        session = Session()
+        db = SyncSessionAdapter(session)
+        repo = TaskRepository(db)
+        unit_of_work = UnitOfWork(db)
+        run = asyncio.new_event_loop().run_until_complete
+
+        legacy_tasks = [new_task(project_id, user_id) for _ in range(ROUNDS)]
+        repo_tasks = [new_task(project_id, user_id) for _ in range(ROUNDS)]
+        results = {
+            "create": (
+                measure(counter, lambda t: legacy_create(session, t), legacy_tasks),
+                measure(counter, lambda t: run(repository_write(repo.create, unit_of_work, t)), repo_tasks),
+            ),
+        }
+        for task in legacy_tasks + repo_tasks:
+            task.change_status(TaskStatus.IN_PROGRESS)
+        # Start the update runs from a clean identity map, as a fresh request would
+        session.expunge_all()
+        results["update"] = (
+            measure(counter, lambda t: legacy_update(session, t), legacy_tasks),
+            measure(counter, lambda t: run(repository_write(repo.update, unit_of_work, t)), repo_tasks),
+        )
+        session.close()
+
+        print(f"median of {ROUNDS} writes; statements include COMMIT")
+        for label, ((legacy_stmts, legacy_ms), (repo_stmts, repo_ms)) in results.items():
+            print(
+                f"  {label:<7} legacy: {legacy_stmts:.1f} stmts {legacy_ms:6.2f} ms   "
+                f"RETURNING: {repo_stmts:.1f} stmts {repo_ms:6.2f} ms"
+            )
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ sys.path.insert(0, str(backend_dir))
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from shared.database import get_db
 from shared.auth import decode_access_token
 
@@ -18,7 +18,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
 async def get_current_user_id(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> str:
     """Get current authenticated user ID from token."""
     credentials_exception = HTTPException(
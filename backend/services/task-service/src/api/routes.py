@@ -7,16 +7,25 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field, model_validator
 from typing import Optional, List
-from shared.database import get_db
+from enum import Enum
+from shared.database import get_db, get_read_db
 from shared.dto import TaskDTO, ProjectDTO
+from shared.etag import etag_headers, etag_matches, not_modified, weak_etag
+from shared.pagination import NEXT_CURSOR_HEADER, next_cursor
+from shared.serialization import attribute_serializer, list_response, ndjson_stream, csv_stream
+from shared.unit_of_work import UnitOfWork
 from src.application.use_cases import (
     CreateTaskUseCase,
+    CreateTasksBatchUseCase,
     UpdateTaskUseCase,
     AssignTaskUseCase,
+    BulkUpdateTasksUseCase,
+    BulkAssignTasksUseCase,
     GetTasksByProjectUseCase,
     CreateProjectUseCase,
     UpdateProjectUseCase
@@ -27,6 +36,19 @@ from src.api.dependencies import get_current_user_id
 
 router = APIRouter(prefix="/api/v1", tags=["tasks"])
 
+MAX_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 1000
+
+# List endpoints render entities straight to JSON; response_model stays for the schema
+serialize_task = attribute_serializer(TaskDTO)
+serialize_project = attribute_serializer(ProjectDTO)
+
+
+class ExportFormat(str, Enum):
+    """Supported task export formats."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
 
 class CreateTaskRequest(BaseModel):
     """Request model for creating a task."""
@@ -36,6 +58,25 @@ class CreateTaskRequest(BaseModel):
     priority: TaskPriority = TaskPriority.MEDIUM
 
 
+class CreateTasksBatchRequest(BaseModel):
+    """Request model for creating several tasks at once."""
+    tasks: List[CreateTaskRequest] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchTaskResult(BaseModel):
+    """Outcome of a single item in a batch request."""
+    index: int
+    task: Optional[TaskDTO] = None
+    error: Optional[str] = None
+
+
+class CreateTasksBatchResponse(BaseModel):
+    """Response model for batch task creation."""
+    created: int
+    failed: int
+    results: List[BatchTaskResult]
+
+
 class UpdateTaskRequest(BaseModel):
     """Request model for updating a task."""
     title: Optional[str] = None
@@ -45,6 +86,68 @@ class UpdateTaskRequest(BaseModel):
     project_id: Optional[str] = None
 
 
+class TaskFilter(BaseModel):
+    """Criteria selecting tasks for a bulk operation; null fields are ignored."""
+    project_id: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    assigned_to: Optional[str] = None
+    created_by: Optional[str] = None
+    # A null assigned_to means "any assignee", so "nobody" needs its own flag
+    unassigned: bool = False
+    
+    @model_validator(mode="after")
+    def check_assignee(self):
+        if self.unassigned and self.assigned_to is not None:
+            raise ValueError("Filter on either assigned_to or unassigned")
+        return self
+    
+    def criteria(self) -> dict:
+        criteria = self.model_dump(exclude_none=True, exclude={"unassigned"})
+        if self.unassigned:
+            criteria["assigned_to"] = None
+        return criteria
+
+
+class BulkSelection(BaseModel):
+    """Selects tasks either by explicit ids or by a filter.
+    
+    Unlike the single-task endpoints, bulk operations only reach tasks the
+    caller created or is assigned to: a filter would otherwise select the
+    tasks of every user.
+    """
+    task_ids: Optional[List[str]] = Field(None, min_length=1, max_length=MAX_BATCH_SIZE)
+    filter: Optional[TaskFilter] = None
+    
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide either task_ids or filter")
+        if self.filter is not None and not self.filter.criteria():
+            raise ValueError("filter needs at least one criterion")
+        return self
+    
+    def filters(self) -> Optional[dict]:
+        return self.filter.criteria() if self.filter else None
+
+
+class BulkUpdateTasksRequest(BulkSelection):
+    """Request model for bulk status/priority changes."""
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+
+
+class BulkAssignTasksRequest(BulkSelection):
+    """Request model for bulk assignment; a null user_id unassigns."""
+    user_id: Optional[str]
+
+
+class BulkTasksResponse(BaseModel):
+    """Response model for bulk task operations."""
+    updated: int
+    tasks: List[TaskDTO]
+
+
 class CreateProjectRequest(BaseModel):
     """Request model for creating a project."""
     name: str
@@ -64,48 +167,37 @@ class AssignTaskRequest(BaseModel):
 
 @router.get("/tasks", response_model=List[TaskDTO])
 async def get_all_tasks(
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Get all tasks for current user (created by or assigned to)."""
     repository = TaskRepository(db)
-    # Get tasks created by user or assigned to user
-    from src.infrastructure.models import TaskModel
-    from sqlalchemy import or_
-    db_tasks = db.query(TaskModel)\
-        .filter(or_(TaskModel.created_by == current_user_id, TaskModel.assigned_to == current_user_id))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-    tasks = [repository._to_domain(db_task) for db_task in db_tasks]
-    return [
-        TaskDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            status=task.status.value,
-            priority=task.priority.value,
-            project_id=task.project_id,
-            assigned_to=task.assigned_to,
-            created_by=task.created_by,
-            created_at=task.created_at,
-            updated_at=task.updated_at
+    try:
+        tasks = await repository.get_visible_to_user(current_user_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        for task in tasks
-    ]
+    cursor_token = next_cursor(tasks, limit)
+    return list_response(
+        tasks,
+        serialize_task,
+        headers={NEXT_CURSOR_HEADER: cursor_token} if cursor_token else None
+    )
 
 
 @router.post("/tasks", response_model=TaskDTO, status_code=status.HTTP_201_CREATED)
 async def create_task(
     request: CreateTaskRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Create a new task."""
     repository = TaskRepository(db)
-    use_case = CreateTaskUseCase(repository)
+    use_case = CreateTaskUseCase(repository, UnitOfWork(db))
     
     try:
         task = await use_case.execute(
@@ -134,14 +226,153 @@ async def create_task(
         )
 
 
+@router.post("/tasks:batch", response_model=CreateTasksBatchResponse)
+async def create_tasks_batch(
+    request: CreateTasksBatchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Create up to MAX_BATCH_SIZE tasks in one transaction.
+    
+    Every item gets a result entry, in request order, holding either the
+    created task or the reason it was rejected.
+    """
+    use_case = CreateTasksBatchUseCase(
+        TaskRepository(db), ProjectRepository(db), UnitOfWork(db)
+    )
+    outcomes = await use_case.execute(
+        items=[item.model_dump() for item in request.tasks],
+        created_by=current_user_id
+    )
+    
+    results = []
+    for index, (task, error) in enumerate(outcomes):
+        if task is None:
+            results.append(BatchTaskResult(index=index, error=error))
+            continue
+        results.append(BatchTaskResult(
+            index=index,
+            task=TaskDTO(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                status=task.status.value,
+                priority=task.priority.value,
+                project_id=task.project_id,
+                assigned_to=task.assigned_to,
+                created_by=task.created_by,
+                created_at=task.created_at,
+                updated_at=task.updated_at
+            )
+        ))
+    created = sum(1 for result in results if result.task is not None)
+    return CreateTasksBatchResponse(
+        created=created,
+        failed=len(results) - created,
+        results=results
+    )
+
+
+@router.post("/tasks:bulk-update", response_model=BulkTasksResponse)
+async def bulk_update_tasks(
+    request: BulkUpdateTasksRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Change status and/or priority of many of the caller's tasks with one UPDATE."""
+    use_case = BulkUpdateTasksUseCase(TaskRepository(db), UnitOfWork(db))
+    
+    try:
+        tasks = await use_case.execute(
+            user_id=current_user_id,
+            task_ids=request.task_ids,
+            filters=request.filters(),
+            status=request.status,
+            priority=request.priority
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return BulkTasksResponse(
+        updated=len(tasks),
+        tasks=[
+            TaskDTO(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                status=task.status.value,
+                priority=task.priority.value,
+                project_id=task.project_id,
+                assigned_to=task.assigned_to,
+                created_by=task.created_by,
+                created_at=task.created_at,
+                updated_at=task.updated_at
+            )
+            for task in tasks
+        ]
+    )
+
+
+@router.post("/tasks:bulk-assign", response_model=BulkTasksResponse)
+async def bulk_assign_tasks(
+    request: BulkAssignTasksRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Assign (or unassign) many of the caller's tasks with one UPDATE."""
+    use_case = BulkAssignTasksUseCase(TaskRepository(db), UnitOfWork(db))
+    
+    try:
+        tasks = await use_case.execute(
+            user_id=current_user_id,
+            assignee_id=request.user_id,
+            task_ids=request.task_ids,
+            filters=request.filters()
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return BulkTasksResponse(
+        updated=len(tasks),
+        tasks=[
+            TaskDTO(
+                id=task.id,
+                title=task.title,
+                description=task.description,
+                status=task.status.value,
+                priority=task.priority.value,
+                project_id=task.project_id,
+                assigned_to=task.assigned_to,
+                created_by=task.created_by,
+                created_at=task.created_at,
+                updated_at=task.updated_at
+            )
+            for task in tasks
+        ]
+    )
+
+
 @router.get("/tasks/{task_id}", response_model=TaskDTO)
 async def get_task(
     task_id: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get task by ID."""
+    """Get task by ID; 304 if the client's ETag is still current."""
     repository = TaskRepository(db)
+    # Compare ETags on a one-column lookup before loading the task
+    version = await repository.get_version(task_id)
+    if version is not None:
+        etag = weak_etag(task_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
     task = await repository.get_by_id(task_id)
     if not task:
         raise HTTPException(
@@ -149,6 +380,7 @@ async def get_task(
             detail="Task not found"
         )
     
+    response.headers.update(etag_headers(weak_etag(task.id, task.updated_at or task.created_at)))
     return TaskDTO(
         id=task.id,
         title=task.title,
@@ -167,12 +399,12 @@ async def get_task(
 async def update_task(
     task_id: str,
     request: UpdateTaskRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Update a task."""
     repository = TaskRepository(db)
-    use_case = UpdateTaskUseCase(repository)
+    use_case = UpdateTaskUseCase(repository, UnitOfWork(db))
     
     try:
         task = await use_case.execute(
@@ -206,15 +438,15 @@ async def update_task(
 async def assign_task(
     task_id: str,
     request: AssignTaskRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Assign a task to a user."""
     repository = TaskRepository(db)
-    use_case = AssignTaskUseCase(repository)
+    use_case = AssignTaskUseCase(repository, UnitOfWork(db))
     
     try:
-        task = await use_case.execute(task_id, request.user_id)
+        task = await use_case.execute(task_id, request.user_id, current_user_id)
         return TaskDTO(
             id=task.id,
             title=task.title,
@@ -237,63 +469,94 @@ async def assign_task(
 @router.get("/projects/{project_id}/tasks", response_model=List[TaskDTO])
 async def get_tasks_by_project(
     project_id: str,
-    skip: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get tasks by project ID with pagination."""
+    """Get tasks by project ID with cursor pagination."""
     repository = TaskRepository(db)
     use_case = GetTasksByProjectUseCase(repository)
     
-    tasks = await use_case.execute(project_id, skip, limit)
-    return [
-        TaskDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            status=task.status.value,
-            priority=task.priority.value,
-            project_id=task.project_id,
-            assigned_to=task.assigned_to,
-            created_by=task.created_by,
-            created_at=task.created_at,
-            updated_at=task.updated_at
+    try:
+        tasks = await use_case.execute(project_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        for task in tasks
-    ]
+    cursor_token = next_cursor(tasks, limit)
+    return list_response(
+        tasks,
+        serialize_task,
+        headers={NEXT_CURSOR_HEADER: cursor_token} if cursor_token else None
+    )
+
+
+@router.get("/projects/{project_id}/tasks/export")
+async def export_tasks_by_project(
+    project_id: str,
+    format: ExportFormat = Query(ExportFormat.NDJSON),
+    db: AsyncSession = Depends(get_read_db),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Stream every task of a project as NDJSON or CSV.
+    
+    Rows come from a server-side cursor in batches of EXPORT_BATCH_SIZE, so
+    memory use does not grow with the project. The session stays open until
+    the stream finishes, since dependencies with yield exit after the response.
+    """
+    project = await ProjectRepository(db).get_by_id(project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    batches = TaskRepository(db).stream_by_project(project_id, EXPORT_BATCH_SIZE)
+    if format == ExportFormat.CSV:
+        body, media_type = csv_stream(batches, TaskDTO), "text/csv"
+    else:
+        body, media_type = ndjson_stream(batches, TaskDTO), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="project-{project_id}-tasks.{format.value}"'
+        }
+    )
 
 
 @router.get("/projects", response_model=List[ProjectDTO])
 async def get_all_projects(
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get all projects for current user."""
+    """Get all projects for current user; 304 if the client's ETag is still current.
+    
+    The list ETag covers the project count and the latest change, so
+    creating, updating or deleting any of the user's projects changes it.
+    """
     repository = ProjectRepository(db)
+    count, latest = await repository.get_user_version(current_user_id)
+    etag = weak_etag(current_user_id, count, latest)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
     projects = await repository.get_by_user(current_user_id)
-    return [
-        ProjectDTO(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            created_by=project.created_by,
-            created_at=project.created_at,
-            updated_at=project.updated_at
-        )
-        for project in projects
-    ]
+    return list_response(projects, serialize_project, headers=etag_headers(etag))
 
 
 @router.post("/projects", response_model=ProjectDTO, status_code=status.HTTP_201_CREATED)
 async def create_project(
     request: CreateProjectRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Create a new project."""
     repository = ProjectRepository(db)
-    use_case = CreateProjectUseCase(repository)
+    use_case = CreateProjectUseCase(repository, UnitOfWork(db))
     
     try:
         project = await use_case.execute(
@@ -319,11 +582,20 @@ async def create_project(
 @router.get("/projects/{project_id}", response_model=ProjectDTO)
 async def get_project(
     project_id: str,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get project by ID."""
+    """Get project by ID; 304 if the client's ETag is still current."""
     repository = ProjectRepository(db)
+    # Compare ETags on a one-column lookup before loading the project
+    version = await repository.get_version(project_id)
+    if version is not None:
+        etag = weak_etag(project_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+    
     project = await repository.get_by_id(project_id)
     if not project:
         raise HTTPException(
@@ -331,6 +603,9 @@ async def get_project(
             detail="Project not found"
         )
     
+    response.headers.update(
+        etag_headers(weak_etag(project.id, project.updated_at or project.created_at))
+    )
     return ProjectDTO(
         id=project.id,
         name=project.name,
@@ -345,12 +620,12 @@ async def get_project(
 async def update_project(
     project_id: str,
     request: UpdateProjectRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user_id: str = Depends(get_current_user_id)
 ):
     """Update a project."""
     repository = ProjectRepository(db)
-    use_case = UpdateProjectUseCase(repository)
+    use_case = UpdateProjectUseCase(repository, UnitOfWork(db))
     
     try:
         project = await use_case.execute(
@@ -1,17 +1,68 @@
 """Use cases for task service (application layer)."""
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
+from shared.events import EventType, TaskCreatedEvent, TaskUpdatedEvent, TaskAssignedEvent
+from shared.unit_of_work import IUnitOfWork
 from src.domain.task import Task, Project
 from src.domain.value_objects import TaskStatus, TaskPriority
 from src.domain.repository import ITaskRepository, IProjectRepository
 
 
+def task_metadata(task: Task) -> dict:
+    """Task context sent with every event, so consumers need not look the task up."""
+    return {
+        "title": task.title,
+        "created_by": task.created_by,
+        "assigned_to": task.assigned_to,
+    }
+
+
+def task_created_event(task: Task) -> TaskCreatedEvent:
+    """Event announcing a newly created task."""
+    return TaskCreatedEvent(
+        event_type=EventType.TASK_CREATED,
+        aggregate_id=task.id,
+        occurred_at=task.created_at,
+        task_id=task.id,
+        project_id=task.project_id,
+        created_by=task.created_by,
+        metadata=task_metadata(task)
+    )
+
+
+def task_updated_event(task: Task, changes: dict) -> TaskUpdatedEvent:
+    """Event announcing changed task fields; completing a task is its own event type."""
+    completed = changes.get("status") == TaskStatus.DONE
+    return TaskUpdatedEvent(
+        event_type=EventType.TASK_COMPLETED if completed else EventType.TASK_UPDATED,
+        aggregate_id=task.id,
+        occurred_at=task.updated_at or datetime.utcnow(),
+        task_id=task.id,
+        changes=changes,
+        metadata=task_metadata(task)
+    )
+
+
+def task_assigned_event(task: Task, assigned_by: str) -> TaskAssignedEvent:
+    """Event announcing that a task was assigned to a user."""
+    return TaskAssignedEvent(
+        event_type=EventType.TASK_ASSIGNED,
+        aggregate_id=task.id,
+        occurred_at=task.updated_at or datetime.utcnow(),
+        task_id=task.id,
+        assigned_to=task.assigned_to,
+        assigned_by=assigned_by,
+        metadata=task_metadata(task)
+    )
+
+
 class CreateTaskUseCase:
     """Use case for creating a new task."""
     
-    def __init__(self, task_repository: ITaskRepository):
+    def __init__(self, task_repository: ITaskRepository, unit_of_work: IUnitOfWork):
         self._task_repository = task_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -29,14 +80,77 @@ class CreateTaskUseCase:
             project_id=project_id,
             priority=priority
         )
-        return await self._task_repository.create(task)
+        async with self._unit_of_work:
+            task = await self._task_repository.create(task)
+            self._unit_of_work.add_event(task_created_event(task))
+            await self._unit_of_work.commit()
+        return task
+
+
+class CreateTasksBatchUseCase:
+    """Use case for creating many tasks in one transaction."""
+    
+    def __init__(
+        self,
+        task_repository: ITaskRepository,
+        project_repository: IProjectRepository,
+        unit_of_work: IUnitOfWork
+    ):
+        self._task_repository = task_repository
+        self._project_repository = project_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(
+        self,
+        items: List[dict],
+        created_by: str
+    ) -> List[Tuple[Optional[Task], Optional[str]]]:
+        """Create tasks from item dicts; returns a (task, error) pair per item.
+        
+        Items that fail entity validation or reference an unknown project
+        are reported and skipped; the remaining ones are inserted together.
+        """
+        project_ids = {item["project_id"] for item in items if item.get("project_id")}
+        known_projects = await self._project_repository.existing_ids(project_ids)
+        
+        results: List[Tuple[Optional[Task], Optional[str]]] = []
+        valid: List[Task] = []
+        for item in items:
+            project_id = item.get("project_id")
+            if project_id and project_id not in known_projects:
+                results.append((None, f"Project with id {project_id} not found"))
+                continue
+            try:
+                task = Task(
+                    title=item["title"],
+                    description=item.get("description"),
+                    created_by=created_by,
+                    project_id=project_id,
+                    priority=item.get("priority", TaskPriority.MEDIUM)
+                )
+            except ValueError as e:
+                results.append((None, str(e)))
+                continue
+            results.append((task, None))
+            valid.append(task)
+        
+        async with self._unit_of_work:
+            created = {task.id: task for task in await self._task_repository.create_many(valid)}
+            for task in created.values():
+                self._unit_of_work.add_event(task_created_event(task))
+            await self._unit_of_work.commit()
+        return [
+            (created[task.id], None) if task else (None, error)
+            for task, error in results
+        ]
 
 
 class UpdateTaskUseCase:
     """Use case for updating a task."""
     
-    def __init__(self, task_repository: ITaskRepository):
+    def __init__(self, task_repository: ITaskRepository, unit_of_work: IUnitOfWork):
         self._task_repository = task_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -48,39 +162,115 @@ class UpdateTaskUseCase:
         project_id: Optional[str] = None
     ) -> Task:
         """Update a task."""
-        task = await self._task_repository.get_by_id(task_id)
+        # Uncached: update() writes every column back, so start from the current row
+        task = await self._task_repository.get_by_id(task_id, cached=False)
         if not task:
             raise ValueError(f"Task with id {task_id} not found")
         
+        changes = {}
         if title is not None:
             task.update_title(title)
+            changes["title"] = task.title
         if description is not None:
             task.update_description(description)
+            changes["description"] = task.description
         if status is not None:
             task.change_status(status)
+            changes["status"] = status
         if priority is not None:
             task.change_priority(priority)
+            changes["priority"] = priority
         if project_id is not None:
             task._project_id = project_id
             task._updated_at = datetime.utcnow()
+            changes["project_id"] = project_id
         
-        return await self._task_repository.update(task)
+        async with self._unit_of_work:
+            task = await self._task_repository.update(task)
+            if changes:
+                self._unit_of_work.add_event(task_updated_event(task, changes))
+            await self._unit_of_work.commit()
+        return task
 
 
 class AssignTaskUseCase:
     """Use case for assigning a task to a user."""
     
-    def __init__(self, task_repository: ITaskRepository):
+    def __init__(self, task_repository: ITaskRepository, unit_of_work: IUnitOfWork):
         self._task_repository = task_repository
+        self._unit_of_work = unit_of_work
     
-    async def execute(self, task_id: str, user_id: str) -> Task:
+    async def execute(self, task_id: str, user_id: str, assigned_by: str) -> Task:
         """Assign a task to a user."""
-        task = await self._task_repository.get_by_id(task_id)
+        task = await self._task_repository.get_by_id(task_id, cached=False)
         if not task:
             raise ValueError(f"Task with id {task_id} not found")
         
         task.assign_to(user_id)
-        return await self._task_repository.update(task)
+        async with self._unit_of_work:
+            task = await self._task_repository.update(task)
+            self._unit_of_work.add_event(task_assigned_event(task, assigned_by))
+            await self._unit_of_work.commit()
+        return task
+
+
+class BulkUpdateTasksUseCase:
+    """Use case for changing status and/or priority of many tasks."""
+    
+    def __init__(self, task_repository: ITaskRepository, unit_of_work: IUnitOfWork):
+        self._task_repository = task_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(
+        self,
+        user_id: str,
+        task_ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None
+    ) -> List[Task]:
+        """Update the selected tasks visible to the user."""
+        changes = {}
+        if status is not None:
+            changes["status"] = status
+        if priority is not None:
+            changes["priority"] = priority
+        if not changes:
+            raise ValueError("Nothing to update: provide a status or priority")
+        async with self._unit_of_work:
+            tasks = await self._task_repository.bulk_update(user_id, changes, task_ids, filters)
+            for task in tasks:
+                self._unit_of_work.add_event(task_updated_event(task, changes))
+            await self._unit_of_work.commit()
+        return tasks
+
+
+class BulkAssignTasksUseCase:
+    """Use case for (re)assigning many tasks to one user."""
+    
+    def __init__(self, task_repository: ITaskRepository, unit_of_work: IUnitOfWork):
+        self._task_repository = task_repository
+        self._unit_of_work = unit_of_work
+    
+    async def execute(
+        self,
+        user_id: str,
+        assignee_id: Optional[str],
+        task_ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None
+    ) -> List[Task]:
+        """Assign the selected tasks visible to the user; None unassigns them."""
+        async with self._unit_of_work:
+            tasks = await self._task_repository.bulk_update(
+                user_id, {"assigned_to": assignee_id}, task_ids, filters
+            )
+            for task in tasks:
+                self._unit_of_work.add_event(
+                    task_assigned_event(task, user_id) if assignee_id
+                    else task_updated_event(task, {"assigned_to": None})
+                )
+            await self._unit_of_work.commit()
+        return tasks
 
 
 class GetTasksByProjectUseCase:
@@ -92,18 +282,19 @@ class GetTasksByProjectUseCase:
     async def execute(
         self,
         project_id: str,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 100
     ) -> List[Task]:
         """Get tasks by project ID."""
-        return await self._task_repository.get_by_project(project_id, skip, limit)
+        return await self._task_repository.get_by_project(project_id, cursor, limit)
 
 
 class CreateProjectUseCase:
     """Use case for creating a new project."""
     
-    def __init__(self, project_repository: IProjectRepository):
+    def __init__(self, project_repository: IProjectRepository, unit_of_work: IUnitOfWork):
         self._project_repository = project_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -117,14 +308,18 @@ class CreateProjectUseCase:
             description=description,
             created_by=created_by
         )
-        return await self._project_repository.create(project)
+        async with self._unit_of_work:
+            project = await self._project_repository.create(project)
+            await self._unit_of_work.commit()
+        return project
 
 
 class UpdateProjectUseCase:
     """Use case for updating a project."""
     
-    def __init__(self, project_repository: IProjectRepository):
+    def __init__(self, project_repository: IProjectRepository, unit_of_work: IUnitOfWork):
         self._project_repository = project_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -133,7 +328,7 @@ class UpdateProjectUseCase:
         description: Optional[str] = None
     ) -> Project:
         """Update a project."""
-        project = await self._project_repository.get_by_id(project_id)
+        project = await self._project_repository.get_by_id(project_id, cached=False)
         if not project:
             raise ValueError(f"Project with id {project_id} not found")
         
@@ -142,4 +337,7 @@ class UpdateProjectUseCase:
         if description is not None:
             project.update_description(description)
         
-        return await self._project_repository.update(project)
+        async with self._unit_of_work:
+            project = await self._project_repository.update(project)
+            await self._unit_of_work.commit()
+        return project
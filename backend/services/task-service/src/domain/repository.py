@@ -1,7 +1,8 @@
 """Task repository interface (domain layer)."""
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from datetime import datetime
+from typing import AsyncIterator, Optional, List, Set, Tuple
 from .task import Task, Project
 
 
@@ -14,18 +15,61 @@ class ITaskRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_id(self, task_id: str) -> Optional[Task]:
-        """Get task by ID."""
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        """Create several tasks in one transaction, preserving their order."""
         pass
     
     @abstractmethod
-    async def get_by_project(self, project_id: str, skip: int = 0, limit: int = 100) -> List[Task]:
-        """Get tasks by project ID with pagination."""
+    async def get_by_id(self, task_id: str, cached: bool = True) -> Optional[Task]:
+        """Get task by ID; pass cached=False to read the current row, e.g. before updating it."""
         pass
     
     @abstractmethod
-    async def get_by_user(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Task]:
-        """Get tasks assigned to a user."""
+    async def get_version(self, task_id: str) -> Optional[datetime]:
+        """Get when a task last changed (updated_at, else created_at) without loading it."""
+        pass
+    
+    @abstractmethod
+    async def get_by_project(
+        self,
+        project_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks by project ID, keyset-paginated on (created_at, id)."""
+        pass
+    
+    @abstractmethod
+    def stream_by_project(
+        self,
+        project_id: str,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Task]]:
+        """Stream all tasks of a project in (created_at, id) order, batch by batch.
+        
+        Rows are read from a server-side cursor, so memory use depends on
+        ``batch_size`` and not on the size of the project.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_by_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks assigned to a user, keyset-paginated on (created_at, id)."""
+        pass
+    
+    @abstractmethod
+    async def get_visible_to_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks created by or assigned to a user, keyset-paginated on (created_at, id)."""
         pass
     
     @abstractmethod
@@ -33,6 +77,23 @@ class ITaskRepository(ABC):
         """Update an existing task."""
         pass
     
+    @abstractmethod
+    async def bulk_update(
+        self,
+        visible_to: str,
+        changes: dict,
+        task_ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None
+    ) -> List[Task]:
+        """Apply status/priority/assignee changes to many tasks at once.
+        
+        Targets the given ``task_ids`` or every task matching ``filters``,
+        where a None value matches tasks with that field unset, restricted
+        to tasks created by or assigned to ``visible_to``. Returns the
+        updated tasks.
+        """
+        pass
+    
     @abstractmethod
     async def delete(self, task_id: str) -> bool:
         """Delete a task."""
@@ -48,8 +109,13 @@ class IProjectRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_id(self, project_id: str) -> Optional[Project]:
-        """Get project by ID."""
+    async def get_by_id(self, project_id: str, cached: bool = True) -> Optional[Project]:
+        """Get project by ID; pass cached=False to read the current row, e.g. before updating it."""
+        pass
+    
+    @abstractmethod
+    async def get_version(self, project_id: str) -> Optional[datetime]:
+        """Get when a project last changed (updated_at, else created_at) without loading it."""
         pass
     
     @abstractmethod
@@ -57,6 +123,16 @@ class IProjectRepository(ABC):
         """Get projects created by a user."""
         pass
     
+    @abstractmethod
+    async def get_user_version(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """Get the count and latest change time of the projects a user created."""
+        pass
+    
+    @abstractmethod
+    async def existing_ids(self, project_ids: Set[str]) -> Set[str]:
+        """Return the subset of the given project IDs that exist."""
+        pass
+    
     @abstractmethod
     async def update(self, project: Project) -> Project:
         """Update an existing project."""
@@ -7,7 +7,7 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -30,6 +30,13 @@ class TaskModel(Base):
     created_by = Column(UUID(as_uuid=False), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True)
+    
+    # Each list query filters on one column and pages on (created_at, id)
+    __table_args__ = (
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_assigned_to_created_at_id", "assigned_to", "created_at", "id"),
+        Index("ix_tasks_created_by_created_at_id", "created_by", "created_at", "id"),
+    )
 
 
 class ProjectModel(Base):
@@ -43,3 +50,7 @@ class ProjectModel(Base):
     created_by = Column(UUID(as_uuid=False), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, nullable=True)
+    
+    __table_args__ = (
+        Index("ix_projects_created_by_created_at", "created_by", "created_at"),
+    )
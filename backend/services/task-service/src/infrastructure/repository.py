@@ -1,87 +1,302 @@
 """Task repository implementation (infrastructure layer)."""
 
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from datetime import datetime
+from functools import partial
+from types import SimpleNamespace
+from typing import AsyncIterator, Optional, List, Set, Tuple
+import orjson
+from sqlalchemy import delete, func, insert, or_, select, tuple_, union_all, update
+from sqlalchemy.sql import Select
+from shared.cache import ReadThroughCache, build_cache_backend
+from shared.database import DbSession, is_replica, is_uuid
+from shared.pagination import decode_cursor
+from shared.unit_of_work import after_commit
 from src.domain.task import Task, Project
+from src.domain.value_objects import TaskStatus, TaskPriority
 from src.domain.repository import ITaskRepository, IProjectRepository
 from src.infrastructure.models import TaskModel, ProjectModel
 
 
+def _cached_row(row: dict) -> SimpleNamespace:
+    """Rebuild a row from its cached JSON form, restoring datetimes."""
+    for field in ("created_at", "updated_at"):
+        if row.get(field):
+            row[field] = datetime.fromisoformat(row[field])
+    return SimpleNamespace(**row)
+
+
+def _decode_task(payload: bytes) -> Task:
+    row = _cached_row(orjson.loads(payload))
+    row.status = TaskStatus(row.status)
+    row.priority = TaskPriority(row.priority)
+    return TaskRepository._to_domain(row)
+
+
+def _encode_projects(projects: List[Project]) -> bytes:
+    return orjson.dumps([ProjectRepository._to_row(project) for project in projects])
+
+
+def _decode_projects(payload: bytes) -> List[Project]:
+    return [ProjectRepository._to_domain(_cached_row(row)) for row in orjson.loads(payload)]
+
+
+# Read-through caches for hot lookups, invalidated after the writing unit of
+# work commits. Bump the key suffix whenever the cached encoding changes.
+cache_backend = build_cache_backend()
+task_cache = ReadThroughCache(
+    cache_backend,
+    "task-service:task:v1",
+    encode=lambda task: orjson.dumps(TaskRepository._to_row(task)),
+    decode=_decode_task
+)
+project_cache = ReadThroughCache(
+    cache_backend,
+    "task-service:project:v1",
+    encode=lambda project: orjson.dumps(ProjectRepository._to_row(project)),
+    decode=lambda payload: ProjectRepository._to_domain(_cached_row(orjson.loads(payload)))
+)
+user_projects_cache = ReadThroughCache(
+    cache_backend,
+    "task-service:user-projects:v1",
+    encode=_encode_projects,
+    decode=_decode_projects
+)
+
+
 class TaskRepository(ITaskRepository):
     """SQLAlchemy implementation of task repository."""
     
-    def __init__(self, db: Session):
+    BULK_UPDATE_FIELDS = {"status", "priority", "assigned_to"}
+    BULK_FILTER_FIELDS = {"project_id", "status", "priority", "assigned_to", "created_by"}
+    UUID_FIELDS = {"project_id", "assigned_to", "created_by"}
+    # Reads and writes map plain rows (SELECT / RETURNING of these columns) to
+    # entities: no refresh SELECT, and no ORM instance or identity-map upkeep
+    COLUMNS = tuple(TaskModel.__table__.columns)
+    
+    def __init__(self, db: DbSession):
         self._db = db
     
     async def create(self, task: Task) -> Task:
-        """Create a new task."""
-        db_task = TaskModel(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            status=task.status,
-            priority=task.priority,
-            project_id=task.project_id,
-            assigned_to=task.assigned_to,
-            created_by=task.created_by,
-            created_at=task.created_at,
-            updated_at=task.updated_at
-        )
-        self._db.add(db_task)
-        self._db.commit()
-        self._db.refresh(db_task)
-        return self._to_domain(db_task)
-    
-    async def get_by_id(self, task_id: str) -> Optional[Task]:
-        """Get task by ID."""
-        db_task = self._db.query(TaskModel).filter(TaskModel.id == task_id).first()
-        return self._to_domain(db_task) if db_task else None
-    
-    async def get_by_project(self, project_id: str, skip: int = 0, limit: int = 100) -> List[Task]:
-        """Get tasks by project ID with pagination."""
-        db_tasks = self._db.query(TaskModel)\
-            .filter(TaskModel.project_id == project_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
-        return [self._to_domain(db_task) for db_task in db_tasks]
-    
-    async def get_by_user(self, user_id: str, skip: int = 0, limit: int = 100) -> List[Task]:
-        """Get tasks assigned to a user."""
-        db_tasks = self._db.query(TaskModel)\
-            .filter(TaskModel.assigned_to == user_id)\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
-        return [self._to_domain(db_task) for db_task in db_tasks]
+        """Create a new task with a single INSERT ... RETURNING."""
+        result = await self._db.execute(
+            insert(TaskModel).values(self._to_row(task)).returning(*self.COLUMNS)
+        )
+        row = result.one()
+        return self._to_domain(row)
+    
+    async def create_many(self, tasks: List[Task]) -> List[Task]:
+        """Create several tasks with one multi-row INSERT ... RETURNING."""
+        if not tasks:
+            return []
+        result = await self._db.execute(
+            insert(TaskModel)
+            .values([self._to_row(task) for task in tasks])
+            .returning(*self.COLUMNS)
+        )
+        rows = {row.id: row for row in result.all()}
+        return [self._to_domain(rows[task.id]) for task in tasks]
+    
+    async def get_by_id(self, task_id: str, cached: bool = True) -> Optional[Task]:
+        """Get task by ID, read through the task cache unless ``cached`` is False.
+
+        Rows read from a replica are served but never cached.
+        """
+        async def load() -> Optional[Task]:
+            db_task = await self._db.get(TaskModel, task_id)
+            return self._to_domain(db_task) if db_task else None
+        
+        if not cached:
+            return await load()
+        return await task_cache.get_or_load(task_id, load, store=not is_replica(self._db))
+    
+    async def get_version(self, task_id: str) -> Optional[datetime]:
+        """Get when a task last changed, reading a single column."""
+        return await self._db.scalar(
+            select(func.coalesce(TaskModel.updated_at, TaskModel.created_at))
+            .where(TaskModel.id == task_id)
+        )
+    
+    async def get_by_project(
+        self,
+        project_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks by project ID, keyset-paginated on (created_at, id)."""
+        query = select(*self.COLUMNS).where(TaskModel.project_id == project_id)
+        result = await self._db.execute(self.paginate(query, cursor, limit))
+        return [self._to_domain(row) for row in result.all()]
+    
+    async def stream_by_project(
+        self,
+        project_id: str,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[Task]]:
+        """Stream all tasks of a project from a server-side cursor."""
+        query = select(*self.COLUMNS)\
+            .where(TaskModel.project_id == project_id)\
+            .order_by(TaskModel.created_at, TaskModel.id)\
+            .execution_options(yield_per=batch_size)
+        result = await self._db.stream(query)
+        async for rows in result.partitions():
+            yield [self._to_domain(row) for row in rows]
+    
+    async def get_by_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks assigned to a user, keyset-paginated on (created_at, id)."""
+        query = select(*self.COLUMNS).where(TaskModel.assigned_to == user_id)
+        result = await self._db.execute(self.paginate(query, cursor, limit))
+        return [self._to_domain(row) for row in result.all()]
+    
+    async def get_visible_to_user(
+        self,
+        user_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> List[Task]:
+        """Get tasks created by or assigned to a user, keyset-paginated on (created_at, id)."""
+        result = await self._db.execute(self.visible_to_user_query(user_id, cursor, limit))
+        return [self._to_domain(row) for row in result.all()]
     
     async def update(self, task: Task) -> Task:
-        """Update an existing task."""
-        db_task = self._db.query(TaskModel).filter(TaskModel.id == task.id).first()
-        if not db_task:
+        """Update an existing task with a single UPDATE ... RETURNING."""
+        result = await self._db.execute(
+            update(TaskModel)
+            .where(TaskModel.id == task.id)
+            .values(
+                title=task.title,
+                description=task.description,
+                status=task.status,
+                priority=task.priority,
+                project_id=task.project_id,
+                assigned_to=task.assigned_to,
+                updated_at=task.updated_at
+            )
+            .returning(*self.COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise ValueError(f"Task with id {task.id} not found")
+        after_commit(self._db, partial(task_cache.invalidate, task.id))
+        return self._to_domain(row)
+    
+    async def bulk_update(
+        self,
+        visible_to: str,
+        changes: dict,
+        task_ids: Optional[List[str]] = None,
+        filters: Optional[dict] = None
+    ) -> List[Task]:
+        """Apply changes to many tasks with a single UPDATE ... RETURNING."""
+        if not changes or not set(changes) <= self.BULK_UPDATE_FIELDS:
+            raise ValueError(f"Bulk updates may only change {sorted(self.BULK_UPDATE_FIELDS)}")
+        if (task_ids is None) == (filters is None):
+            raise ValueError("Provide either task ids or a filter")
+        
+        query = update(TaskModel).where(
+            or_(TaskModel.created_by == visible_to, TaskModel.assigned_to == visible_to)
+        )
+        if task_ids is not None:
+            task_ids = [task_id for task_id in task_ids if is_uuid(task_id)]
+            if not task_ids:
+                return []
+            query = query.where(TaskModel.id.in_(task_ids))
+        else:
+            if not filters or not set(filters) <= self.BULK_FILTER_FIELDS:
+                raise ValueError(f"Bulk filters must use {sorted(self.BULK_FILTER_FIELDS)}")
+            for field, value in filters.items():
+                if field in self.UUID_FIELDS and value is not None and not is_uuid(value):
+                    raise ValueError(f"Invalid {field}: {value}")
+                query = query.where(getattr(TaskModel, field) == value)
+        
+        for field, value in changes.items():
+            if field in self.UUID_FIELDS and value is not None and not is_uuid(value):
+                raise ValueError(f"Invalid {field}: {value}")
         
-        db_task.title = task.title
-        db_task.description = task.description
-        db_task.status = task.status
-        db_task.priority = task.priority
-        db_task.assigned_to = task.assigned_to
-        db_task.updated_at = task.updated_at
-        self._db.commit()
-        self._db.refresh(db_task)
-        return self._to_domain(db_task)
+        result = await self._db.execute(
+            query.values(**changes, updated_at=datetime.utcnow())
+            .returning(*self.COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        after_commit(self._db, partial(task_cache.invalidate, *(row.id for row in rows)))
+        return [self._to_domain(row) for row in rows]
     
     async def delete(self, task_id: str) -> bool:
-        """Delete a task."""
-        db_task = self._db.query(TaskModel).filter(TaskModel.id == task_id).first()
-        if not db_task:
-            return False
-        self._db.delete(db_task)
-        self._db.commit()
-        return True
+        """Delete a task with a single DELETE."""
+        result = await self._db.execute(
+            delete(TaskModel)
+            .where(TaskModel.id == task_id)
+            .execution_options(synchronize_session=False)
+        )
+        after_commit(self._db, partial(task_cache.invalidate, task_id))
+        return result.rowcount > 0
+    
+    @staticmethod
+    def paginate(query: Select, cursor: Optional[str], limit: int) -> Select:
+        """Apply a stable (created_at, id) ordering and seek past the cursor.
+
+        Raises ValueError for a malformed cursor.
+        """
+        if cursor:
+            created_at, task_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(TaskModel.created_at, TaskModel.id) > tuple_(
+                    created_at, task_id, types=[TaskModel.created_at.type, TaskModel.id.type]
+                )
+            )
+        return query.order_by(TaskModel.created_at, TaskModel.id).limit(limit)
+    
+    @classmethod
+    def visible_to_user_query(cls, user_id: str, cursor: Optional[str], limit: int) -> Select:
+        """Build the "created by or assigned to" page query.
+        
+        An ``OR`` across two columns cannot be served by one index, so the
+        query is a UNION ALL of two top-N index scans. The assigned branch
+        skips tasks the user created, so no row appears twice and no
+        de-duplicating sort is needed.
+        """
+        created = cls.paginate(
+            select(*cls.COLUMNS).where(TaskModel.created_by == user_id),
+            cursor,
+            limit
+        )
+        assigned = cls.paginate(
+            select(*cls.COLUMNS)
+            .where(TaskModel.assigned_to == user_id)
+            .where(TaskModel.created_by != user_id),
+            cursor,
+            limit
+        )
+        visible = union_all(select(created.subquery()), select(assigned.subquery())).subquery()
+        return select(*visible.c)\
+            .order_by(visible.c.created_at, visible.c.id)\
+            .limit(limit)
+    
+    @staticmethod
+    def _to_row(task: Task) -> dict:
+        """Convert domain entity to column values."""
+        return {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "status": task.status,
+            "priority": task.priority,
+            "project_id": task.project_id,
+            "assigned_to": task.assigned_to,
+            "created_by": task.created_by,
+            "created_at": task.created_at,
+            "updated_at": task.updated_at,
+        }
     
-    def _to_domain(self, db_task: TaskModel) -> Task:
-        """Convert database model to domain entity."""
+    @staticmethod
+    def _to_domain(db_task: TaskModel) -> Task:
+        """Convert database model or row to domain entity."""
         return Task(
             task_id=db_task.id,
             title=db_task.title,
@@ -99,60 +314,124 @@ class TaskRepository(ITaskRepository):
 class ProjectRepository(IProjectRepository):
     """SQLAlchemy implementation of project repository."""
     
-    def __init__(self, db: Session):
+    COLUMNS = tuple(ProjectModel.__table__.columns)
+    
+    def __init__(self, db: DbSession):
         self._db = db
     
     async def create(self, project: Project) -> Project:
-        """Create a new project."""
-        db_project = ProjectModel(
-            id=project.id,
-            name=project.name,
-            description=project.description,
-            created_by=project.created_by,
-            created_at=project.created_at,
-            updated_at=project.updated_at
-        )
-        self._db.add(db_project)
-        self._db.commit()
-        self._db.refresh(db_project)
-        return self._to_domain(db_project)
-    
-    async def get_by_id(self, project_id: str) -> Optional[Project]:
-        """Get project by ID."""
-        db_project = self._db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-        return self._to_domain(db_project) if db_project else None
+        """Create a new project with a single INSERT ... RETURNING."""
+        result = await self._db.execute(
+            insert(ProjectModel).values(self._to_row(project)).returning(*self.COLUMNS)
+        )
+        row = result.one()
+        after_commit(self._db, partial(user_projects_cache.invalidate, row.created_by))
+        return self._to_domain(row)
+    
+    async def get_by_id(self, project_id: str, cached: bool = True) -> Optional[Project]:
+        """Get project by ID, read through the project cache unless ``cached`` is False.
+
+        Rows read from a replica are served but never cached.
+        """
+        async def load() -> Optional[Project]:
+            db_project = await self._db.get(ProjectModel, project_id)
+            return self._to_domain(db_project) if db_project else None
+        
+        if not cached:
+            return await load()
+        return await project_cache.get_or_load(project_id, load, store=not is_replica(self._db))
+    
+    async def get_version(self, project_id: str) -> Optional[datetime]:
+        """Get when a project last changed, reading a single column."""
+        return await self._db.scalar(
+            select(func.coalesce(ProjectModel.updated_at, ProjectModel.created_at))
+            .where(ProjectModel.id == project_id)
+        )
     
     async def get_by_user(self, user_id: str) -> List[Project]:
-        """Get projects created by a user."""
-        db_projects = self._db.query(ProjectModel)\
-            .filter(ProjectModel.created_by == user_id)\
-            .all()
-        return [self._to_domain(db_project) for db_project in db_projects]
+        """Get projects created by a user, read through the per-user list cache."""
+        async def load() -> List[Project]:
+            result = await self._db.execute(
+                select(*self.COLUMNS).where(ProjectModel.created_by == user_id)
+            )
+            return [self._to_domain(row) for row in result.all()]
+        
+        return await user_projects_cache.get_or_load(user_id, load, store=not is_replica(self._db))
+    
+    async def get_user_version(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """Get the count and latest change time of a user's projects in one aggregate."""
+        result = await self._db.execute(
+            select(
+                func.count(),
+                func.max(func.coalesce(ProjectModel.updated_at, ProjectModel.created_at))
+            ).where(ProjectModel.created_by == user_id)
+        )
+        count, latest = result.one()
+        return count, latest
+    
+    async def existing_ids(self, project_ids: Set[str]) -> Set[str]:
+        """Return the subset of the given project IDs that exist."""
+        candidates = [project_id for project_id in project_ids if is_uuid(project_id)]
+        if not candidates:
+            return set()
+        result = await self._db.execute(
+            select(ProjectModel.id).where(ProjectModel.id.in_(candidates))
+        )
+        return set(result.scalars().all())
     
     async def update(self, project: Project) -> Project:
-        """Update an existing project."""
-        db_project = self._db.query(ProjectModel).filter(ProjectModel.id == project.id).first()
-        if not db_project:
+        """Update an existing project with a single UPDATE ... RETURNING."""
+        result = await self._db.execute(
+            update(ProjectModel)
+            .where(ProjectModel.id == project.id)
+            .values(
+                name=project.name,
+                description=project.description,
+                updated_at=project.updated_at
+            )
+            .returning(*self.COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise ValueError(f"Project with id {project.id} not found")
-        
-        db_project.name = project.name
-        db_project.description = project.description
-        db_project.updated_at = project.updated_at
-        self._db.commit()
-        self._db.refresh(db_project)
-        return self._to_domain(db_project)
+        self._invalidate(row.id, row.created_by)
+        return self._to_domain(row)
     
     async def delete(self, project_id: str) -> bool:
-        """Delete a project."""
-        db_project = self._db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
-        if not db_project:
+        """Delete a project with a single DELETE."""
+        result = await self._db.execute(
+            delete(ProjectModel)
+            .where(ProjectModel.id == project_id)
+            .returning(ProjectModel.created_by)
+            .execution_options(synchronize_session=False)
+        )
+        created_by = result.scalar_one_or_none()
+        if created_by is None:
             return False
-        self._db.delete(db_project)
-        self._db.commit()
+        self._invalidate(project_id, created_by)
         return True
     
-    def _to_domain(self, db_project: ProjectModel) -> Project:
-        """Convert database model to domain entity."""
+    def _invalidate(self, project_id: str, created_by: str) -> None:
+        """Retire cached copies of a project and its creator's list after commit."""
+        after_commit(self._db, partial(project_cache.invalidate, project_id))
+        after_commit(self._db, partial(user_projects_cache.invalidate, created_by))
+    
+    @staticmethod
+    def _to_row(project: Project) -> dict:
+        """Convert domain entity to column values."""
+        return {
+            "id": project.id,
+            "name": project.name,
+            "description": project.description,
+            "created_by": project.created_by,
+            "created_at": project.created_at,
+            "updated_at": project.updated_at,
+        }
+    
+    @staticmethod
+    def _to_domain(db_project: ProjectModel) -> Project:
+        """Convert database model or row to domain entity."""
         return Project(
             project_id=db_project.id,
             name=db_project.name,
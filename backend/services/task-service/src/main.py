@@ -7,18 +7,52 @@ from pathlib import Path
 backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
+import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.routes import router
-from shared.database import engine, Base
+from src.infrastructure.repository import task_cache, project_cache, user_projects_cache
+from shared.auth import token_cache
+from shared.broker import build_broker
+from shared.database import engine, Base, ensure_indexes
+from shared.outbox import OutboxRelay, create_outbox_table
+from shared.pagination import NEXT_CURSOR_HEADER
 
-# Create database tables
+logger = logging.getLogger(__name__)
+
+# Set OUTBOX_RELAY_ENABLED=false to only write events (e.g. when a separate
+# process relays them)
+OUTBOX_RELAY_ENABLED = os.getenv("OUTBOX_RELAY_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Create database tables and any indexes added since
 Base.metadata.create_all(bind=engine)
+create_outbox_table(engine)
+ensure_indexes(engine)
+
+# Without a broker the relay would have nowhere to publish to
+event_broker = build_broker()
+outbox_relay = OutboxRelay(event_broker) if event_broker is not None else None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Publish outbox events in the background while the service runs."""
+    if outbox_relay is None:
+        logger.warning("EVENT_BROKER_URL is not set: domain events stay in the outbox")
+    elif OUTBOX_RELAY_ENABLED:
+        outbox_relay.start()
+    yield
+    if outbox_relay is not None:
+        await outbox_relay.stop()
+
 
 app = FastAPI(
     title="Task Service API",
     description="Task management microservice",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -28,6 +62,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.include_router(router)
@@ -36,4 +71,14 @@ app.include_router(router)
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "task-service"}
+    return {
+        "status": "healthy",
+        "service": "task-service",
+        "token_cache": token_cache.metrics(),
+        "entity_cache": {
+            "tasks": task_cache.metrics(),
+            "projects": project_cache.metrics(),
+            "user_projects": user_projects_cache.metrics()
+        },
+        "outbox_relay": outbox_relay.metrics() if outbox_relay is not None else None
+    }
@@ -0,0 +1,122 @@
+"""Unit tests for the read-through entity cache."""
+
+import asyncio
+from shared.cache import CacheBackend, InMemoryCacheBackend, ReadThroughCache
+
+
+def make_cache(backend=None):
+    return ReadThroughCache(
+        backend or InMemoryCacheBackend(max_size=100),
+        "test",
+        encode=lambda value: value.encode(),
+        decode=lambda payload: payload.decode(),
+        ttl=60
+    )
+
+
+class Loader:
+    """Async loader returning a configurable value and counting calls."""
+    
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+    
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_read_through_hits_until_invalidated():
+    """Test that values are served from cache until their key is invalidated."""
+    cache = make_cache()
+    loader = Loader("v1")
+    
+    async def scenario():
+        first = await cache.get_or_load("key", loader)
+        second = await cache.get_or_load("key", loader)
+        loader.value = "v2"
+        await cache.invalidate("key")
+        third = await cache.get_or_load("key", loader)
+        return first, second, third
+    
+    assert asyncio.run(scenario()) == ("v1", "v1", "v2")
+    assert loader.calls == 2
+    assert cache.metrics()["hits"] == 1
+    assert cache.metrics()["misses"] == 2
+
+
+def test_value_loaded_before_invalidation_is_never_served():
+    """Test that a reader racing a write cannot cache the old row as current."""
+    cache = make_cache()
+    
+    async def scenario():
+        async def slow_stale_load():
+            # The write commits and invalidates while this read is in flight
+            await cache.invalidate("key")
+            return "stale"
+        
+        await cache.get_or_load("key", slow_stale_load)
+        return await cache.get_or_load("key", Loader("fresh"))
+    
+    assert asyncio.run(scenario()) == "fresh"
+
+
+def test_none_is_not_cached():
+    """Test that missing entities are looked up again."""
+    cache = make_cache()
+    loader = Loader(None)
+    
+    asyncio.run(cache.get_or_load("key", loader))
+    asyncio.run(cache.get_or_load("key", loader))
+    
+    assert loader.calls == 2
+
+
+def test_reads_that_must_not_be_stored_leave_the_cache_untouched():
+    """Test that store=False (a replica read) serves the value without caching it."""
+    cache = make_cache()
+    
+    async def scenario():
+        lagging = await cache.get_or_load("key", Loader("stale"), store=False)
+        return lagging, await cache.get_or_load("key", Loader("current"))
+    
+    assert asyncio.run(scenario()) == ("stale", "current")
+
+
+def test_without_backend_every_read_is_loaded():
+    """Test that a cache without backend is a pass-through."""
+    cache = ReadThroughCache(None, "test", encode=str.encode, decode=bytes.decode, ttl=60)
+    loader = Loader("value")
+    
+    asyncio.run(cache.get_or_load("key", loader))
+    asyncio.run(cache.get_or_load("key", loader))
+    asyncio.run(cache.invalidate("key"))
+    
+    assert loader.calls == 2
+    assert cache.metrics()["backend"] == "disabled"
+
+
+class BrokenBackend(CacheBackend):
+    """Backend whose every call fails like an unreachable Redis."""
+    
+    name = "broken"
+    errors = (ConnectionError,)
+    
+    async def get_many(self, keys):
+        raise ConnectionError("down")
+    
+    async def set(self, key, value, ttl):
+        raise ConnectionError("down")
+    
+    async def bump(self, keys, ttl):
+        raise ConnectionError("down")
+
+
+def test_backend_errors_fall_back_to_loader():
+    """Test that an unavailable backend degrades to uncached reads."""
+    cache = make_cache(BrokenBackend())
+    
+    assert asyncio.run(cache.get_or_load("key", Loader("value"))) == "value"
+    asyncio.run(cache.invalidate("key"))
+    
+    assert cache.metrics()["errors"] == 2
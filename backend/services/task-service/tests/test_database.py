@@ -0,0 +1,120 @@
+"""Unit tests for read replica routing."""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+import pytest
+from sqlalchemy.exc import DBAPIError
+import shared.database as database
+from shared.database import ReplicaRouter, get_read_db, is_replica
+
+
+class FakeSession:
+    """Session stand-in whose connection check fails with ``error``, if given."""
+    
+    def __init__(self, name, error=None):
+        self.name = name
+        self.error = error
+        self.info = {}
+        self.closed = False
+    
+    async def connection(self):
+        if self.error is not None:
+            raise self.error
+    
+    async def close(self):
+        self.closed = True
+
+
+def router(*errors, retry_after=60):
+    """A router over one fake replica per error (None for a healthy one), recording its sessions."""
+    sessions = []
+    
+    def factory(index, error):
+        def open_session():
+            sessions.append(FakeSession(f"replica-{index}", error))
+            return sessions[-1]
+        return open_session
+    
+    return ReplicaRouter([factory(i, e) for i, e in enumerate(errors)], retry_after), sessions
+
+
+@pytest.fixture
+def primary(monkeypatch):
+    """Route primary sessions to fakes; returns the ones opened."""
+    opened = []
+    
+    @asynccontextmanager
+    async def primary_session():
+        opened.append(FakeSession("primary"))
+        yield opened[-1]
+    
+    monkeypatch.setattr(database, "primary_session", primary_session)
+    return opened
+
+
+def read_session():
+    """Open and close one get_read_db session, returning it."""
+    async def scenario():
+        dependency = get_read_db()
+        db = await dependency.__anext__()
+        await dependency.aclose()
+        return db
+    
+    return asyncio.run(scenario())
+
+
+def test_replicas_are_tried_round_robin():
+    """Test that each read starts at the next replica and falls through to the others."""
+    replicas, _ = router(None, None, None)
+    
+    assert [replicas.candidates() for _ in range(4)] == [
+        [0, 1, 2], [1, 2, 0], [2, 0, 1], [0, 1, 2]
+    ]
+    assert ReplicaRouter([], 60).candidates() == []
+
+
+def test_replica_marked_down_is_skipped_until_retry_window_passes():
+    """Test that mark_down removes a replica from rotation for retry_after seconds only."""
+    replicas, _ = router(None, None, retry_after=0.05)
+    
+    replicas.mark_down(0)
+    assert replicas.candidates() == [1]
+    assert replicas.candidates() == [1]
+    time.sleep(0.06)
+    assert replicas.candidates() == [0, 1]
+
+
+def test_read_skips_unavailable_replica(monkeypatch, primary):
+    """Test that a replica failing its connection check is closed, marked down and skipped."""
+    replicas, sessions = router(OSError("connection refused"), None)
+    monkeypatch.setattr(database, "replica_router", replicas)
+    
+    db = read_session()
+    
+    assert db.name == "replica-1"
+    assert is_replica(db)
+    assert all(session.closed for session in sessions)
+    assert primary == []
+    assert replicas.candidates() == [1]
+
+
+def test_read_falls_back_to_primary_when_every_replica_fails(monkeypatch, primary):
+    """Test that DBAPIError and OSError on all replicas send the read to the primary."""
+    replicas, sessions = router(
+        DBAPIError("SELECT 1", None, Exception("replica is starting up")),
+        OSError("connection refused")
+    )
+    monkeypatch.setattr(database, "replica_router", replicas)
+    
+    db = read_session()
+    
+    assert db.name == "primary"
+    assert not is_replica(db)
+    assert [session.name for session in sessions] == ["replica-0", "replica-1"]
+    assert all(session.closed for session in sessions)
+    assert replicas.candidates() == []
+    
+    # Both replicas are down now: the next read goes straight to the primary
+    assert read_session().name == "primary"
+    assert len(sessions) == 2
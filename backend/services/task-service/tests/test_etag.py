@@ -0,0 +1,31 @@
+"""Unit tests for ETag helpers."""
+
+from datetime import datetime
+from shared.etag import etag_matches, not_modified, weak_etag
+
+
+def test_weak_etag_changes_with_version():
+    """Test that ETags are weak, stable per version and differ across versions."""
+    first = weak_etag("task-1", datetime(2024, 1, 1))
+    
+    assert first.startswith('W/"')
+    assert first == weak_etag("task-1", datetime(2024, 1, 1))
+    assert first != weak_etag("task-1", datetime(2024, 1, 1, 0, 0, 1))
+    assert first != weak_etag("task-2", datetime(2024, 1, 1))
+
+
+def test_etag_matches_if_none_match_lists():
+    """Test weak comparison against single, listed and wildcard If-None-Match values."""
+    etag = weak_etag("task-1", datetime(2024, 1, 1))
+    
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag.removeprefix("W/"), etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"other"', etag)
+    assert not etag_matches(None, etag)
+    
+    response = not_modified(etag)
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.body == b""
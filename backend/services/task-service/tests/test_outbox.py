@@ -0,0 +1,132 @@
+"""PostgreSQL tests for the transactional outbox and its relay.
+
+Set TEST_DATABASE_URL to enable them.
+"""
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+from shared.broker import InMemoryBroker
+from shared.database import Base, SyncSessionAdapter
+from shared.events import EventType, TaskCreatedEvent
+from shared.outbox import OutboxModel, OutboxRelay, create_outbox_table
+from shared.unit_of_work import UnitOfWork
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "outbox_tests"
+STREAM = "test-events"
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL is not set"
+)
+
+
+@pytest.fixture
+def engine():
+    """Empty PostgreSQL schema dedicated to one test."""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    create_outbox_table(engine)
+    yield engine
+    
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def session_factory(engine):
+    @asynccontextmanager
+    async def open_session():
+        with Session(engine) as session:
+            yield SyncSessionAdapter(session)
+    return open_session
+
+
+def event(task_id):
+    return TaskCreatedEvent(
+        event_type=EventType.TASK_CREATED,
+        aggregate_id=task_id,
+        occurred_at=datetime(2024, 1, 1),
+        task_id=task_id,
+        project_id=None,
+        created_by="user-123"
+    )
+
+
+def write(engine, task_ids, commit=True):
+    """Add one event per task id in a unit of work, committing it or not."""
+    async def scenario():
+        async with session_factory(engine)() as db:
+            async with UnitOfWork(db) as unit_of_work:
+                for task_id in task_ids:
+                    unit_of_work.add_event(event(task_id))
+                if commit:
+                    await unit_of_work.commit()
+    
+    asyncio.run(scenario())
+
+
+def pending(engine):
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(OutboxModel)).scalar()
+
+
+def test_only_committed_events_are_relayed_in_order(engine):
+    """Test that the relay publishes committed events in batches and empties the outbox."""
+    write(engine, ["task-1", "task-2", "task-3"])
+    write(engine, ["rolled-back"], commit=False)
+    broker = InMemoryBroker()
+    relay = OutboxRelay(broker, STREAM, session_factory(engine), batch_size=2)
+    
+    assert asyncio.run(relay.relay_once()) == 2
+    assert asyncio.run(relay.relay_once()) == 1
+    assert asyncio.run(relay.relay_once()) == 0
+    
+    messages = broker.messages(STREAM)
+    assert [orjson.loads(message["payload"])["task_id"] for message in messages] == [
+        "task-1", "task-2", "task-3"
+    ]
+    assert messages[0]["event_type"] == b"task.created"
+    assert pending(engine) == 0
+    assert relay.metrics()["published"] == 3
+    assert relay.metrics()["batches"] == 2
+
+
+class DownBroker(InMemoryBroker):
+    """Broker that is unreachable."""
+    
+    errors = (ConnectionError,)
+    
+    async def publish(self, stream, messages):
+        raise ConnectionError("down")
+
+
+def test_events_stay_in_outbox_while_broker_is_down(engine):
+    """Test that a failed publish keeps the batch for the next attempt."""
+    write(engine, ["task-1"])
+    
+    with pytest.raises(ConnectionError):
+        asyncio.run(OutboxRelay(DownBroker(), STREAM, session_factory(engine)).relay_once())
+    assert pending(engine) == 1
+    
+    broker = InMemoryBroker()
+    asyncio.run(OutboxRelay(broker, STREAM, session_factory(engine)).relay_once())
+    assert len(broker.messages(STREAM)) == 1
+    assert pending(engine) == 0
+
+
+def test_services_without_events_do_not_create_the_outbox(engine):
+    """Test that the outbox is not among the shared tables every service creates."""
+    assert OutboxModel.__tablename__ not in Base.metadata.tables
@@ -0,0 +1,46 @@
+"""Unit tests for cursor pagination helpers."""
+
+import uuid
+import pytest
+from datetime import datetime, timezone
+from shared.pagination import encode_cursor, decode_cursor, next_cursor
+from src.domain.task import Task
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes to the position it was built from."""
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    task_id = str(uuid.uuid4())
+    cursor = encode_cursor(created_at, task_id)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, task_id)
+
+
+def test_invalid_cursor():
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_cursor_with_non_uuid_id_is_rejected():
+    """Test that a well-formed cursor whose id is not a UUID is rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(datetime(2024, 5, 1), "task-123"))
+
+
+def test_cursor_with_timezone_is_rejected():
+    """Test that a cursor timestamp with an offset is rejected, as stored ones are naive."""
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(created_at, str(uuid.uuid4())))
+
+
+def test_next_cursor_only_on_full_page():
+    """Test next cursor is emitted only when the page is full."""
+    tasks = [Task(title=f"Task {i}", created_by="user-123") for i in range(3)]
+    
+    assert next_cursor(tasks, limit=5) is None
+    assert next_cursor([], limit=5) is None
+    assert decode_cursor(next_cursor(tasks, limit=3)) == (tasks[-1].created_at, tasks[-1].id)
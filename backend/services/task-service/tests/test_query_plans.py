@@ -0,0 +1,212 @@
+"""Query-plan regression tests for task service list queries.
+
+Each hot query is captured from the repository code, run through EXPLAIN
+against a seeded PostgreSQL schema and must not fall back to a sequential
+scan on ``tasks`` or ``projects``. Set TEST_DATABASE_URL to enable them.
+"""
+
+import asyncio
+import inspect
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from shared.database import Base
+from shared.pagination import encode_cursor
+from src.domain.value_objects import TaskStatus, TaskPriority
+from src.infrastructure.models import TaskModel, ProjectModel
+from src.infrastructure.repository import TaskRepository, ProjectRepository, user_projects_cache
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "query_plan_tests"
+GUARDED_TABLES = {"tasks", "projects"}
+
+USERS = 200
+PROJECTS = 400
+TASKS = 20000
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL,
+    reason="TEST_DATABASE_URL is not set"
+)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapper for an arbitrary statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class _EmptyResult:
+    """Result stand-in returned by the capturing session."""
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+    def first(self):
+        return None
+    
+    def one(self):
+        return 0, None
+    
+    async def partitions(self, size=None):
+        for partition in ():
+            yield partition
+
+
+class CapturingSession:
+    """Records the statements a repository issues instead of running them."""
+
+    def __init__(self):
+        self.statements = []
+        self.info = {}
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _EmptyResult()
+    
+    async def stream(self, statement, *args, **kwargs):
+        self.statements.append(statement)
+        return _EmptyResult()
+
+
+async def _drain(batches):
+    async for _ in batches:
+        pass
+
+
+def capture(repository_cls, method: str, *args, **kwargs):
+    """Return the single statement issued by a repository read method."""
+    session = CapturingSession()
+    call = getattr(repository_cls(session), method)(*args, **kwargs)
+    asyncio.run(call if inspect.isawaitable(call) else _drain(call))
+    assert len(session.statements) == 1
+    return session.statements[0]
+
+
+def seq_scans(plan: dict) -> list:
+    """Collect guarded relations read by a Seq Scan anywhere in the plan."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in GUARDED_TABLES:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+@pytest.fixture(autouse=True)
+def bypass_entity_cache(monkeypatch):
+    """A cache hit would skip the statement under test."""
+    monkeypatch.setattr(user_projects_cache, "_ttl", 0)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    """Seeded PostgreSQL schema dedicated to this module."""
+    engine = create_engine(
+        TEST_DATABASE_URL,
+        connect_args={"options": f"-csearch_path={SCHEMA}"}
+    )
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    Base.metadata.create_all(bind=engine)
+
+    rng = random.Random(42)
+    users = [str(uuid.uuid4()) for _ in range(USERS)]
+    start = datetime(2024, 1, 1)
+    projects = [
+        {
+            "id": str(uuid.uuid4()),
+            "name": f"Project {i}",
+            "created_by": rng.choice(users),
+            "created_at": start + timedelta(minutes=i),
+        }
+        for i in range(PROJECTS)
+    ]
+    tasks = [
+        {
+            "id": str(uuid.uuid4()),
+            "title": f"Task {i}",
+            "status": rng.choice(list(TaskStatus)),
+            "priority": rng.choice(list(TaskPriority)),
+            "project_id": rng.choice(projects)["id"],
+            "assigned_to": rng.choice(users) if rng.random() < 0.7 else None,
+            "created_by": rng.choice(users),
+            "created_at": start + timedelta(seconds=i),
+        }
+        for i in range(TASKS)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(ProjectModel), projects)
+        conn.execute(insert(TaskModel), tasks)
+        conn.execute(text("ANALYZE"))
+
+    engine.seed = {"user_id": users[0], "project_id": projects[0]["id"], "task": tasks[TASKS // 2]}
+    yield engine
+
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    engine.dispose()
+
+
+def hot_queries(seed: dict) -> dict:
+    """Statements for every list query served by the task service."""
+    cursor = encode_cursor(seed["task"]["created_at"], seed["task"]["id"])
+    return {
+        "tasks_by_project": capture(TaskRepository, "get_by_project", seed["project_id"]),
+        "tasks_by_project_cursor": capture(
+            TaskRepository, "get_by_project", seed["project_id"], cursor=cursor
+        ),
+        "tasks_by_assignee": capture(TaskRepository, "get_by_user", seed["user_id"]),
+        "tasks_by_assignee_cursor": capture(
+            TaskRepository, "get_by_user", seed["user_id"], cursor=cursor
+        ),
+        "tasks_visible_to_user": capture(TaskRepository, "get_visible_to_user", seed["user_id"]),
+        "tasks_visible_to_user_cursor": capture(
+            TaskRepository, "get_visible_to_user", seed["user_id"], cursor=cursor
+        ),
+        "tasks_export_by_project": capture(
+            TaskRepository, "stream_by_project", seed["project_id"]
+        ),
+        "projects_by_creator": capture(ProjectRepository, "get_by_user", seed["user_id"]),
+        "projects_by_creator_version": capture(
+            ProjectRepository, "get_user_version", seed["user_id"]
+        ),
+    }
+
+
+@pytest.mark.parametrize("name", [
+    "tasks_by_project",
+    "tasks_by_project_cursor",
+    "tasks_by_assignee",
+    "tasks_by_assignee_cursor",
+    "tasks_visible_to_user",
+    "tasks_visible_to_user_cursor",
+    "tasks_export_by_project",
+    "projects_by_creator",
+    "projects_by_creator_version",
+])
+def test_hot_query_uses_index(engine, name):
+    """Test that a hot list query is answered without a sequential scan."""
+    statement = hot_queries(engine.seed)[name]
+    with engine.connect() as conn:
+        plan = conn.execute(Explain(statement)).scalar()[0]["Plan"]
+
+    assert seq_scans(plan) == [], f"{name} falls back to a sequential scan"
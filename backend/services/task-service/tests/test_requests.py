@@ -0,0 +1,17 @@
+"""Unit tests for API request models."""
+
+import pytest
+from pydantic import ValidationError
+from src.api.routes import BulkAssignTasksRequest, BulkUpdateTasksRequest
+
+
+def test_bulk_filter_can_select_unassigned_tasks():
+    """Test that unassigned becomes an assigned_to IS NULL criterion, distinct from no criterion."""
+    request = BulkAssignTasksRequest(user_id="user-456", filter={"unassigned": True, "status": "todo"})
+    
+    assert request.filters() == {"status": "todo", "assigned_to": None}
+    assert BulkUpdateTasksRequest(filter={"status": "todo"}, priority="high").filters() == {"status": "todo"}
+    with pytest.raises(ValidationError):
+        BulkUpdateTasksRequest(filter={"unassigned": False}, priority="high")
+    with pytest.raises(ValidationError):
+        BulkAssignTasksRequest(user_id=None, filter={"unassigned": True, "assigned_to": "user-456"})
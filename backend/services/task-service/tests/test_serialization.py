@@ -0,0 +1,76 @@
+"""Unit tests for the fast list serialization path."""
+
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from shared.dto import TaskDTO
+from shared.serialization import attribute_serializer, list_response, ndjson_stream, csv_stream
+from src.domain.task import Task
+from src.domain.value_objects import TaskStatus, TaskPriority
+
+
+def test_list_response_matches_pydantic_output():
+    """Test that the orjson path renders tasks exactly like TaskDTO does."""
+    tasks = [
+        Task(
+            title="Write docs",
+            created_by="user-123",
+            status=TaskStatus.IN_PROGRESS,
+            priority=TaskPriority.HIGH,
+            created_at=datetime(2024, 1, 1, 12, 0, 0, 123456)
+        ),
+        Task(title="Ship it", created_by="user-123", created_at=datetime(2024, 1, 2))
+    ]
+    
+    response = list_response(tasks, attribute_serializer(TaskDTO), headers={"X-Next-Cursor": "abc"})
+    
+    expected = [
+        TaskDTO(
+            id=task.id,
+            title=task.title,
+            description=task.description,
+            status=task.status.value,
+            priority=task.priority.value,
+            project_id=task.project_id,
+            assigned_to=task.assigned_to,
+            created_by=task.created_by,
+            created_at=task.created_at,
+            updated_at=task.updated_at
+        ).model_dump(mode="json")
+        for task in tasks
+    ]
+    assert json.loads(response.body) == expected
+    assert response.headers["X-Next-Cursor"] == "abc"
+
+
+async def _collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+def test_export_streams_encode_every_batch():
+    """Test that NDJSON and CSV exports emit one record per task across batches."""
+    first = Task(title='Quote "me", please', created_by="user-123", created_at=datetime(2024, 1, 1))
+    second = Task(title="Plain", created_by="user-123", status=TaskStatus.DONE)
+    
+    ndjson = asyncio.run(_collect(ndjson_stream(_batches([first], [second]), TaskDTO)))
+    lines = [json.loads(line) for line in ndjson.splitlines()]
+    assert [line["title"] for line in lines] == ['Quote "me", please', "Plain"]
+    assert lines[1]["status"] == "done"
+    
+    rows = list(csv.DictReader(io.StringIO(
+        asyncio.run(_collect(csv_stream(_batches([first], [second]), TaskDTO))).decode()
+    )))
+    assert [row["title"] for row in rows] == ['Quote "me", please', "Plain"]
+    assert rows[0]["created_at"] == "2024-01-01T00:00:00"
+    assert rows[0]["description"] == ""
+    assert rows[1]["status"] == "done"
+    
+    header_only = asyncio.run(_collect(csv_stream(_batches(), TaskDTO)))
+    assert header_only.decode().strip() == ",".join(TaskDTO.model_fields)
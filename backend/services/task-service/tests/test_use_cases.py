@@ -0,0 +1,164 @@
+"""Unit tests for task service use cases."""
+
+import asyncio
+import pytest
+from shared.unit_of_work import IUnitOfWork
+from src.application.use_cases import (
+    CreateTasksBatchUseCase,
+    UpdateTaskUseCase,
+    BulkUpdateTasksUseCase,
+    BulkAssignTasksUseCase,
+    AssignTaskUseCase
+)
+from src.domain.task import Task
+from src.domain.value_objects import TaskStatus, TaskPriority
+
+
+class InMemoryTaskRepository:
+    """Minimal task repository stand-in for use case tests."""
+    
+    def __init__(self):
+        self.tasks = {}
+        self.create_many_calls = 0
+        self.bulk_calls = []
+        self.cached_reads = 0
+    
+    async def get_by_id(self, task_id, cached=True):
+        self.cached_reads += cached
+        return self.tasks.get(task_id)
+    
+    async def update(self, task):
+        self.tasks[task.id] = task
+        return task
+    
+    async def create_many(self, tasks):
+        self.create_many_calls += 1
+        for task in tasks:
+            self.tasks[task.id] = task
+        return list(tasks)
+    
+    async def bulk_update(self, visible_to, changes, task_ids=None, filters=None):
+        self.bulk_calls.append((visible_to, changes, task_ids, filters))
+        return []
+
+
+class RecordingUnitOfWork(IUnitOfWork):
+    """Unit of work stand-in that records commits and rollbacks."""
+    
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+        self.pending = []
+        self.events = []
+    
+    def add_event(self, event):
+        self.pending.append(event)
+    
+    async def commit(self):
+        self.commits += 1
+        self.events.extend(self.pending)
+        self.pending = []
+    
+    async def rollback(self):
+        self.rollbacks += 1
+        self.pending = []
+
+
+class InMemoryProjectRepository:
+    """Minimal project repository stand-in for use case tests."""
+    
+    def __init__(self, project_ids):
+        self.project_ids = set(project_ids)
+    
+    async def existing_ids(self, project_ids):
+        return set(project_ids) & self.project_ids
+
+
+def test_batch_create_reports_per_item_results():
+    """Test that valid items are inserted together and invalid ones reported."""
+    tasks = InMemoryTaskRepository()
+    unit_of_work = RecordingUnitOfWork()
+    use_case = CreateTasksBatchUseCase(
+        tasks, InMemoryProjectRepository({"project-1"}), unit_of_work
+    )
+    
+    results = asyncio.run(use_case.execute(
+        items=[
+            {"title": "First", "project_id": "project-1"},
+            {"title": "   "},
+            {"title": "Orphan", "project_id": "project-404"},
+            {"title": "Second", "priority": TaskPriority.HIGH},
+        ],
+        created_by="user-123"
+    ))
+    
+    assert [task.title if task else None for task, _ in results] == ["First", None, None, "Second"]
+    assert results[1][1] == "Task title cannot be empty"
+    assert "project-404" in results[2][1]
+    assert results[3][0].priority == TaskPriority.HIGH
+    assert tasks.create_many_calls == 1
+    assert len(tasks.tasks) == 2
+    assert unit_of_work.commits == 1
+    assert [event.task_id for event in unit_of_work.events] == [results[0][0].id, results[3][0].id]
+    assert {event.event_type for event in unit_of_work.events} == {"task.created"}
+
+
+def test_bulk_update_and_assign_build_changes():
+    """Test that bulk use cases pass only the requested changes through."""
+    tasks = InMemoryTaskRepository()
+    unit_of_work = RecordingUnitOfWork()
+    
+    asyncio.run(BulkUpdateTasksUseCase(tasks, unit_of_work).execute(
+        "user-123", task_ids=["task-1"], status=TaskStatus.DONE
+    ))
+    asyncio.run(BulkAssignTasksUseCase(tasks, unit_of_work).execute(
+        "user-123", None, filters={"assigned_to": "user-456"}
+    ))
+    
+    assert tasks.bulk_calls == [
+        ("user-123", {"status": TaskStatus.DONE}, ["task-1"], None),
+        ("user-123", {"assigned_to": None}, None, {"assigned_to": "user-456"}),
+    ]
+    assert unit_of_work.commits == 2
+    with pytest.raises(ValueError):
+        asyncio.run(BulkUpdateTasksUseCase(tasks, unit_of_work).execute("user-123", task_ids=["task-1"]))
+
+
+def test_failed_write_rolls_back_without_commit():
+    """Test that a repository error inside the unit of work is rolled back."""
+    tasks = InMemoryTaskRepository()
+    task = Task(title="Original", created_by="user-123")
+    tasks.tasks[task.id] = task
+    unit_of_work = RecordingUnitOfWork()
+    
+    async def fail(task):
+        raise RuntimeError("connection lost")
+    tasks.update = fail
+    
+    with pytest.raises(RuntimeError):
+        asyncio.run(UpdateTaskUseCase(tasks, unit_of_work).execute(task.id, title="Renamed"))
+    
+    assert unit_of_work.commits == 0
+    assert unit_of_work.rollbacks == 1
+    assert unit_of_work.events == []
+
+
+def test_task_changes_are_recorded_as_events():
+    """Test that updates and assignments commit events describing the change."""
+    tasks = InMemoryTaskRepository()
+    task = Task(title="Original", created_by="user-123")
+    tasks.tasks[task.id] = task
+    unit_of_work = RecordingUnitOfWork()
+    
+    asyncio.run(UpdateTaskUseCase(tasks, unit_of_work).execute(
+        task.id, title="Renamed", status=TaskStatus.DONE
+    ))
+    asyncio.run(AssignTaskUseCase(tasks, unit_of_work).execute(task.id, "user-456", "user-123"))
+    
+    completed, assigned = unit_of_work.events
+    assert completed.event_type == "task.completed"
+    assert completed.model_dump(mode="json")["changes"] == {"title": "Renamed", "status": "done"}
+    assert assigned.event_type == "task.assigned"
+    assert (assigned.assigned_to, assigned.assigned_by) == ("user-456", "user-123")
+    # Writes start from the current row, never from a cached copy
+    assert tasks.cached_reads == 0
@@ -9,18 +9,18 @@ sys.path.insert(0, str(backend_dir))
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from shared.database import get_db
 from shared.auth import decode_access_token
 from shared.dto import UserDTO
-from src.infrastructure.repository import UserRepository
+from src.infrastructure.repository import UserRepository, current_user_cache
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> UserDTO:
     """Get current authenticated user."""
     credentials_exception = HTTPException(
@@ -37,15 +37,21 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
+    cached_user = current_user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     repository = UserRepository(db)
     user = await repository.get_by_id(user_id)
     if user is None:
         raise credentials_exception
     
-    return UserDTO(
+    user_dto = UserDTO(
         id=user.id,
         email=user.email.value,
         full_name=user.full_name,
         created_at=user.created_at,
         updated_at=user.updated_at
     )
+    current_user_cache.set(user_id, user_dto)
+    return user_dto
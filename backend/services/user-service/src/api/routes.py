@@ -8,10 +8,12 @@ backend_dir = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
-from shared.database import get_db
+from shared.database import get_db, get_read_db
 from shared.dto import UserDTO
+from shared.auth import PasswordHashingBusy
+from shared.unit_of_work import UnitOfWork
 from src.application.use_cases import (
     RegisterUserUseCase,
     AuthenticateUserUseCase,
@@ -39,11 +41,11 @@ class LoginRequest(BaseModel):
 @router.post("/auth/register", response_model=UserDTO, status_code=status.HTTP_201_CREATED)
 async def register(
     request: RegisterRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Register a new user."""
     repository = UserRepository(db)
-    use_case = RegisterUserUseCase(repository)
+    use_case = RegisterUserUseCase(repository, UnitOfWork(db))
     
     try:
         user = await use_case.execute(
@@ -63,21 +65,34 @@ async def register(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.post("/auth/login")
 async def login(
     request: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Authenticate user and get access token."""
     repository = UserRepository(db)
     use_case = AuthenticateUserUseCase(repository)
     
-    result = await use_case.execute(
-        email=request.email,
-        password=request.password
-    )
+    try:
+        result = await use_case.execute(
+            email=request.email,
+            password=request.password
+        )
+    except PasswordHashingBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
     
     if not result:
         raise HTTPException(
@@ -113,7 +128,7 @@ async def get_credentials():
 @router.get("/users/{user_id}", response_model=UserDTO)
 async def get_user(
     user_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: UserDTO = Depends(get_current_user)
 ):
     """Get user profile by ID."""
@@ -10,11 +10,12 @@ sys.path.insert(0, str(backend_dir))
 from typing import Optional
 from datetime import timedelta
 from shared.auth import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from shared.unit_of_work import IUnitOfWork
 from src.domain.user import User
 from src.domain.value_objects import Email, Password
 from src.domain.repository import IUserRepository
@@ -23,8 +24,9 @@ from src.domain.repository import IUserRepository
 class RegisterUserUseCase:
     """Use case for registering a new user."""
     
-    def __init__(self, user_repository: IUserRepository):
+    def __init__(self, user_repository: IUserRepository, unit_of_work: IUnitOfWork):
         self._user_repository = user_repository
+        self._unit_of_work = unit_of_work
     
     async def execute(
         self,
@@ -40,14 +42,17 @@ class RegisterUserUseCase:
             raise ValueError("User with this email already exists")
         
         # Create new user
-        password_hash = get_password_hash(password)
+        password_hash = await get_password_hash_async(password)
         user = User(
             email=email_vo,
             full_name=full_name,
             password_hash=password_hash
         )
         
-        return await self._user_repository.create(user)
+        async with self._unit_of_work:
+            user = await self._user_repository.create(user)
+            await self._unit_of_work.commit()
+        return user
 
 
 class AuthenticateUserUseCase:
@@ -69,7 +74,8 @@ class AuthenticateUserUseCase:
             return None
         
         password_vo = Password(password)
-        if not user.verify_password(password_vo, verify_password):
+        # bcrypt runs in the shared hashing pool, off the event loop
+        if not await user.verify_password(password_vo, verify_password_async):
             return None
         
         # Create access token
@@ -56,6 +56,6 @@ class User:
         self._full_name = new_name.strip()
         self._updated_at = datetime.utcnow()
     
-    def verify_password(self, password: Password, verify_func) -> bool:
-        """Verify password against hash."""
-        return verify_func(password.value, self._password_hash)
+    async def verify_password(self, password: Password, verify_func) -> bool:
+        """Verify password against hash with an async verifier such as verify_password_async."""
+        return await verify_func(password.value, self._password_hash)
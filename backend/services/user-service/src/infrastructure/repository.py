@@ -1,55 +1,79 @@
 """User repository implementation (infrastructure layer)."""
 
+import os
+from functools import partial
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from shared.cache import TTLCache
+from shared.database import DbSession
+from shared.unit_of_work import after_commit
 from src.domain.user import User
 from src.domain.value_objects import Email
 from src.domain.repository import IUserRepository
 from src.infrastructure.models import UserModel
 
+# Authenticated user DTOs keyed by user id; per process, so the TTL bounds
+# how long another worker can serve a profile after it was updated
+current_user_cache = TTLCache(
+    max_size=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+)
+
 
 class UserRepository(IUserRepository):
     """SQLAlchemy implementation of user repository."""
     
-    def __init__(self, db: Session):
+    COLUMNS = tuple(UserModel.__table__.columns)
+    
+    def __init__(self, db: DbSession):
         self._db = db
     
     async def create(self, user: User) -> User:
-        """Create a new user."""
-        db_user = UserModel(
-            id=user.id,
-            email=user.email.value,
-            full_name=user.full_name,
-            password_hash=user.password_hash,
-            created_at=user.created_at,
-            updated_at=user.updated_at
+        """Create a new user with a single INSERT ... RETURNING."""
+        result = await self._db.execute(
+            insert(UserModel)
+            .values(
+                id=user.id,
+                email=user.email.value,
+                full_name=user.full_name,
+                password_hash=user.password_hash,
+                created_at=user.created_at,
+                updated_at=user.updated_at
+            )
+            .returning(*self.COLUMNS)
         )
-        self._db.add(db_user)
-        self._db.commit()
-        self._db.refresh(db_user)
-        return self._to_domain(db_user)
+        row = result.one()
+        return self._to_domain(row)
     
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Get user by ID."""
-        db_user = self._db.query(UserModel).filter(UserModel.id == user_id).first()
+        db_user = await self._db.get(UserModel, user_id)
         return self._to_domain(db_user) if db_user else None
     
     async def get_by_email(self, email: Email) -> Optional[User]:
         """Get user by email."""
-        db_user = self._db.query(UserModel).filter(UserModel.email == email.value).first()
+        result = await self._db.execute(
+            select(UserModel).where(UserModel.email == email.value)
+        )
+        db_user = result.scalars().first()
         return self._to_domain(db_user) if db_user else None
     
     async def update(self, user: User) -> User:
-        """Update an existing user."""
-        db_user = self._db.query(UserModel).filter(UserModel.id == user.id).first()
-        if not db_user:
+        """Update an existing user with a single UPDATE ... RETURNING."""
+        result = await self._db.execute(
+            update(UserModel)
+            .where(UserModel.id == user.id)
+            .values(full_name=user.full_name, updated_at=user.updated_at)
+            .returning(*self.COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        if row is None:
             raise ValueError(f"User with id {user.id} not found")
-        
-        db_user.full_name = user.full_name
-        db_user.updated_at = user.updated_at
-        self._db.commit()
-        self._db.refresh(db_user)
-        return self._to_domain(db_user)
+        # The unit of work commits later; evicting now would let a concurrent
+        # request re-cache the old row before the update becomes visible
+        after_commit(self._db, partial(current_user_cache.invalidate, user.id))
+        return self._to_domain(row)
     
     def _to_domain(self, db_user: UserModel) -> User:
         """Convert database model to domain entity."""
@@ -11,6 +11,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.api.routes import router
 from shared.database import engine, Base
+from shared.auth import password_hasher, token_cache
+from src.infrastructure.repository import current_user_cache
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -36,4 +38,10 @@ app.include_router(router)
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "user-service"}
+    return {
+        "status": "healthy",
+        "service": "user-service",
+        "password_hashing": password_hasher.metrics(),
+        "token_cache": token_cache.metrics(),
+        "user_cache": current_user_cache.metrics()
+    }
@@ -0,0 +1,123 @@
+"""Unit tests for shared authentication helpers."""
+
+import asyncio
+import threading
+import pytest
+from jose import jwt
+from shared.auth import (
+    PasswordHasher,
+    PasswordHashingBusy,
+    SECRET_KEY,
+    ALGORITHM,
+    create_access_token,
+    create_stream_token,
+    decode_access_token,
+    decode_stream_token,
+    get_password_hash,
+    token_cache,
+    verify_password
+)
+
+
+def test_password_hasher_round_trip():
+    """Test hashing and verifying through the worker pool."""
+    hasher = PasswordHasher(workers=2, max_pending=4)
+    
+    async def scenario():
+        hashed = await hasher.run(get_password_hash, "validpassword123")
+        return (
+            await hasher.run(verify_password, "validpassword123", hashed),
+            await hasher.run(verify_password, "wrongpassword", hashed),
+        )
+    
+    assert asyncio.run(scenario()) == (True, False)
+    metrics = hasher.metrics()
+    assert metrics["completed"] == 3
+    assert metrics["running"] == 0
+    assert metrics["queued"] == 0
+
+
+def test_password_hasher_rejects_when_full():
+    """Test that work beyond max_pending is rejected instead of queued."""
+    hasher = PasswordHasher(workers=1, max_pending=1)
+    
+    async def scenario():
+        first = asyncio.ensure_future(hasher.run(get_password_hash, "validpassword123"))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHashingBusy):
+            await hasher.run(get_password_hash, "validpassword123")
+        await first
+    
+    asyncio.run(scenario())
+    assert hasher.metrics()["rejected"] == 1
+
+
+def test_cancelled_queued_run_frees_its_slot():
+    """Test that cancelling a run still waiting for a worker releases its slot."""
+    hasher = PasswordHasher(workers=1, max_pending=2)
+    release = threading.Event()
+    calls = []
+    
+    async def scenario():
+        blocking = asyncio.ensure_future(hasher.run(release.wait))
+        try:
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(hasher.run(calls.append, "queued"))
+            await asyncio.sleep(0)
+            assert hasher.metrics()["queued"] == 1
+            queued.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await queued
+            assert hasher.metrics()["queued"] == 0
+        finally:
+            release.set()
+            await blocking
+        await hasher.run(calls.append, "accepted")
+        await hasher.run(calls.append, "accepted")
+    
+    asyncio.run(scenario())
+    metrics = hasher.metrics()
+    assert calls == ["accepted", "accepted"]
+    assert metrics["queued"] == 0
+    assert metrics["running"] == 0
+    assert metrics["rejected"] == 0
+
+
+def test_decode_access_token_is_cached():
+    """Test that repeat decodes of a valid token are served from the cache."""
+    token_cache.clear()
+    token = create_access_token({"sub": "user-123"})
+    hits_before = token_cache.metrics()["hits"]
+    
+    first = decode_access_token(token)
+    second = decode_access_token(token)
+    
+    assert first == second
+    assert second["sub"] == "user-123"
+    assert token_cache.metrics()["hits"] == hits_before + 1
+    assert decode_access_token("not-a-token") is None
+
+
+def test_only_tokens_with_expiry_are_cached():
+    """Test that tokens without exp are decoded every time and cached payloads cannot be altered."""
+    token_cache.clear()
+    expiring = create_access_token({"sub": "user-123"})
+    forever = jwt.encode({"sub": "user-456"}, SECRET_KEY, algorithm=ALGORITHM)
+    
+    decode_access_token(expiring)["sub"] = "someone-else"
+    decode_access_token(forever)
+    
+    assert token_cache.metrics()["size"] == 1
+    assert decode_access_token(expiring)["sub"] == "user-123"
+    assert decode_access_token(forever)["sub"] == "user-456"
+
+
+def test_stream_tokens_and_access_tokens_are_not_interchangeable():
+    """Test that a stream token only opens streams and an access token is no stream token."""
+    stream_token = create_stream_token("user-123")
+    access_token = create_access_token({"sub": "user-123"})
+    
+    assert decode_stream_token(stream_token)["sub"] == "user-123"
+    assert decode_access_token(stream_token) is None
+    assert decode_stream_token(access_token) is None
+    assert decode_stream_token("not-a-token") is None
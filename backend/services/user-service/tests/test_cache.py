@@ -0,0 +1,43 @@
+"""Unit tests for the in-process TTL cache."""
+
+import time
+from shared.cache import TTLCache
+
+
+def test_ttl_cache_expires_entries():
+    """Test that entries are dropped once their TTL has passed."""
+    cache = TTLCache(max_size=10, ttl=0.05)
+    cache.set("user-123", {"id": "user-123"})
+    
+    assert cache.get("user-123") == {"id": "user-123"}
+    time.sleep(0.06)
+    assert cache.get("user-123") is None
+
+
+def test_ttl_cache_invalidate_and_lru():
+    """Test explicit invalidation and least-recently-used eviction."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.metrics()["size"] == 1
+
+
+def test_ttl_cache_per_entry_ttl():
+    """Test that a per-entry TTL overrides the cache-wide one, and a spent one stores nothing."""
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.set("short", 1, ttl=0.05)
+    cache.set("long", 2)
+    cache.set("spent", 3, ttl=-1)
+    
+    time.sleep(0.06)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert cache.get("spent") is None
@@ -1,5 +1,6 @@
 """Unit tests for user domain."""
 
+import asyncio
 import pytest
 from src.domain.user import User
 from src.domain.value_objects import Email, Password
@@ -33,6 +34,21 @@ def test_user_update_full_name():
     assert user.updated_at is not None
 
 
+def test_user_verify_password():
+    """Test that password checks go through the given async verifier."""
+    user = User(
+        email=Email("test@example.com"),
+        full_name="Test User",
+        password_hash="hashed_password"
+    )
+    
+    async def verify(plain, hashed):
+        return (plain, hashed) == ("validpassword123", "hashed_password")
+    
+    assert asyncio.run(user.verify_password(Password("validpassword123"), verify)) is True
+    assert asyncio.run(user.verify_password(Password("wrongpassword"), verify)) is False
+
+
 def test_password_validation():
     """Test password value object validation."""
     # Valid password
@@ -0,0 +1,77 @@
+"""Unit tests for the user repository."""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from shared.unit_of_work import UnitOfWork
+from src.infrastructure.repository import UserRepository, current_user_cache
+
+
+class FakeResult:
+    def __init__(self, row):
+        self._row = row
+    
+    def one_or_none(self):
+        return self._row
+
+
+class FakeSession:
+    """Session stand-in holding a single user row."""
+    
+    def __init__(self, row):
+        self.row = row
+        self.info = {}
+        self.commits = 0
+    
+    async def get(self, model, user_id):
+        return self.row if user_id == self.row.id else None
+    
+    async def execute(self, statement, *args, **kwargs):
+        # The UPDATE's SET values; the WHERE parameter is named id_1
+        values = {key: value for key, value in statement.compile().params.items() if hasattr(self.row, key)}
+        self.row = SimpleNamespace(**{**vars(self.row), **values})
+        return FakeResult(self.row)
+    
+    async def commit(self):
+        self.commits += 1
+    
+    async def rollback(self):
+        pass
+
+
+def user_row():
+    return SimpleNamespace(
+        id="user-123",
+        email="john@example.com",
+        full_name="John Doe",
+        password_hash="hash",
+        created_at=datetime(2024, 1, 1),
+        updated_at=None
+    )
+
+
+def test_update_evicts_cached_user_only_on_commit():
+    """Test that the cached profile survives a rolled back update and is evicted by a committed one."""
+    db = FakeSession(user_row())
+    repository = UserRepository(db)
+    current_user_cache.set("user-123", "cached profile")
+    
+    async def update(commit):
+        async with UnitOfWork(db) as unit_of_work:
+            user = await repository.get_by_id("user-123")
+            user.update_full_name("Jane Doe")
+            updated = await repository.update(user)
+            # Not visible to other requests until the commit
+            assert current_user_cache.get("user-123") == "cached profile"
+            if commit:
+                await unit_of_work.commit()
+        return updated
+    
+    asyncio.run(update(commit=False))
+    assert current_user_cache.get("user-123") == "cached profile"
+    
+    user = asyncio.run(update(commit=True))
+    
+    assert user.full_name == "Jane Doe"
+    assert db.commits == 1
+    assert current_user_cache.get("user-123") is None
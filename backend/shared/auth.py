@@ -1,15 +1,33 @@
 """Authentication utilities."""
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from jose import JWTError, jwt
+from shared.cache import TTLCache
+import asyncio
 import bcrypt
 import os
+import threading
+import time
 
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# EventSource cannot send an Authorization header, so the notification stream
+# takes a short-lived token in its URL; its audience keeps it from being
+# accepted as an access token
+STREAM_TOKEN_AUDIENCE = "notifications:stream"
+STREAM_TOKEN_EXPIRE_SECONDS = 60
+
+# bcrypt costs ~250 ms of CPU per call; bound how many run and wait at once
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+# Maximum number of verified tokens kept in memory per process
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash."""
@@ -27,6 +45,99 @@ def get_password_hash(password: str) -> str:
     return hashed.decode('utf-8')
 
 
+class PasswordHashingBusy(Exception):
+    """Raised when too many password hash operations are already queued."""
+    pass
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded thread pool so it never blocks the event loop.
+    
+    bcrypt releases the GIL while hashing, so worker threads hash in
+    parallel. Work beyond ``max_pending`` queued or running operations is
+    rejected with PasswordHashingBusy instead of growing the queue.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._workers = workers
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+    
+    async def run(self, func: Callable, *args):
+        """Run a blocking hash function in the pool and await its result."""
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._rejected += 1
+                raise PasswordHashingBusy("Too many password operations in progress")
+            self._pending += 1
+        submitted_at = time.perf_counter()
+        started = False
+        abandoned = False
+        
+        def job():
+            nonlocal started
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                if abandoned:
+                    return None
+                started = True
+                self._running += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+        
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            # A caller cancelled while the job was still queued: free its
+            # slot here and make sure the job is skipped if it starts later.
+            with self._lock:
+                if not started:
+                    abandoned = True
+                    self._pending -= 1
+    
+    def metrics(self) -> dict:
+        """Snapshot of pool usage and queueing delay."""
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "workers": self._workers,
+                "max_pending": self._max_pending,
+                "running": self._running,
+                "queued": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 2) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against a hash without blocking the event loop."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await password_hasher.run(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -39,10 +150,42 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+# Verified token payloads; each entry expires with its token's ``exp`` claim
+token_cache = TTLCache(TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token."""
+    payload = token_cache.get(token)
+    if payload is not None:
+        return dict(payload)
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    # Only verified tokens with an expiry are cached, so a hit is exactly as
+    # trustworthy as a fresh decode
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        token_cache.set(token, dict(payload), ttl=expires_at - time.time())
+    return payload
+
+
+def create_stream_token(user_id: str) -> str:
+    """Create a token that only opens the notification stream of a user."""
+    return create_access_token(
+        {"sub": user_id, "aud": STREAM_TOKEN_AUDIENCE},
+        timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS)
+    )
+
+
+def decode_stream_token(token: str) -> Optional[dict]:
+    """Decode and verify a stream token; access tokens are rejected."""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], audience=STREAM_TOKEN_AUDIENCE)
+    except JWTError:
+        return None
+    # Without an aud claim the audience check passes
+    if payload.get("aud") != STREAM_TOKEN_AUDIENCE:
+        return None
+    return payload
@@ -0,0 +1,269 @@
+"""Message broker abstraction for domain events."""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import asyncio
+import itertools
+import os
+import threading
+
+# Set EVENT_BROKER_URL (e.g. redis://redis:6379/0) to publish events to a Redis
+# stream; without it no events are relayed or consumed and they wait in the outbox
+EVENT_BROKER_URL = os.getenv("EVENT_BROKER_URL")
+EVENT_STREAM = os.getenv("EVENT_STREAM", "domain-events")
+# Streams are trimmed (approximately) to this many entries
+EVENT_STREAM_MAX_LEN = int(os.getenv("EVENT_STREAM_MAX_LEN", "100000"))
+
+# A message is a flat mapping of field names to encoded values
+Message = Dict[str, bytes]
+# Messages read from a stream come with their stream entry id
+Entry = Tuple[str, Message]
+
+
+class MessageBroker(ABC):
+    """Append-only streams of messages shared between services."""
+
+    name: str = "broker"
+    # Exceptions meaning "broker unavailable"; callers retry later
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def publish(self, stream: str, messages: List[Message]) -> None:
+        """Append messages to a stream in order.
+
+        May fail after appending only some of them; callers that retry the
+        whole batch therefore deliver at least once.
+        """
+        pass
+
+    @abstractmethod
+    async def ensure_group(self, stream: str, group: str) -> None:
+        """Create a consumer group reading the stream from its start, if missing."""
+        pass
+
+    @abstractmethod
+    async def read_group(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        count: int,
+        block: float,
+        pending: bool = False
+    ) -> List[Entry]:
+        """Read up to ``count`` entries for one consumer of a group.
+
+        New entries are waited for up to ``block`` seconds and stay pending
+        until acknowledged. With ``pending`` the consumer instead re-reads its
+        own unacknowledged entries, e.g. after a crash, without waiting.
+        """
+        pass
+
+    @abstractmethod
+    async def ack(self, stream: str, group: str, entry_ids: List[str]) -> None:
+        """Acknowledge processed entries so they are not delivered again."""
+        pass
+
+    @abstractmethod
+    async def delivery_counts(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        entry_ids: List[str]
+    ) -> Dict[str, int]:
+        """How often each of a consumer's pending entries was delivered, the first time included.
+
+        Entries that are no longer pending are left out.
+        """
+        pass
+
+
+class InMemoryBroker(MessageBroker):
+    """Per-process broker for tests; a relay would drop what nobody reads here."""
+
+    name = "memory"
+
+    def __init__(self, max_len: int = EVENT_STREAM_MAX_LEN):
+        self._max_len = max_len
+        self._streams: Dict[str, Deque[Tuple[int, Message]]] = {}
+        # (stream, group) -> [last delivered sequence, {entry id: (consumer, message)},
+        #                     {entry id: deliveries}]
+        self._groups: Dict[Tuple[str, str], list] = {}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def publish(self, stream: str, messages: List[Message]) -> None:
+        with self._lock:
+            entries = self._streams.setdefault(stream, deque(maxlen=self._max_len))
+            for message in messages:
+                entries.append((next(self._sequence), dict(message)))
+
+    async def ensure_group(self, stream: str, group: str) -> None:
+        with self._lock:
+            self._groups.setdefault((stream, group), [0, {}, {}])
+
+    async def read_group(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        count: int,
+        block: float,
+        pending: bool = False
+    ) -> List[Entry]:
+        entries = self._read(stream, group, consumer, count, pending)
+        if not entries and not pending and block > 0:
+            await asyncio.sleep(block)
+            entries = self._read(stream, group, consumer, count, pending)
+        return entries
+
+    def _read(self, stream: str, group: str, consumer: str, count: int, pending: bool) -> List[Entry]:
+        with self._lock:
+            state = self._groups[(stream, group)]
+            if pending:
+                redelivered = [
+                    (entry_id, message)
+                    for entry_id, (owner, message) in state[1].items()
+                    if owner == consumer
+                ][:count]
+                for entry_id, _ in redelivered:
+                    state[2][entry_id] += 1
+                return redelivered
+            delivered = []
+            for sequence, message in self._streams.get(stream, ()):
+                if sequence <= state[0]:
+                    continue
+                if len(delivered) == count:
+                    break
+                entry_id = f"{sequence}-0"
+                state[0] = sequence
+                state[1][entry_id] = (consumer, message)
+                state[2][entry_id] = 1
+                delivered.append((entry_id, message))
+            return delivered
+
+    async def ack(self, stream: str, group: str, entry_ids: List[str]) -> None:
+        with self._lock:
+            _, pending, deliveries = self._groups[(stream, group)]
+            for entry_id in entry_ids:
+                pending.pop(entry_id, None)
+                deliveries.pop(entry_id, None)
+
+    async def delivery_counts(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        entry_ids: List[str]
+    ) -> Dict[str, int]:
+        with self._lock:
+            deliveries = self._groups[(stream, group)][2]
+            return {entry_id: deliveries[entry_id] for entry_id in entry_ids if entry_id in deliveries}
+
+    def messages(self, stream: str) -> List[Message]:
+        """Messages currently held for a stream, oldest first."""
+        with self._lock:
+            return [message for _, message in self._streams.get(stream, ())]
+
+
+class RedisStreamBroker(MessageBroker):
+    """Redis Streams broker: one XADD per message, pipelined per batch."""
+
+    name = "redis"
+
+    def __init__(self, url: str, max_len: int = EVENT_STREAM_MAX_LEN):
+        # Optional dependency: only imported when a Redis URL is configured
+        from redis import asyncio as redis
+        from redis.exceptions import RedisError, ResponseError
+
+        # Blocking reads must return within socket_timeout
+        self._redis = redis.from_url(url, socket_timeout=5, socket_connect_timeout=2)
+        self._max_len = max_len
+        self._response_error = ResponseError
+        self.errors = (RedisError, OSError)
+
+    async def publish(self, stream: str, messages: List[Message]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for message in messages:
+                pipe.xadd(stream, message, maxlen=self._max_len, approximate=True)
+            await pipe.execute()
+
+    async def ensure_group(self, stream: str, group: str) -> None:
+        try:
+            await self._redis.xgroup_create(stream, group, id="0", mkstream=True)
+        except self._response_error as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def read_group(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        count: int,
+        block: float,
+        pending: bool = False
+    ) -> List[Entry]:
+        response = await self._redis.xreadgroup(
+            group,
+            consumer,
+            {stream: "0" if pending else ">"},
+            count=count,
+            # Redis blocks forever on 0, so never pass less than a millisecond
+            block=None if pending else max(int(block * 1000), 1)
+        )
+        if not response:
+            return []
+        _, entries = response[0]
+        return [
+            (
+                entry_id.decode("ascii"),
+                # Pending entries trimmed from the stream come back without fields
+                {key.decode("utf-8"): value for key, value in (fields or {}).items()}
+            )
+            for entry_id, fields in entries
+        ]
+
+    async def ack(self, stream: str, group: str, entry_ids: List[str]) -> None:
+        if entry_ids:
+            await self._redis.xack(stream, group, *entry_ids)
+
+    async def delivery_counts(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        entry_ids: List[str]
+    ) -> Dict[str, int]:
+        if not entry_ids:
+            return {}
+        # Pending entries are re-read in id order, so one range covers the batch
+        pending = await self._redis.xpending_range(
+            stream,
+            group,
+            min=min(entry_ids, key=_entry_key),
+            max=max(entry_ids, key=_entry_key),
+            count=len(entry_ids),
+            consumername=consumer
+        )
+        wanted = set(entry_ids)
+        counts = {}
+        for entry in pending:
+            entry_id = entry["message_id"].decode("ascii")
+            if entry_id in wanted:
+                counts[entry_id] = entry["times_delivered"]
+        return counts
+
+
+def _entry_key(entry_id: str) -> Tuple[int, int]:
+    milliseconds, sequence = entry_id.split("-")
+    return int(milliseconds), int(sequence)
+
+
+def build_broker() -> Optional[MessageBroker]:
+    """Redis Streams when EVENT_BROKER_URL is set, otherwise None."""
+    if EVENT_BROKER_URL:
+        return RedisStreamBroker(EVENT_BROKER_URL)
+    return None
@@ -0,0 +1,275 @@
+"""Caching utilities: in-process TTL cache and a pluggable read-through cache."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Hashable, List, Optional, Tuple, TypeVar
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set CACHE_REDIS_URL (e.g. redis://redis:6379/0) to enable the read-through
+# cache, shared by all processes. CACHE_IN_PROCESS=true instead keeps a copy
+# per process, which is only coherent with a single worker: a process never
+# sees the invalidations of writes served by another one
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+CACHE_IN_PROCESS = os.getenv("CACHE_IN_PROCESS", "false").lower() in ("1", "true", "yes")
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "300"))
+CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "10000"))
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ``ttl`` seconds after being set.
+
+    ``None`` is never cached, so ``get`` returning None always means a miss.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting the least recently used entries over max_size.
+
+        ``ttl`` overrides the cache-wide TTL for this entry.
+        """
+        ttl = self._ttl if ttl is None else ttl
+        if value is None or self._max_size <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> dict:
+        """Snapshot of cache size and hit ratio."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class CacheBackend(ABC):
+    """Byte store behind a ReadThroughCache."""
+
+    name = "abstract"
+    # Exceptions that mean "backend unavailable"; reads degrade to the loader
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Fetch several keys in one round trip; missing keys are None."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value that expires after ``ttl`` seconds."""
+        pass
+
+    @abstractmethod
+    async def bump(self, keys: List[str], ttl: float) -> None:
+        """Increment integer counters, (re)setting their expiry to ``ttl``."""
+        pass
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process backend, for local development and tests."""
+
+    name = "memory"
+
+    def __init__(self, max_size: int):
+        self._entries = TTLCache(max_size=max_size, ttl=CACHE_TTL_SECONDS)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._entries.get(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl)
+
+    async def bump(self, keys: List[str], ttl: float) -> None:
+        for key in keys:
+            current = int(self._entries.get(key) or 0)
+            self._entries.set(key, str(current + 1).encode("ascii"), ttl)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis backend shared by every process of every service."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Optional dependency: only imported when a Redis URL is configured
+        from redis import asyncio as redis
+        from redis.exceptions import RedisError
+
+        self._redis = redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self.errors = (RedisError, OSError)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return await self._redis.mget(keys)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def bump(self, keys: List[str], ttl: float) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+                pipe.pexpire(key, int(ttl * 1000))
+            await pipe.execute()
+
+
+def build_cache_backend() -> Optional[CacheBackend]:
+    """Redis when CACHE_REDIS_URL is set, in-process if opted into, else no cache."""
+    if CACHE_REDIS_URL:
+        return RedisCacheBackend(CACHE_REDIS_URL)
+    if CACHE_IN_PROCESS:
+        return InMemoryCacheBackend(CACHE_MAX_SIZE)
+    return None
+
+
+class ReadThroughCache(Generic[T]):
+    """Read-through cache over a CacheBackend with versioned keys.
+
+    Every key has a generation counter next to its value, and a value is only
+    trusted when it was stored under the current generation. Invalidation
+    bumps the generation instead of deleting the value: a reader that loaded
+    the old row before a concurrent write committed then stores it under a
+    generation nobody reads again. Value and generation are fetched in one
+    round trip. Backend errors are logged and served from the loader.
+    Without a backend every read goes to the loader.
+    """
+
+    # Generations outlive values, so an expired counter can never make a
+    # value stored before the last bump look current again
+    GENERATION_TTL_FACTOR = 4
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend],
+        namespace: str,
+        encode: Callable[[T], bytes],
+        decode: Callable[[bytes], T],
+        ttl: float = CACHE_TTL_SECONDS
+    ):
+        self._backend = backend
+        self._namespace = namespace
+        self._encode = encode
+        self._decode = decode
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def _keys(self, key: str) -> Tuple[str, str]:
+        value_key = f"{self._namespace}:{key}"
+        return value_key, value_key + ":gen"
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Optional[T]]],
+        store: bool = True
+    ) -> Optional[T]:
+        """Return the cached value for key, loading and caching it on a miss.
+
+        ``None`` results are not cached, and neither is anything when
+        ``store`` is False, e.g. for a loader reading a lagging replica.
+        """
+        if self._backend is None or self._ttl <= 0:
+            return await loader()
+        value_key, generation_key = self._keys(key)
+        try:
+            cached, generation = await self._backend.get_many([value_key, generation_key])
+        except self._backend.errors as e:
+            self._count("_errors")
+            logger.warning("Cache read failed for %s: %s", value_key, e)
+            return await loader()
+
+        generation = generation or b"0"
+        if cached is not None:
+            stored_generation, _, payload = cached.partition(b"|")
+            if stored_generation == generation:
+                self._count("_hits")
+                return self._decode(payload)
+        self._count("_misses")
+
+        value = await loader()
+        if value is not None and store:
+            try:
+                await self._backend.set(value_key, generation + b"|" + self._encode(value), self._ttl)
+            except self._backend.errors as e:
+                self._count("_errors")
+                logger.warning("Cache write failed for %s: %s", value_key, e)
+        return value
+
+    async def invalidate(self, *keys: str) -> None:
+        """Retire the cached values of the given keys."""
+        if not keys or self._backend is None:
+            return
+        try:
+            await self._backend.bump(
+                [self._keys(key)[1] for key in keys],
+                self._ttl * self.GENERATION_TTL_FACTOR
+            )
+        except self._backend.errors as e:
+            self._count("_errors")
+            logger.warning("Cache invalidation failed in %s: %s", self._namespace, e)
+
+    def metrics(self) -> dict:
+        """Snapshot of hit ratio and backend errors."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": self._backend.name if self._backend is not None else "disabled",
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "errors": self._errors,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
@@ -57,3 +57,12 @@ class NotificationDTO(BaseDTO):
     type: str
     read: bool
     created_at: datetime
+
+
+class DeviceDTO(BaseDTO):
+    """Push device data transfer object."""
+    id: str
+    device_token: str
+    platform: str
+    created_at: datetime
+    last_active_at: datetime
@@ -0,0 +1,38 @@
+"""Weak ETags and conditional GET helpers."""
+
+import hashlib
+from datetime import datetime
+from typing import Dict, Optional
+from fastapi import Response, status
+
+# Browsers may store the response but must revalidate it on every use
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the values identifying one version of a resource."""
+    raw = "|".join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return 'W/"' + hashlib.blake2b(raw.encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weakly compare an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """Headers sent with every response carrying an ETag."""
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a client whose cached copy is still current."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag))
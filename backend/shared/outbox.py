@@ -0,0 +1,195 @@
+"""Transactional outbox for domain events and the relay publishing it."""
+
+from datetime import datetime
+from typing import AsyncContextManager, Callable, List, Optional
+import asyncio
+import logging
+import os
+import threading
+import orjson
+from sqlalchemy import BigInteger, Column, DateTime, Identity, MetaData, String, delete, insert, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import declarative_base
+from shared.broker import EVENT_STREAM, Message, MessageBroker
+from shared.database import DbSession, primary_session
+from shared.events import DomainEvent
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+# How long an idle relay waits before polling the outbox again
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "0.5"))
+OUTBOX_MAX_BACKOFF = float(os.getenv("OUTBOX_MAX_BACKOFF", "30"))
+
+
+# Kept off shared.database.Base, whose tables every service creates: only
+# services that publish events create the outbox, with create_outbox_table
+OutboxBase = declarative_base(metadata=MetaData())
+
+
+class OutboxModel(OutboxBase):
+    """Domain event written in the same transaction as the change it describes."""
+
+    __tablename__ = "outbox"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    event_type = Column(String, nullable=False)
+    aggregate_id = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+def create_outbox_table(bind) -> None:
+    """Create the outbox table if it does not exist yet."""
+    OutboxModel.__table__.create(bind=bind, checkfirst=True)
+
+
+async def write_events(db: DbSession, events: List[DomainEvent]) -> None:
+    """Insert events into the outbox as part of the session's transaction."""
+    created_at = datetime.utcnow()
+    await db.execute(
+        insert(OutboxModel),
+        [
+            {
+                "event_type": event.event_type,
+                "aggregate_id": event.aggregate_id,
+                "payload": event.model_dump(mode="json"),
+                "created_at": created_at,
+            }
+            for event in events
+        ]
+    )
+
+
+def to_message(row) -> Message:
+    """Encode an outbox row as a broker message.
+
+    ``event_id`` is the outbox id: a redelivered event keeps it, so consumers
+    can drop duplicates.
+    """
+    return {
+        "event_id": str(row.id).encode("ascii"),
+        "event_type": row.event_type.encode("utf-8"),
+        "payload": orjson.dumps(row.payload),
+    }
+
+
+class OutboxRelay:
+    """Moves outbox rows to the broker in batches, at least once.
+
+    Each batch is locked with ``FOR UPDATE SKIP LOCKED``, published, then
+    deleted in the same transaction, so several relays (one per service
+    replica) share the work without publishing a row twice. A crash or
+    failure between publishing and committing the delete leaves the rows in
+    place and they are published again: consumers must be idempotent.
+    """
+
+    def __init__(
+        self,
+        broker: MessageBroker,
+        stream: str = EVENT_STREAM,
+        session_factory: Callable[[], AsyncContextManager[DbSession]] = primary_session,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL
+    ):
+        self._broker = broker
+        self._stream = stream
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._published = 0
+        self._batches = 0
+        self._errors = 0
+        self._lag_seconds = 0.0
+
+    async def relay_once(self) -> int:
+        """Publish the next batch of pending events; return how many were published."""
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(
+                    OutboxModel.id,
+                    OutboxModel.event_type,
+                    OutboxModel.payload,
+                    OutboxModel.created_at
+                )
+                .order_by(OutboxModel.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            rows = result.all()
+            # Age of the oldest event still waiting, also while the broker is down
+            lag = (datetime.utcnow() - rows[0].created_at).total_seconds() if rows else 0.0
+            with self._lock:
+                self._lag_seconds = lag
+            if not rows:
+                await db.rollback()
+                return 0
+
+            await self._broker.publish(self._stream, [to_message(row) for row in rows])
+            await db.execute(
+                delete(OutboxModel)
+                .where(OutboxModel.id.in_([row.id for row in rows]))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        with self._lock:
+            self._published += len(rows)
+            self._batches += 1
+        return len(rows)
+
+    async def run(self) -> None:
+        """Relay until cancelled, draining full batches back to back.
+
+        Failures keep the events in the outbox and back off exponentially,
+        up to OUTBOX_MAX_BACKOFF seconds, until a batch goes through again.
+        """
+        delay = self._poll_interval
+        while True:
+            try:
+                published = await self.relay_once()
+                delay = self._poll_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, self._broker.errors):
+                    logger.warning("Outbox relay cannot reach the broker: %s", e)
+                else:
+                    logger.exception("Outbox relay failed")
+                with self._lock:
+                    self._errors += 1
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, OUTBOX_MAX_BACKOFF)
+                continue
+            if published < self._batch_size:
+                await asyncio.sleep(self._poll_interval)
+
+    def start(self) -> None:
+        """Run the relay as a background task on the current event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def metrics(self) -> dict:
+        """Snapshot of throughput, failures and publishing lag."""
+        with self._lock:
+            return {
+                "broker": self._broker.name,
+                "stream": self._stream,
+                "published": self._published,
+                "batches": self._batches,
+                "errors": self._errors,
+                "lag_seconds": round(self._lag_seconds, 3),
+            }
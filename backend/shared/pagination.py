@@ -0,0 +1,41 @@
+"""Keyset (cursor) pagination helpers."""
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+from shared.database import is_uuid
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Encode a (created_at, id) position as an opaque URL-safe token."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor token back into its (created_at, id) position.
+    
+    Timestamps are stored naive (UTC), so a cursor with an offset or an id
+    that is not a UUID cannot come from this service and is rejected here
+    rather than failing in the database.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        position = datetime.fromisoformat(created_at)
+    except ValueError:
+        raise ValueError("Invalid pagination cursor") from None
+    if position.tzinfo is not None or not is_uuid(row_id):
+        raise ValueError("Invalid pagination cursor")
+    return position, row_id
+
+
+def next_cursor(items: list, limit: int) -> Optional[str]:
+    """Return the cursor for the page after ``items``, or None on the last page."""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
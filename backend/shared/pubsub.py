@@ -0,0 +1,121 @@
+"""Publish/subscribe backplane connecting the workers of a service."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import os
+
+# Set PUBSUB_REDIS_URL (e.g. redis://redis:6379/0) to connect workers and
+# replicas; without it messages only reach subscribers in the same process
+PUBSUB_REDIS_URL = os.getenv("PUBSUB_REDIS_URL")
+
+
+class PubSub(ABC):
+    """Fire-and-forget messages on named channels, for one subscriber process."""
+
+    name: str = "pubsub"
+    # Exceptions meaning "backplane unavailable"
+    errors: Tuple[type, ...] = ()
+
+    @abstractmethod
+    async def publish(self, messages: List[Tuple[str, bytes]]) -> None:
+        """Publish (channel, data) pairs; nobody listening is not an error."""
+        pass
+
+    @abstractmethod
+    async def subscribe(self, channel: str) -> None:
+        pass
+
+    @abstractmethod
+    async def unsubscribe(self, channel: str) -> None:
+        pass
+
+    @abstractmethod
+    async def get_message(self, timeout: float) -> Optional[Tuple[str, bytes]]:
+        """Wait up to ``timeout`` seconds for the next (channel, data) message."""
+        pass
+
+
+class InMemoryPubSubHub:
+    """Shared by the InMemoryPubSub instances that should see each other."""
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set["InMemoryPubSub"]] = {}
+
+
+class InMemoryPubSub(PubSub):
+    """In-process backplane, for single-worker deployments and tests.
+
+    Instances on the same hub behave like workers on one Redis.
+    """
+
+    name = "memory"
+
+    def __init__(self, hub: Optional[InMemoryPubSubHub] = None):
+        self._hub = hub or InMemoryPubSubHub()
+        self._inbox: "asyncio.Queue[Tuple[str, bytes]]" = asyncio.Queue()
+
+    async def publish(self, messages: List[Tuple[str, bytes]]) -> None:
+        for channel, data in messages:
+            for subscriber in self._hub.subscribers.get(channel, ()):
+                subscriber._inbox.put_nowait((channel, data))
+
+    async def subscribe(self, channel: str) -> None:
+        self._hub.subscribers.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, channel: str) -> None:
+        subscribers = self._hub.subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(self)
+            if not subscribers:
+                del self._hub.subscribers[channel]
+
+    async def get_message(self, timeout: float) -> Optional[Tuple[str, bytes]]:
+        try:
+            return await asyncio.wait_for(self._inbox.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RedisPubSub(PubSub):
+    """Redis PUBLISH/SUBSCRIBE over one subscriber connection per process."""
+
+    name = "redis"
+
+    def __init__(self, url: str):
+        # Optional dependency: only imported when a Redis URL is configured
+        from redis import asyncio as redis
+        from redis.exceptions import RedisError
+
+        self._redis = redis.from_url(url, socket_connect_timeout=2)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self.errors = (RedisError, OSError)
+
+    async def publish(self, messages: List[Tuple[str, bytes]]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for channel, data in messages:
+                pipe.publish(channel, data)
+            await pipe.execute()
+
+    async def subscribe(self, channel: str) -> None:
+        await self._pubsub.subscribe(channel)
+
+    async def unsubscribe(self, channel: str) -> None:
+        await self._pubsub.unsubscribe(channel)
+
+    async def get_message(self, timeout: float) -> Optional[Tuple[str, bytes]]:
+        # Before the first SUBSCRIBE there is no connection to read from
+        if self._pubsub.connection is None:
+            await asyncio.sleep(timeout)
+            return None
+        message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+        if message is None or message["type"] != "message":
+            return None
+        return message["channel"].decode("utf-8"), message["data"]
+
+
+def build_pubsub() -> PubSub:
+    """Redis when PUBSUB_REDIS_URL is set, otherwise an in-process backplane."""
+    if PUBSUB_REDIS_URL:
+        return RedisPubSub(PUBSUB_REDIS_URL)
+    return InMemoryPubSub()
@@ -0,0 +1,78 @@
+"""Fast JSON serialization for hot list endpoints and streamed exports."""
+
+import csv
+import io
+from datetime import datetime
+from enum import Enum
+from operator import attrgetter
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Type
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def attribute_serializer(dto: Type[BaseModel]) -> Callable[[Any], Dict[str, Any]]:
+    """Build a function copying a DTO's fields off an entity or row.
+
+    The field list is resolved once, so each call is a single attrgetter and
+    no pydantic validation runs. Values must already be JSON-ready for orjson
+    (str, datetime, str enums, None, ...), which holds for the entities and
+    rows the DTOs in shared.dto are built from.
+    """
+    fields = tuple(dto.model_fields)
+    get_values = attrgetter(*fields)
+    return lambda obj: dict(zip(fields, get_values(obj)))
+
+
+def list_response(
+    items: Iterable[Any],
+    serialize: Callable[[Any], Dict[str, Any]],
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Render items straight to JSON bytes, bypassing response_model validation.
+
+    Returning a Response skips FastAPI's response handling, so headers set on
+    an injected ``Response`` are not applied: pass them here instead.
+    """
+    return ORJSONResponse([serialize(item) for item in items], headers=headers)
+
+
+async def ndjson_stream(
+    batches: AsyncIterator[List[Any]],
+    dto: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """Encode batches of entities as newline-delimited JSON, one chunk per batch."""
+    serialize = attribute_serializer(dto)
+    async for batch in batches:
+        if batch:
+            yield b"".join(orjson.dumps(serialize(item)) + b"\n" for item in batch)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(
+    batches: AsyncIterator[List[Any]],
+    dto: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """Encode batches of entities as CSV with a header row, one chunk per batch."""
+    fields = tuple(dto.model_fields)
+    get_values = attrgetter(*fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    async for batch in batches:
+        writer.writerows([_csv_value(value) for value in get_values(item)] for item in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
@@ -0,0 +1,88 @@
+"""Unit of work: one transaction per use case."""
+
+from abc import ABC, abstractmethod
+from typing import Awaitable, Callable, List, Optional, Type, Union
+from types import TracebackType
+import inspect
+from shared.database import DbSession
+from shared.events import DomainEvent
+from shared.outbox import write_events
+
+_AFTER_COMMIT = "after_commit_callbacks"
+
+
+def after_commit(db: DbSession, callback: Callable[[], Union[Awaitable[None], None]]) -> None:
+    """Run ``callback`` once the unit of work on ``db`` commits.
+
+    Lets repositories schedule side effects, such as cache invalidation,
+    that must not happen before their writes are visible. The callback may
+    be a plain function or a coroutine function. Rolling back drops the
+    callbacks.
+    """
+    db.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+class IUnitOfWork(ABC):
+    """Transaction boundary for the writes of a single use case.
+
+    Repositories only issue statements; the use case commits once through its
+    unit of work. Leaving the ``async with`` block without committing (or with
+    an exception) rolls every write back, together with the events added.
+    """
+
+    async def __aenter__(self) -> "IUnitOfWork":
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType]
+    ) -> None:
+        # No-op after a successful commit
+        await self.rollback()
+
+    @abstractmethod
+    def add_event(self, event: DomainEvent) -> None:
+        """Record a domain event to be published if, and only if, this commits."""
+        pass
+
+    @abstractmethod
+    async def commit(self) -> None:
+        """Commit all writes made since the unit of work started."""
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        """Discard all uncommitted writes."""
+        pass
+
+
+class UnitOfWork(IUnitOfWork):
+    """Unit of work over the request's database session.
+
+    Events are written to the outbox table just before the commit, in the
+    same transaction as the writes they describe.
+    """
+
+    def __init__(self, db: DbSession):
+        self._db = db
+        self._events: List[DomainEvent] = []
+
+    def add_event(self, event: DomainEvent) -> None:
+        self._events.append(event)
+
+    async def commit(self) -> None:
+        if self._events:
+            await write_events(self._db, self._events)
+            self._events = []
+        await self._db.commit()
+        for callback in self._db.info.pop(_AFTER_COMMIT, []):
+            result = callback()
+            if inspect.isawaitable(result):
+                await result
+
+    async def rollback(self) -> None:
+        self._events = []
+        await self._db.rollback()
+        self._db.info.pop(_AFTER_COMMIT, None)